@@ -1,37 +1,95 @@
+import os
+
 import streamlit as st
 
 from data.data import events, registrations, service_requests, students
+from follower import JsonlFollower
+from journal import JournalStorage
 from main import CampusEventManagementSystem
+from storage import SQLiteStorage
 from tabs.analytics import reports_analytics
 from tabs.dashboard import dashboard
 from tabs.events import manage_events
 from tabs.requests import manage_service_requests
 from tabs.students import manage_students
 
-# Initialize the system in session state if not exists
-if "system" not in st.session_state:
-    st.session_state.system = CampusEventManagementSystem()
-
-
-def init_sample_data():
-    """Initialize sample data if not already present"""
-    system = st.session_state.system
 
+def load_sample_data(system: CampusEventManagementSystem):
+    """Load the sample data into a system if not already present"""
     if not system.students:
         for sid in students:
             system.add_student(sid)
 
     if not system.events:
-        for event in events:
-            system.add_event(**event)
+        system.add_events(events)
 
-        for student_id, event_id in registrations:
-            system.register_for_event(student_id, event_id)
+        system.register_many(registrations)
 
         for request_id, student_id, category in service_requests:
             system.raise_service_request(request_id, student_id, category)
 
 
+def create_system() -> CampusEventManagementSystem:
+    """
+    A new system, persisted to the journal directory named by
+    CAMPUS_JOURNAL_DIR or the SQLite file named by CAMPUS_DB_PATH if set
+    """
+    journal_dir = os.environ.get("CAMPUS_JOURNAL_DIR")
+    db_path = os.environ.get("CAMPUS_DB_PATH")
+    if journal_dir:
+        storage = JournalStorage(journal_dir)
+    elif db_path:
+        storage = SQLiteStorage(db_path)
+    else:
+        storage = None
+    return CampusEventManagementSystem(storage=storage)
+
+
+@st.cache_resource
+def shared_system() -> CampusEventManagementSystem:
+    """One system shared by every browser session of this server process"""
+    system = create_system()
+    load_sample_data(system)
+    return system
+
+
+@st.cache_resource
+def request_follower() -> JsonlFollower:
+    """
+    Follower feeding the JSONL file named by CAMPUS_FOLLOW_REQUESTS into the
+    shared system, checkpointed to CAMPUS_FOLLOW_CHECKPOINT (default: the
+    file name plus ".checkpoint")
+    """
+    path = os.environ["CAMPUS_FOLLOW_REQUESTS"]
+    checkpoint = os.environ.get("CAMPUS_FOLLOW_CHECKPOINT", path + ".checkpoint")
+    follower = JsonlFollower(shared_system(), path, checkpoint)
+    follower.start()
+    return follower
+
+
+# Initialize the system in session state if not exists. With
+# CAMPUS_SHARED_STATE=1 all sessions share one thread-safe system; storage
+# set with CAMPUS_DB_PATH or CAMPUS_JOURNAL_DIR needs a single writer, and a
+# followed request file feeds one system, so both imply shared state.
+if "system" not in st.session_state:
+    if (
+        os.environ.get("CAMPUS_SHARED_STATE") == "1"
+        or os.environ.get("CAMPUS_DB_PATH")
+        or os.environ.get("CAMPUS_JOURNAL_DIR")
+        or os.environ.get("CAMPUS_FOLLOW_REQUESTS")
+    ):
+        st.session_state.system = shared_system()
+        if os.environ.get("CAMPUS_FOLLOW_REQUESTS"):
+            st.session_state.request_follower = request_follower()
+    else:
+        st.session_state.system = create_system()
+
+
+def init_sample_data():
+    """Initialize sample data if not already present"""
+    load_sample_data(st.session_state.system)
+
+
 def main():
     st.set_page_config(
         page_title="Campus Event Management System", page_icon="🎓", layout="wide"
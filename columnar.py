@@ -0,0 +1,556 @@
+"""
+Memory-mapped columnar snapshots of a CampusEventManagementSystem.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from models import (
+    Event,
+    Registration,
+    RegistrationStatus,
+    RequestStatus,
+    ServiceRequest,
+    Student,
+    parse_day,
+    parse_minute_of_day,
+)
+
+if TYPE_CHECKING:
+    from main import CampusEventManagementSystem
+
+MAGIC = b"CECS"
+VERSION = 1
+
+_REQUEST_STATUSES = tuple(RequestStatus)
+_REQUEST_STATUS_CODES = {status: code for code, status in enumerate(_REQUEST_STATUSES)}
+_REGISTRATION_STATUSES = tuple(RegistrationStatus)
+_REGISTRATION_STATUS_CODES = {
+    status: code for code, status in enumerate(_REGISTRATION_STATUSES)
+}
+_CONFIRMED = _REGISTRATION_STATUS_CODES[RegistrationStatus.CONFIRMED]
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Header: magic, version, byte order ("<" or ">"), then the row counts of the
+# string table, events, students, registrations and service requests
+_HEADER = struct.Struct("<4sHc5Q")
+_ALIGNMENT = 8
+
+# (name, typecode) of every column, in file order. String columns hold indexes
+# into the string table; "*_row" columns hold row numbers of another table.
+_EVENT_COLUMNS = (
+    ("event_id", "i"),
+    ("title", "i"),
+    ("club", "i"),
+    ("date", "i"),
+    ("start_time", "i"),
+    ("end_time", "i"),
+    ("venue", "i"),
+    ("day", "i"),
+    ("start_minute", "h"),
+    ("end_minute", "h"),
+    ("max_seats", "I"),
+    ("confirmed", "i"),
+    ("waitlisted", "i"),
+    ("is_valid", "b"),
+)
+_STUDENT_COLUMNS = (("student_id", "i"), ("name", "i"))
+_REGISTRATION_COLUMNS = (
+    ("event_row", "i"),
+    ("student_row", "i"),
+    ("status", "b"),
+    ("warnings", "i"),
+)
+_REQUEST_COLUMNS = (
+    ("request_id", "i"),
+    ("student_row", "i"),
+    ("category", "i"),
+    ("status", "b"),
+    ("created_at", "q"),
+)
+
+# Rows accepted by write_columns. Statuses are codes indexing
+# tuple(RegistrationStatus) and tuple(RequestStatus), warnings are joined by
+# newlines and created_at counts microseconds since 1970.
+# (student_id, name)
+StudentRow = Tuple[str, str]
+# ([event_id, title, club, date, start_time, end_time, venue, max_seats,
+# is_valid], [(student_id, status, warnings) of each registration])
+EventRow = Tuple[List[Any], List[Tuple[str, int, str]]]
+# (request_id, student_id, category, status, created_at)
+RequestRow = Tuple[str, str, str, int, int]
+
+V = TypeVar("V")
+
+
+class _StringTable:
+    """Builds a deduplicated string table while columns are written."""
+
+    def __init__(self):
+        self.indexes: Dict[str, int] = {"": 0}
+        self.strings: List[str] = [""]
+
+    def __call__(self, value: str) -> int:
+        index = self.indexes.get(value)
+        if index is None:
+            index = self.indexes[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+
+def write_snapshot(system: "CampusEventManagementSystem", path: str) -> None:
+    """
+    Write the state of a system to a columnar snapshot file.
+
+    Args:
+        system (CampusEventManagementSystem): System to snapshot. Writers should
+            be quiet while it runs, or the snapshot may mix old and new state.
+        path (str): Snapshot file to create or replace
+    """
+    write_columns(
+        path,
+        [(student.student_id, student.name) for student in system.students.values()],
+        [
+            (
+                [
+                    event.event_id,
+                    event.title,
+                    event.club,
+                    event.date,
+                    event.start_time,
+                    event.end_time,
+                    event.venue,
+                    event.max_seats,
+                    event.is_valid,
+                ],
+                [
+                    (
+                        registration.student.student_id,
+                        _REGISTRATION_STATUS_CODES[registration.status],
+                        "\n".join(registration.warnings),
+                    )
+                    for registration in event.registrations
+                ],
+            )
+            for event in system.events.values()
+        ],
+        [
+            (
+                request.request_id,
+                request.student.student_id,
+                request.category,
+                _REQUEST_STATUS_CODES[request.status],
+                (request.created_at - _EPOCH) // _MICROSECOND,
+            )
+            for request in system.service_requests.values()
+        ],
+    )
+
+
+def write_columns(
+    path: str,
+    students: List[StudentRow],
+    events: List[EventRow],
+    requests: List[RequestRow],
+) -> None:
+    """
+    Write stored rows to a columnar snapshot file.
+
+    This is what ``write_snapshot`` does for a live system; storage backends
+    call it with the rows they hold. Events are written in the given order and
+    each event's registrations are stored together, in their given order, so
+    an event's registrations are one contiguous slice. The file is written
+    next to ``path`` and renamed over it, so readers never see a partial
+    snapshot.
+
+    Args:
+        path (str): Snapshot file to create or replace
+        students (List[StudentRow]): Every student, including those referenced
+            by registrations and requests
+        events (List[EventRow]): Events with their registrations
+        requests (List[RequestRow]): Service requests
+    """
+    intern = _StringTable()
+    event_rows = {values[0]: row for row, (values, _) in enumerate(events)}
+    student_rows = {student_id: row for row, (student_id, _) in enumerate(students)}
+
+    event_columns = {name: array(code) for name, code in _EVENT_COLUMNS}
+    registration_columns = {name: array(code) for name, code in _REGISTRATION_COLUMNS}
+    registration_offsets = array("q", [0])
+    for values, registrations in events:
+        event_id, _, _, date, start_time, end_time = values[:6]
+        # The first seven values are the string columns, in column order
+        for (name, _), value in zip(_EVENT_COLUMNS[:7], values):
+            event_columns[name].append(intern(value))
+        event_columns["day"].append(parse_day(date))
+        event_columns["start_minute"].append(parse_minute_of_day(start_time))
+        event_columns["end_minute"].append(parse_minute_of_day(end_time))
+        event_columns["max_seats"].append(values[7])
+        event_columns["is_valid"].append(bool(values[8]))
+        confirmed = 0
+        for student_id, status, warnings in registrations:
+            registration_columns["event_row"].append(event_rows[event_id])
+            registration_columns["student_row"].append(student_rows[student_id])
+            registration_columns["status"].append(status)
+            registration_columns["warnings"].append(intern(warnings))
+            confirmed += status == _CONFIRMED
+        event_columns["confirmed"].append(confirmed)
+        event_columns["waitlisted"].append(len(registrations) - confirmed)
+        registration_offsets.append(len(registration_columns["event_row"]))
+
+    student_columns = {name: array(code) for name, code in _STUDENT_COLUMNS}
+    for student_id, name in students:
+        student_columns["student_id"].append(intern(student_id))
+        student_columns["name"].append(intern(name))
+
+    request_columns = {name: array(code) for name, code in _REQUEST_COLUMNS}
+    for request_id, student_id, category, status, created_at in requests:
+        request_columns["request_id"].append(intern(request_id))
+        request_columns["student_row"].append(student_rows[student_id])
+        request_columns["category"].append(intern(category))
+        request_columns["status"].append(status)
+        request_columns["created_at"].append(created_at)
+
+    blobs = [string.encode() for string in intern.strings]
+    string_offsets = array("q", [0])
+    for blob in blobs:
+        string_offsets.append(string_offsets[-1] + len(blob))
+
+    sections = [
+        string_offsets,
+        *event_columns.values(),
+        registration_offsets,
+        _sorted_rows(events, lambda event: event[0][0]),
+        *student_columns.values(),
+        _sorted_rows(students, lambda student: student[0]),
+        *registration_columns.values(),
+        *request_columns.values(),
+        b"".join(blobs),
+    ]
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        b"<" if sys.byteorder == "little" else b">",
+        len(intern.strings),
+        len(events),
+        len(students),
+        len(registration_columns["event_row"]),
+        len(requests),
+    )
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(header)
+        position = len(header)
+        for section in sections:
+            padding = -position % _ALIGNMENT
+            file.write(b"\0" * padding)
+            data = section if isinstance(section, bytes) else section.tobytes()
+            file.write(data)
+            position += padding + len(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def _sorted_rows(items: List, key: Callable) -> array:
+    """Row numbers ordered by key, for binary search by ID."""
+    return array("i", sorted(range(len(items)), key=lambda row: key(items[row])))
+
+
+class _LazyMapping(Mapping[str, V]):
+    """
+    Read-only mapping from ID to object, materialized on first access.
+
+    Keys are found by binary search over rows sorted by ID, so looking one up
+    decodes O(log n) strings and never builds a dict of every ID.
+    """
+
+    def __init__(
+        self,
+        ids: memoryview,
+        sorted_rows: memoryview,
+        string: Callable[[int], str],
+        build: Callable[[int], V],
+    ):
+        self._ids = ids
+        self._sorted_rows = sorted_rows
+        self._string = string
+        self._build = build
+        self._cache: Dict[int, V] = {}
+
+    def row(self, key: str) -> Optional[int]:
+        """Row number of an ID, or None if it is not in the snapshot."""
+        low, high = 0, len(self._sorted_rows)
+        while low < high:
+            middle = (low + high) // 2
+            if self._string(self._ids[self._sorted_rows[middle]]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self._sorted_rows):
+            row = self._sorted_rows[low]
+            if self._string(self._ids[row]) == key:
+                return row
+        return None
+
+    def at(self, row: int) -> V:
+        """Object stored in a row, materializing it once."""
+        value = self._cache.get(row)
+        if value is None:
+            value = self._cache[row] = self._build(row)
+        return value
+
+    def __getitem__(self, key: str) -> V:
+        row = self.row(key)
+        if row is None:
+            raise KeyError(key)
+        return self.at(row)
+
+    def __iter__(self) -> Iterator[str]:
+        for index in self._ids:
+            yield self._string(index)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def materialized(self) -> int:
+        """How many objects have been built so far."""
+        return len(self._cache)
+
+
+class ColumnarSnapshot:
+    """
+    Read-only view of a columnar snapshot file.
+
+    Opening maps the file and validates its header; no rows are read. Each
+    column is a typed ``memoryview`` over the mapping, so aggregates run over
+    the file's pages directly and ``numpy.frombuffer`` can wrap any column
+    without copying. ``events`` and ``students`` are mappings that build an
+    ``Event`` or ``Student`` the first time it is looked up. A materialized
+    event has its registrations attached in their stored order, and each is
+    also attached to its student, timetable included. A student therefore
+    holds only the registrations of the events materialized so far; a
+    freshly built student has none.
+
+    Example:
+        with ColumnarSnapshot("campus.snap") as snapshot:
+            print(snapshot.seat_totals())
+            event = snapshot.events["E1"]
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a snapshot file.
+
+        Args:
+            path (str): File written by ``write_snapshot``
+
+        Raises:
+            ValueError: If the file is not a snapshot, has an unsupported
+                version or was written on a machine of another byte order
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        try:
+            self._map_sections()
+        except BaseException:
+            self.close()
+            raise
+
+        self.events: _LazyMapping[Event] = _LazyMapping(
+            self.event_columns["event_id"],
+            self._sorted_events,
+            self.string,
+            self._build_event,
+        )
+        self.students: _LazyMapping[Student] = _LazyMapping(
+            self.student_columns["student_id"],
+            self._sorted_students,
+            self.string,
+            self._build_student,
+        )
+
+    def _map_sections(self) -> None:
+        if len(self._view) < _HEADER.size:
+            raise ValueError(f"{self.path} is not a columnar snapshot")
+        magic, version, byteorder, *counts = _HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a columnar snapshot")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        if byteorder != (b"<" if sys.byteorder == "little" else b">"):
+            raise ValueError("Snapshot was written with another byte order")
+        strings, events, students, registrations, requests = counts
+        self._position = _HEADER.size
+
+        self._string_offsets = self._take("q", strings + 1)
+        self.event_columns = {
+            name: self._take(code, events) for name, code in _EVENT_COLUMNS
+        }
+        self._registration_offsets = self._take("q", events + 1)
+        self._sorted_events = self._take("i", events)
+        self.student_columns = {
+            name: self._take(code, students) for name, code in _STUDENT_COLUMNS
+        }
+        self._sorted_students = self._take("i", students)
+        self.registration_columns = {
+            name: self._take(code, registrations)
+            for name, code in _REGISTRATION_COLUMNS
+        }
+        self.request_columns = {
+            name: self._take(code, requests) for name, code in _REQUEST_COLUMNS
+        }
+        self._strings = self._take("B", self._string_offsets[-1])
+        self._string_cache: Dict[int, str] = {}
+
+    def _take(self, code: str, length: int) -> memoryview:
+        """Map the next aligned column of ``length`` items."""
+        start = self._position + (-self._position % _ALIGNMENT)
+        end = start + length * struct.calcsize(code)
+        if end > len(self._view):
+            raise ValueError(f"{self.path} is truncated")
+        self._position = end
+        return self._view[start:end].cast(code)
+
+    def string(self, index: int) -> str:
+        """Decode one entry of the string table."""
+        value = self._string_cache.get(index)
+        if value is None:
+            start = self._string_offsets[index]
+            end = self._string_offsets[index + 1]
+            value = str(self._strings[start:end], "utf-8")
+            self._string_cache[index] = value
+        return value
+
+    def _build_event(self, row: int) -> Event:
+        columns = self.event_columns
+        event = Event(
+            *(
+                self.string(columns[name][row])
+                for name in (
+                    "event_id",
+                    "title",
+                    "club",
+                    "date",
+                    "start_time",
+                    "end_time",
+                    "venue",
+                )
+            ),
+            columns["max_seats"][row],
+        )
+        event.is_valid = bool(columns["is_valid"][row])
+
+        registrations: List[Registration] = []
+        students = self.registration_columns["student_row"]
+        statuses = self.registration_columns["status"]
+        warnings = self.registration_columns["warnings"]
+        start = self._registration_offsets[row]
+        end = self._registration_offsets[row + 1]
+        for position in range(start, end):
+            registration = Registration(self.students.at(students[position]), event)
+            registration.status = _REGISTRATION_STATUSES[statuses[position]]
+            if warnings[position]:
+                registration.warnings = tuple(
+                    self.string(warnings[position]).split("\n")
+                )
+            registrations.append(registration)
+        event.add_registrations(registrations)
+        for registration in registrations:
+            registration.student.add_registration(registration)
+        return event
+
+    def _build_student(self, row: int) -> Student:
+        columns = self.student_columns
+        return Student(
+            self.string(columns["student_id"][row]),
+            self.string(columns["name"][row]),
+        )
+
+    def service_request(self, row: int) -> ServiceRequest:
+        """Build the service request stored in a row."""
+        columns = self.request_columns
+        request = ServiceRequest(
+            self.string(columns["request_id"][row]),
+            self.students.at(columns["student_row"][row]),
+            self.string(columns["category"][row]),
+        )
+        request.status = _REQUEST_STATUSES[columns["status"][row]]
+        request.created_at = _EPOCH + columns["created_at"][row] * _MICROSECOND
+        return request
+
+    def seat_totals(self) -> Dict[str, int]:
+        """Seats offered, confirmed and waitlisted across all events."""
+        columns = self.event_columns
+        return {
+            "max": sum(columns["max_seats"]),
+            "confirmed": sum(columns["confirmed"]),
+            "waitlisted": sum(columns["waitlisted"]),
+        }
+
+    def events_per_venue(self) -> Dict[str, int]:
+        """Number of events held at each venue."""
+        return self._count_strings(self.event_columns["venue"])
+
+    def request_status_counts(self) -> Dict[RequestStatus, int]:
+        """Number of service requests in each status."""
+        counts = Counter(self.request_columns["status"])
+        return {status: counts[code] for code, status in enumerate(_REQUEST_STATUSES)}
+
+    def request_category_counts(self) -> Dict[str, int]:
+        """Number of service requests in each category."""
+        return self._count_strings(self.request_columns["category"])
+
+    def _count_strings(self, column: memoryview) -> Dict[str, int]:
+        return {self.string(index): count for index, count in Counter(column).items()}
+
+    def close(self) -> None:
+        """Release the mapping. Columns must not be used afterwards."""
+        for name in (
+            "event_columns",
+            "student_columns",
+            "registration_columns",
+            "request_columns",
+        ):
+            for column in getattr(self, name, {}).values():
+                column.release()
+        for name in (
+            "_string_offsets",
+            "_registration_offsets",
+            "_sorted_events",
+            "_sorted_students",
+            "_strings",
+        ):
+            column = getattr(self, name, None)
+            if column is not None:
+                column.release()
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "ColumnarSnapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,226 @@
+"""
+Tail-follow ingestion of an append-only JSONL file with checkpointing.
+"""
+
+import json
+import os
+import threading
+from typing import TYPE_CHECKING, BinaryIO, Optional, Tuple
+
+from importer import ImportKind, ImportReport, import_lines
+
+if TYPE_CHECKING:
+    from main import CampusEventManagementSystem
+
+
+class JsonlFollower:
+    """
+    Follows a growing JSONL file and imports each new line once.
+
+    Every poll reads the complete lines appended since the last one and feeds
+    them through ``importer.import_lines``, so they are validated, deduplicated
+    and applied in batches. A line still being written, without its newline,
+    is left for the next poll.
+
+    After each applied batch the byte offset of the next unread line is saved
+    in a checkpoint file, together with the file's device and inode, so a
+    restart resumes where it stopped without rescanning. Lines re-read after
+    a crash between applying a batch and saving the checkpoint are dropped as
+    duplicates by their IDs. A system whose storage is not persistent starts
+    empty after a restart, so its follower ignores the saved checkpoint and
+    reads the file from the start.
+
+    Rotation is detected when the path starts naming a different file: the
+    old file is drained through its open handle, then the new one is read
+    from the start. A file found shorter than the saved offset was truncated
+    in place and is also read again from the start.
+
+    Example:
+        follower = JsonlFollower(system, "tickets.jsonl", "tickets.checkpoint")
+        follower.start()
+    """
+
+    def __init__(
+        self,
+        system: "CampusEventManagementSystem",
+        path: str,
+        checkpoint_path: str,
+        kind: ImportKind = ImportKind.SERVICE_REQUESTS,
+        poll_interval: float = 0.2,
+        batch_bytes: int = 4 * 1024 * 1024,
+    ):
+        """
+        Create a follower, resuming from the checkpoint if there is one.
+
+        Args:
+            system (CampusEventManagementSystem): System to import into
+            path (str): JSONL file to follow
+            checkpoint_path (str): File to keep the read position in; only
+                resumed from if the system's storage is persistent
+            kind (ImportKind): What the lines describe
+            poll_interval (float): Seconds between polls of a running follower
+            batch_bytes (int): Most bytes read and applied at once
+        """
+        self.system = system
+        self.path = path
+        self.checkpoint_path = checkpoint_path
+        self.kind = kind
+        self.poll_interval = poll_interval
+        self.batch_bytes = batch_bytes
+        self.offset = 0
+        self.line = 0
+        self.imported = 0
+        self.last_report: Optional[ImportReport] = None
+        self.last_error: Optional[BaseException] = None
+        self._file: Optional[BinaryIO] = None
+        self._identity: Optional[Tuple[int, int]] = None
+        self._checkpoint = (
+            self._load_checkpoint() if system.storage.persistent else None
+        )
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def poll(self) -> ImportReport:
+        """
+        Import every complete line appended since the last poll.
+
+        Returns:
+            ImportReport: What this poll imported; error lines are numbered
+                from the start of the file being followed
+        """
+        report = ImportReport(self.kind)
+        if self._file is None and not self._open():
+            return report
+        if os.fstat(self._file.fileno()).st_size < self.offset:
+            # Truncated in place, e.g. by copytruncate rotation
+            self._rewind()
+        self._drain(report)
+
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            # Rotated away and not recreated yet; keep the old file open
+            return report
+        if (stat.st_dev, stat.st_ino) != self._identity:
+            self._close()
+            if self._open():
+                self._drain(report)
+        self.last_report = report
+        return report
+
+    def start(self) -> None:
+        """Poll in a background thread until ``stop`` is called."""
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="jsonl-follower", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread and close the file."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._close()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.poll()
+                self.last_error = None
+            except Exception as e:
+                # Keep following; the failed batch is retried on the next poll
+                self.last_error = e
+            if self._stopped.wait(self.poll_interval):
+                return
+
+    def _open(self) -> bool:
+        """Open the followed file, resuming at the checkpoint if it names it."""
+        try:
+            self._file = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        stat = os.fstat(self._file.fileno())
+        self._identity = (stat.st_dev, stat.st_ino)
+        checkpoint = self._checkpoint
+        self._checkpoint = None
+        if (
+            checkpoint is not None
+            and (checkpoint["device"], checkpoint["inode"]) == self._identity
+            and checkpoint["offset"] <= stat.st_size
+        ):
+            self.offset = checkpoint["offset"]
+            self.line = checkpoint["line"]
+            self._file.seek(self.offset)
+        else:
+            self.offset = self.line = 0
+            self._save_checkpoint()
+        return True
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rewind(self) -> None:
+        self._file.seek(0)
+        self.offset = self.line = 0
+        self._save_checkpoint()
+
+    def _drain(self, report: ImportReport) -> None:
+        """Apply the complete lines after ``offset``, a batch at a time."""
+        while True:
+            data = self._file.read(self.batch_bytes)
+            end = data.rfind(b"\n") + 1
+            if not end:
+                if len(data) == self.batch_bytes:
+                    raise ValueError(
+                        f"Line at byte {self.offset} of {self.path} is longer "
+                        f"than {self.batch_bytes} bytes"
+                    )
+                # Leave a partial line to be read again once it is complete
+                self._file.seek(self.offset)
+                return
+            lines = data[:end].decode("utf-8", errors="replace").split("\n")
+            lines.pop()
+            batch = import_lines(self.system, lines, self.kind, "jsonl")
+            self._merge(report, batch)
+            self.offset += end
+            self.line += len(lines)
+            self._file.seek(self.offset)
+            self._save_checkpoint()
+
+    def _merge(self, report: ImportReport, batch: ImportReport) -> None:
+        """Add a batch's outcome to a poll's report, numbering its lines."""
+        report.records += batch.records
+        report.imported += batch.imported
+        report.duplicates += batch.duplicates
+        report.seconds += batch.seconds
+        for error in batch.errors:
+            report.reject(self.line + error.line, error.message)
+        report.error_count += batch.error_count - len(batch.errors)
+        self.imported += batch.imported
+
+    def _load_checkpoint(self) -> Optional[dict]:
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def _save_checkpoint(self) -> None:
+        """Atomically replace the checkpoint with the current position."""
+        device, inode = self._identity
+        temporary = self.checkpoint_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "device": device,
+                    "inode": inode,
+                    "offset": self.offset,
+                    "line": self.line,
+                },
+                file,
+            )
+        os.replace(temporary, self.checkpoint_path)
@@ -57,9 +57,22 @@ def get_system_health() -> Dict[str, Any]:
             health_data["application"] = {
                 "students_count": len(system.students),
                 "events_count": len(system.events),
-                "registrations_count": len(system.registrations),
+                "registrations_count": sum(
+                    event.confirmed_count + event.waitlisted_count
+                    for event in system.events.values()
+                ),
                 "service_requests_count": len(system.service_requests),
             }
+            if system.recovery_seconds is not None:
+                health_data["recovery"] = {"seconds": system.recovery_seconds}
+                report = getattr(system.storage, "recovery", None)
+                if report is not None:
+                    health_data["recovery"].update(
+                        load_seconds=report.seconds,
+                        snapshot_records=report.snapshot_records,
+                        journal_records=report.journal_records,
+                        journal_bytes=report.journal_bytes,
+                    )
 
         return health_data
 
@@ -121,6 +134,16 @@ def health_check_page():
                     "Total Students", health_data["application"]["students_count"]
                 )
 
+        if "recovery" in health_data:
+            recovery = health_data["recovery"]
+            replayed = recovery.get("journal_records")
+            st.metric(
+                "Startup Recovery",
+                f"{recovery['seconds'] * 1000:.0f} ms",
+                delta=None if replayed is None else f"{replayed} records replayed",
+                delta_color="off",
+            )
+
     # Detailed information in expander
     with st.expander("Detailed Health Information"):
         st.json(health_data)
@@ -0,0 +1,194 @@
+"""
+Append-only status history of service requests with resolution-time aggregates.
+"""
+
+import math
+import threading
+from array import array
+from bisect import insort
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from models import RequestStatus
+
+_STATUSES = tuple(RequestStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+_NO_STATUS = -1
+
+# (request_id, from status or None for creation, to status, timestamp)
+Transition = Tuple[str, Optional[RequestStatus], RequestStatus, datetime]
+
+
+class _Chunk:
+    """Fixed-capacity block of transitions stored column by column."""
+
+    __slots__ = ("requests", "old", "new", "times")
+
+    def __init__(self):
+        self.requests = array("i")
+        self.old = array("b")
+        self.new = array("b")
+        self.times = array("d")
+
+
+class _Durations:
+    """Sorted resolution times of one category, in seconds."""
+
+    __slots__ = ("sorted", "total")
+
+    def __init__(self):
+        self.sorted: List[float] = []
+        self.total = 0.0
+
+    def add(self, seconds: float) -> None:
+        insort(self.sorted, seconds)
+        self.total += seconds
+
+    def percentile(self, fraction: float) -> float:
+        # Nearest-rank percentile
+        rank = max(1, math.ceil(len(self.sorted) * fraction))
+        return self.sorted[rank - 1]
+
+
+class TransitionLog:
+    """
+    Append-only log of service request status transitions.
+
+    Transitions are stored in columnar chunks of ``chunk_size`` rows: request
+    numbers, old and new status codes and timestamps each live in a typed
+    array, so a transition costs 14 bytes instead of a tuple of objects.
+
+    Resolution times are aggregated as transitions arrive. A request's clock
+    starts when it is created or reopened and stops when it is resolved; the
+    elapsed time joins a sorted list of its category, so the mean and any
+    percentile are read without scanning the log.
+    """
+
+    def __init__(self, chunk_size: int = 4096):
+        """
+        Create an empty log.
+
+        Args:
+            chunk_size (int): Transitions per columnar chunk
+        """
+        self.chunk_size = chunk_size
+        self._chunks: List[_Chunk] = []
+        self._request_ids: List[str] = []
+        self._request_numbers: Dict[str, int] = {}
+        self._opened_at: Dict[int, float] = {}
+        self._durations: Dict[Optional[str], _Durations] = {None: _Durations()}
+        self._length = 0
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        request_id: str,
+        category: str,
+        old: Optional[RequestStatus],
+        new: RequestStatus,
+        at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Append a transition and update the resolution-time aggregates.
+
+        Args:
+            request_id (str): ID of the request that changed
+            category (str): Category of the request
+            old (Optional[RequestStatus]): Previous status, None when the request
+                was just created
+            new (RequestStatus): Status the request moved to
+            at (Optional[datetime]): Time of the transition. Defaults to now.
+        """
+        timestamp = (at or datetime.now()).timestamp()
+        with self._lock:
+            number = self._request_numbers.get(request_id)
+            if number is None:
+                number = self._request_numbers[request_id] = len(self._request_ids)
+                self._request_ids.append(request_id)
+
+            if not self._chunks or len(self._chunks[-1].times) >= self.chunk_size:
+                self._chunks.append(_Chunk())
+            chunk = self._chunks[-1]
+            chunk.requests.append(number)
+            chunk.old.append(_NO_STATUS if old is None else _STATUS_CODES[old])
+            chunk.new.append(_STATUS_CODES[new])
+            chunk.times.append(timestamp)
+            self._length += 1
+
+            if new == RequestStatus.RESOLVED:
+                opened_at = self._opened_at.pop(number, None)
+                if opened_at is not None:
+                    elapsed = max(0.0, timestamp - opened_at)
+                    self._durations[None].add(elapsed)
+                    durations = self._durations.get(category)
+                    if durations is None:
+                        durations = self._durations[category] = _Durations()
+                    durations.add(elapsed)
+            elif old is None or old == RequestStatus.RESOLVED:
+                self._opened_at[number] = timestamp
+
+    def transitions(self, request_id: Optional[str] = None) -> Iterator[Transition]:
+        """
+        Iterate over logged transitions in the order they were recorded.
+
+        Args:
+            request_id (Optional[str]): Only yield the transitions of this request
+
+        Yields:
+            Transition: (request_id, old status or None, new status, timestamp)
+        """
+        with self._lock:
+            chunks = [(chunk, len(chunk.times)) for chunk in self._chunks]
+            wanted = (
+                None
+                if request_id is None
+                else self._request_numbers.get(request_id, _NO_STATUS)
+            )
+        for chunk, size in chunks:
+            for row in range(size):
+                number = chunk.requests[row]
+                if wanted is not None and number != wanted:
+                    continue
+                old = chunk.old[row]
+                yield (
+                    self._request_ids[number],
+                    None if old == _NO_STATUS else _STATUSES[old],
+                    _STATUSES[chunk.new[row]],
+                    datetime.fromtimestamp(chunk.times[row]),
+                )
+
+    def resolution_stats(self, category: Optional[str] = None) -> Dict[str, float]:
+        """
+        Summarise the time taken to resolve requests.
+
+        Args:
+            category (Optional[str]): Only include this category
+
+        Returns:
+            Dict[str, float]: ``count`` of resolutions plus ``mean_hours``,
+                ``p50_hours`` and ``p90_hours`` (0 when nothing was resolved)
+        """
+        with self._lock:
+            durations = self._durations.get(category)
+            if durations is None or not durations.sorted:
+                return {
+                    "count": 0,
+                    "mean_hours": 0.0,
+                    "p50_hours": 0.0,
+                    "p90_hours": 0.0,
+                }
+            return {
+                "count": len(durations.sorted),
+                "mean_hours": durations.total / len(durations.sorted) / 3600,
+                "p50_hours": durations.percentile(0.50) / 3600,
+                "p90_hours": durations.percentile(0.90) / 3600,
+            }
+
+    def resolution_summary(self) -> Dict[str, Dict[str, float]]:
+        """Return ``resolution_stats`` of every category with a resolved request."""
+        with self._lock:
+            categories = [category for category in self._durations if category]
+        return {category: self.resolution_stats(category) for category in categories}
+
+    def __len__(self) -> int:
+        return self._length
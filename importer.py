@@ -0,0 +1,377 @@
+"""
+Streaming import of events, students, registrations and service requests.
+"""
+
+import argparse
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from models import parse_day, parse_minute_of_day
+
+if TYPE_CHECKING:
+    from main import CampusEventManagementSystem
+
+# (line number, parsed record)
+NumberedRecord = Tuple[int, Dict[str, Any]]
+# Journals and columnar snapshots store seat counts as unsigned 32-bit ints
+_MAX_SEATS = 2**32 - 1
+
+
+class ImportKind(Enum):
+    EVENTS = "events"
+    STUDENTS = "students"
+    REGISTRATIONS = "registrations"
+    SERVICE_REQUESTS = "service_requests"
+
+
+@dataclass
+class RecordError:
+    """
+    A record that was not imported.
+
+    Attributes:
+        line (int): Line of the record in the input, starting at 1
+        message (str): Why the record was rejected
+    """
+
+    line: int
+    message: str
+
+
+@dataclass
+class ImportReport:
+    """
+    Outcome of an import.
+
+    Attributes:
+        kind (ImportKind): What was imported
+        records (int): Records read, including rejected ones
+        imported (int): Records passed to the system
+        duplicates (int): Records skipped because their ID was already in the
+            system or earlier in the input
+        errors (List[RecordError]): The first ``max_errors`` rejected records
+        error_count (int): All rejected records, including those not kept
+        seconds (float): Wall time of the import
+    """
+
+    kind: ImportKind
+    max_errors: int = 1000
+    records: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    errors: List[RecordError] = field(default_factory=list)
+    error_count: int = 0
+    seconds: float = 0.0
+
+    def reject(self, line: int, message: str) -> None:
+        """Record a rejected record, keeping at most ``max_errors`` of them."""
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(RecordError(line, message))
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+
+def read_jsonl(lines: Iterable[str], report: ImportReport) -> Iterator[NumberedRecord]:
+    """
+    Parse JSON Lines, rejecting lines that are not exactly one JSON object.
+
+    Each line is decoded on its own by the decoder's ``raw_decode``, which
+    skips the per-call overhead of ``json.loads``, and must end where its value
+    does.
+    """
+    raw_decode = json.JSONDecoder().raw_decode
+    for number, line in enumerate(lines, 1):
+        text = line.strip()
+        if not text:
+            continue
+        report.records += 1
+        try:
+            record, end = raw_decode(text)
+            if end != len(text):
+                raise json.JSONDecodeError("Extra data", text, end)
+        except ValueError as e:
+            report.reject(number, f"Invalid JSON: {e}")
+            continue
+        if type(record) is not dict:
+            report.reject(number, "Expected a JSON object")
+            continue
+        yield number, record
+
+
+def read_csv(lines: Iterable[str], report: ImportReport) -> Iterator[NumberedRecord]:
+    """Parse CSV with a header row, rejecting rows with extra columns."""
+    reader = csv.DictReader(lines)
+    for record in reader:
+        report.records += 1
+        if None in record:
+            report.reject(reader.line_num, "Row has more fields than the header")
+            continue
+        yield reader.line_num, record
+
+
+_READERS = {"csv": read_csv, "jsonl": read_jsonl}
+
+
+def _text(record: Dict[str, Any], key: str) -> str:
+    """A required, non-empty string field."""
+    value = record.get(key)
+    if value is None or value == "":
+        raise ValueError(f"Missing {key}")
+    return str(value)
+
+
+def _validate_event(record: Dict[str, Any]) -> Dict[str, Any]:
+    event = {
+        key: _text(record, key)
+        for key in (
+            "event_id",
+            "title",
+            "club",
+            "date",
+            "start_time",
+            "end_time",
+            "venue",
+        )
+    }
+    try:
+        max_seats = int(_text(record, "max_seats"))
+    except ValueError as e:
+        raise ValueError(f"Invalid max_seats: {e}") from None
+    if max_seats <= 0:
+        raise ValueError("max_seats must be positive")
+    if max_seats > _MAX_SEATS:
+        raise ValueError(f"max_seats must be at most {_MAX_SEATS}")
+    event["max_seats"] = max_seats
+    parse_day(event["date"])
+    if parse_minute_of_day(event["end_time"]) < parse_minute_of_day(
+        event["start_time"]
+    ):
+        raise ValueError(
+            f"Event end time {event['end_time']} is before start time "
+            f"{event['start_time']}"
+        )
+    return event
+
+
+def _import_events(
+    system: "CampusEventManagementSystem",
+    chunk: List[NumberedRecord],
+    report: ImportReport,
+) -> None:
+    pending: Dict[str, Dict[str, Any]] = {}
+    for line, record in chunk:
+        try:
+            event = _validate_event(record)
+        except ValueError as e:
+            report.reject(line, str(e))
+            continue
+        if event["event_id"] in system.events or event["event_id"] in pending:
+            report.duplicates += 1
+        else:
+            pending[event["event_id"]] = event
+    system.add_events(pending.values())
+    report.imported += len(pending)
+
+
+def _import_students(
+    system: "CampusEventManagementSystem",
+    chunk: List[NumberedRecord],
+    report: ImportReport,
+) -> None:
+    students = system.students
+    for line, record in chunk:
+        try:
+            student_id = _text(record, "student_id")
+        except ValueError as e:
+            report.reject(line, str(e))
+            continue
+        if student_id in students:
+            report.duplicates += 1
+            continue
+        system.add_student(student_id, str(record.get("name") or ""))
+        report.imported += 1
+
+
+def _import_registrations(
+    system: "CampusEventManagementSystem",
+    chunk: List[NumberedRecord],
+    report: ImportReport,
+) -> None:
+    pairs: Dict[Tuple[str, str], int] = {}
+    for line, record in chunk:
+        try:
+            pair = (_text(record, "student_id"), _text(record, "event_id"))
+        except ValueError as e:
+            report.reject(line, str(e))
+            continue
+        student_id, event_id = pair
+        event = system.events.get(event_id)
+        if student_id not in system.students:
+            report.reject(line, f"Unknown student {student_id}")
+        elif event is None:
+            report.reject(line, f"Unknown event {event_id}")
+        elif pair in pairs or event.get_registration(student_id) is not None:
+            report.duplicates += 1
+        else:
+            pairs[pair] = line
+    outcomes = system.register_many(pairs)
+    for (student_id, event_id), line, outcome in zip(pairs, pairs.values(), outcomes):
+        if outcome is None:
+            report.reject(line, f"Registration of {student_id} for {event_id} refused")
+        else:
+            report.imported += 1
+
+
+def _import_service_requests(
+    system: "CampusEventManagementSystem",
+    chunk: List[NumberedRecord],
+    report: ImportReport,
+) -> None:
+    seen = set()
+    for line, record in chunk:
+        try:
+            request_id = _text(record, "request_id")
+            student_id = _text(record, "student_id")
+            category = _text(record, "category")
+        except ValueError as e:
+            report.reject(line, str(e))
+            continue
+        if request_id in system.service_requests or request_id in seen:
+            report.duplicates += 1
+        elif system.raise_service_request(request_id, student_id, category) is None:
+            report.reject(line, f"Unknown student {student_id}")
+        else:
+            seen.add(request_id)
+            report.imported += 1
+
+
+_IMPORTERS = {
+    ImportKind.EVENTS: _import_events,
+    ImportKind.STUDENTS: _import_students,
+    ImportKind.REGISTRATIONS: _import_registrations,
+    ImportKind.SERVICE_REQUESTS: _import_service_requests,
+}
+
+
+def import_lines(
+    system: "CampusEventManagementSystem",
+    lines: Iterable[str],
+    kind: ImportKind,
+    fmt: str,
+    chunk_size: int = 10_000,
+    max_errors: int = 1000,
+) -> ImportReport:
+    """
+    Stream records of one kind from text lines into a system.
+
+    Lines are parsed lazily and handled ``chunk_size`` records at a time, so
+    memory stays bounded by the chunk however long the input is. Each chunk is
+    validated and deduplicated, against the chunk and the system, then fed to
+    the system's bulk APIs inside one ``storage.batch()``. Bad records are
+    reported and skipped; they never abort the import.
+
+    Args:
+        system (CampusEventManagementSystem): System to import into
+        lines (Iterable[str]): Input lines, e.g. an open file
+        kind (ImportKind): What the records describe
+        fmt (str): "csv" (with a header row) or "jsonl"
+        chunk_size (int): Records validated and applied together
+        max_errors (int): Rejected records to keep in the report
+
+    Returns:
+        ImportReport: Counts and the rejected records
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    reader = _READERS.get(fmt)
+    if reader is None:
+        raise ValueError(f"Unsupported import format {fmt!r}")
+    started = time.perf_counter()
+    report = ImportReport(kind, max_errors)
+    records = reader(lines, report)
+    importer = _IMPORTERS[kind]
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        with system.storage.batch():
+            importer(system, chunk, report)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def import_file(
+    system: "CampusEventManagementSystem",
+    path: str,
+    kind: ImportKind,
+    fmt: Optional[str] = None,
+    chunk_size: int = 10_000,
+    max_errors: int = 1000,
+) -> ImportReport:
+    """
+    Stream a CSV or JSONL file into a system; see ``import_lines``.
+
+    Args:
+        fmt (Optional[str]): "csv" or "jsonl". Defaults to the file extension,
+            with ".json" and ".ndjson" read as JSON Lines.
+    """
+    if fmt is None:
+        extension = path.rsplit(".", 1)[-1].lower()
+        fmt = "jsonl" if extension in ("json", "ndjson") else extension
+    with open(path, newline="", encoding="utf-8", buffering=1 << 20) as file:
+        return import_lines(system, file, kind, fmt, chunk_size, max_errors)
+
+
+def cli(argv: Optional[List[str]] = None) -> None:
+    """Import files into the system persisted at --db or --journal."""
+    from journal import JournalStorage
+    from main import CampusEventManagementSystem
+    from storage import SQLiteStorage
+
+    parser = argparse.ArgumentParser(description=cli.__doc__)
+    parser.add_argument("kind", choices=[kind.value for kind in ImportKind])
+    parser.add_argument("paths", nargs="+")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--db", help="SQLite database file")
+    target.add_argument("--journal", help="Journal directory")
+    parser.add_argument("--format", choices=sorted(_READERS))
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    storage = JournalStorage(args.journal) if args.journal else SQLiteStorage(args.db)
+    system = CampusEventManagementSystem(storage=storage)
+    try:
+        for path in args.paths:
+            report = import_file(
+                system, path, ImportKind(args.kind), args.format, args.chunk_size
+            )
+            print(
+                f"{path}: {report.imported} imported, {report.duplicates} duplicates, "
+                f"{report.error_count} errors ({report.records_per_second:,.0f}/s)"
+            )
+            for error in report.errors:
+                print(f"  line {error.line}: {error.message}")
+    finally:
+        storage.close()
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,223 @@
+"""
+Asyncio intake pipeline for bursts of registration commands.
+"""
+
+import asyncio
+import math
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from main import CampusEventManagementSystem
+from models import Registration
+
+# (student_id, future resolved with the outcome, submission time)
+_Command = Tuple[str, "asyncio.Future[Optional[Registration]]", float]
+
+
+class RegistrationIntake:
+    """
+    Accepts registration commands into bounded per-event queues.
+
+    Each event gets its own FIFO queue and a worker task that drains it in
+    batches through ``register_many``, so commands for one event are applied
+    in arrival order while headline events do not hold up the rest. Batches run
+    in a worker thread (the system is thread-safe), which keeps the event loop
+    free to accept new commands.
+
+    When an event's queue is full, ``register`` waits for room and
+    ``register_nowait`` raises ``asyncio.QueueFull``; either way callers are
+    slowed down instead of memory growing without bound.
+
+    Example:
+        async with RegistrationIntake(system) as intake:
+            registration = await intake.register("S001", "E001")
+    """
+
+    def __init__(
+        self,
+        system: CampusEventManagementSystem,
+        max_queue_size: int = 1000,
+        max_batch_size: int = 256,
+    ):
+        """
+        Create an intake in front of a system.
+
+        Args:
+            system (CampusEventManagementSystem): System to register into
+            max_queue_size (int): Pending commands allowed per event
+            max_batch_size (int): Most commands applied in one ``register_many`` call
+        """
+        self.system = system
+        self.max_queue_size = max_queue_size
+        self.max_batch_size = max_batch_size
+        self._queues: Dict[str, "asyncio.Queue[_Command]"] = {}
+        self._workers: Dict[str, "asyncio.Task[None]"] = {}
+        self.latencies: List[float] = []
+
+    async def register(self, student_id: str, event_id: str) -> Optional[Registration]:
+        """
+        Queue a registration and wait for it to be applied.
+
+        Waits while the event's queue is full.
+
+        Args:
+            student_id (str): ID of the student to register
+            event_id (str): ID of the event to register for
+
+        Returns:
+            Optional[Registration]: The registration, whose status is CONFIRMED or
+                WAITLISTED, or None if the student or event was not found or
+                the clash policy rejected it
+        """
+        submitted = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queue_for(event_id)
+        if queue is None:
+            return None
+        await queue.put((student_id, future, submitted))
+        return await future
+
+    def register_nowait(
+        self, student_id: str, event_id: str
+    ) -> "asyncio.Future[Optional[Registration]]":
+        """
+        Queue a registration without waiting for room in the queue.
+
+        Args:
+            student_id (str): ID of the student to register
+            event_id (str): ID of the event to register for
+
+        Returns:
+            asyncio.Future: Resolved with the outcome ``register`` would return
+
+        Raises:
+            asyncio.QueueFull: If the event's queue is full; nothing is queued
+        """
+        submitted = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queue_for(event_id)
+        if queue is None:
+            future.set_result(None)
+        else:
+            queue.put_nowait((student_id, future, submitted))
+        return future
+
+    def pending(self, event_id: str) -> int:
+        """Return the number of commands waiting in an event's queue."""
+        queue = self._queues.get(event_id)
+        return queue.qsize() if queue is not None else 0
+
+    def _queue_for(self, event_id: str) -> Optional["asyncio.Queue[_Command]"]:
+        queue = self._queues.get(event_id)
+        if queue is None:
+            # Unknown events are answered at once rather than given a queue
+            if event_id not in self.system.events:
+                return None
+            queue = asyncio.Queue(self.max_queue_size)
+            self._queues[event_id] = queue
+            self._workers[event_id] = asyncio.create_task(self._drain(event_id, queue))
+        return queue
+
+    async def _drain(self, event_id: str, queue: "asyncio.Queue[_Command]") -> None:
+        """Apply the commands of one event in arrival order, batch by batch."""
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.max_batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                outcomes = await asyncio.to_thread(
+                    self.system.register_many,
+                    [(student_id, event_id) for student_id, _, _ in batch],
+                )
+            except Exception as exc:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            else:
+                finished = time.perf_counter()
+                for (_, future, submitted), outcome in zip(batch, outcomes):
+                    if not future.done():
+                        future.set_result(outcome)
+                    self.latencies.append(finished - submitted)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def join(self) -> None:
+        """Wait until every queued command has been applied."""
+        for queue in list(self._queues.values()):
+            await queue.join()
+
+    async def close(self) -> None:
+        """Apply the queued commands, then stop the worker tasks."""
+        await self.join()
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
+
+    async def __aenter__(self) -> "RegistrationIntake":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def latency_stats(self) -> Dict[str, float]:
+        """
+        Summarise the time from submission to result of applied commands.
+
+        Returns:
+            Dict[str, float]: ``count`` plus ``p50_ms``, ``p99_ms`` and ``max_ms``
+                in milliseconds (0 when nothing was applied)
+        """
+        samples = sorted(self.latencies)
+        if not samples:
+            return {"count": 0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+        def percentile(fraction: float) -> float:
+            # Nearest-rank percentile
+            rank = max(1, math.ceil(len(samples) * fraction))
+            return samples[rank - 1] * 1000
+
+        return {
+            "count": len(samples),
+            "p50_ms": percentile(0.50),
+            "p99_ms": percentile(0.99),
+            "max_ms": samples[-1] * 1000,
+        }
+
+
+async def simulate_burst(
+    system: CampusEventManagementSystem,
+    pairs: Iterable[Tuple[str, str]],
+    max_queue_size: int = 1000,
+    max_batch_size: int = 256,
+) -> Dict[str, float]:
+    """
+    Submit a burst of registrations at once and measure their latency.
+
+    Every (student_id, event_id) pair is submitted concurrently, so the queues
+    fill up and backpressure is part of the measured latency.
+
+    Args:
+        system (CampusEventManagementSystem): System to register into
+        pairs (Iterable[Tuple[str, str]]): (student_id, event_id) requests
+        max_queue_size (int): Pending commands allowed per event
+        max_batch_size (int): Most commands applied in one batch
+
+    Returns:
+        Dict[str, float]: ``latency_stats`` of the burst plus ``seconds``, the
+            wall time, and ``throughput``, commands applied per second
+    """
+    async with RegistrationIntake(system, max_queue_size, max_batch_size) as intake:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(intake.register(student_id, event_id) for student_id, event_id in pairs)
+        )
+        elapsed = time.perf_counter() - started
+
+    stats = intake.latency_stats()
+    stats["seconds"] = elapsed
+    stats["throughput"] = stats["count"] / elapsed if elapsed else 0.0
+    return stats
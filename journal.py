@@ -0,0 +1,645 @@
+"""
+Append-only journal storage backend with periodic snapshots.
+"""
+
+import logging
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from columnar import ColumnarSnapshot, write_columns
+from models import (
+    Event,
+    Registration,
+    RegistrationStatus,
+    RequestStatus,
+    ServiceRequest,
+    Student,
+)
+from storage import StorageBackend, StoredState
+
+_REQUEST_STATUSES = tuple(RequestStatus)
+_REQUEST_STATUS_CODES = {status: code for code, status in enumerate(_REQUEST_STATUSES)}
+_REGISTRATION_STATUSES = tuple(RegistrationStatus)
+_REGISTRATION_STATUS_CODES = {
+    status: code for code, status in enumerate(_REGISTRATION_STATUSES)
+}
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+_logger = logging.getLogger(__name__)
+
+_JOURNAL_MAGIC = b"CEJ1"
+_SNAPSHOT_MAGIC = b"CES1"
+# Snapshot header after the magic: first journal segment not folded into it
+_SNAPSHOT_HEADER = struct.Struct("<I")
+# Record frame: body length and CRC-32 of the body, which starts with the opcode
+_FRAME = struct.Struct("<II")
+_LENGTH = struct.Struct("<I")
+_SEGMENT_NAME = re.compile(r"journal-(\d{8})\.log$")
+_SNAPSHOT_NAME = "snapshot.bin"
+_COLUMNAR_NAME = "snapshot.cols"
+
+# Opcodes and field layouts: "s" is a length-prefixed UTF-8 string, any other
+# letter a struct format character
+_SAVE_STUDENT = 1
+_ADD_EVENT = 2
+_UPDATE_EVENT = 3
+_DELETE_EVENT = 4
+_ADD_REGISTRATION = 5
+_UPDATE_REGISTRATION = 6
+_DELETE_REGISTRATION = 7
+_ADD_REQUEST = 8
+_UPDATE_REQUEST = 9
+_LAYOUTS = {
+    _SAVE_STUDENT: "ss",
+    _ADD_EVENT: "sssssssIB",
+    _UPDATE_EVENT: "ssssB",
+    _DELETE_EVENT: "s",
+    _ADD_REGISTRATION: "ssBs",
+    _UPDATE_REGISTRATION: "ssBs",
+    _DELETE_REGISTRATION: "ss",
+    _ADD_REQUEST: "sssBq",
+    _UPDATE_REQUEST: "sB",
+}
+_FIELDS = {
+    code: [None if kind == "s" else struct.Struct("<" + kind) for kind in layout]
+    for code, layout in _LAYOUTS.items()
+}
+
+
+def _encode(code: int, *values: Any) -> bytes:
+    """Frame one record."""
+    parts = [bytes((code,))]
+    for field, value in zip(_FIELDS[code], values):
+        if field is None:
+            data = value.encode()
+            parts.append(_LENGTH.pack(len(data)))
+            parts.append(data)
+        else:
+            parts.append(field.pack(value))
+    body = b"".join(parts)
+    return _FRAME.pack(len(body), zlib.crc32(body)) + body
+
+
+def _decode(data: bytes, offset: int) -> Iterator[Tuple[int, List[Any]]]:
+    """
+    Yield (opcode, fields) for each record from ``offset`` on.
+
+    Stops at the first truncated or corrupt record: a crash can tear the last
+    group commit, and nothing after it was acknowledged.
+    """
+    view = memoryview(data)
+    end = len(data)
+    while offset + _FRAME.size <= end:
+        length, checksum = _FRAME.unpack_from(data, offset)
+        start = offset + _FRAME.size
+        offset = start + length
+        if offset > end or zlib.crc32(view[start:offset]) != checksum:
+            return
+        code = data[start]
+        position = start + 1
+        values: List[Any] = []
+        for field in _FIELDS[code]:
+            if field is None:
+                (size,) = _LENGTH.unpack_from(data, position)
+                position += _LENGTH.size
+                values.append(str(view[position : position + size], "utf-8"))
+                position += size
+            else:
+                values.append(field.unpack_from(data, position)[0])
+                position += field.size
+        yield code, values
+
+
+class _State:
+    """
+    Stored state rebuilt by applying records in order.
+
+    Dicts keep insertion order, so re-adding an entry moves it to the end the
+    way a new row would. Registrations carry a global sequence number so they
+    come out in the order they were made.
+    """
+
+    def __init__(self):
+        self.students: Dict[str, str] = {}
+        self.events: Dict[str, List[Any]] = {}
+        self.registrations: Dict[str, Dict[str, List[Any]]] = {}
+        self.requests: Dict[str, List[Any]] = {}
+        self._sequence = 0
+
+    def apply(self, code: int, values: List[Any]) -> None:
+        if code == _SAVE_STUDENT:
+            self.students[values[0]] = values[1]
+        elif code == _ADD_EVENT:
+            self.events.pop(values[0], None)
+            self.events[values[0]] = values
+            self.registrations.pop(values[0], None)
+        elif code == _UPDATE_EVENT:
+            event = self.events.get(values[0])
+            if event is not None:
+                event[3:6] = values[1:4]
+                event[8] = values[4]
+        elif code == _DELETE_EVENT:
+            self.events.pop(values[0], None)
+            self.registrations.pop(values[0], None)
+        elif code == _ADD_REGISTRATION:
+            event_id, student_id, status, warnings = values
+            registrations = self.registrations.setdefault(event_id, {})
+            registrations.pop(student_id, None)
+            registrations[student_id] = [self._sequence, status, warnings]
+            self._sequence += 1
+        elif code == _UPDATE_REGISTRATION:
+            event_id, student_id, status, warnings = values
+            row = self.registrations.get(event_id, {}).get(student_id)
+            if row is not None:
+                row[1:] = status, warnings
+        elif code == _DELETE_REGISTRATION:
+            self.registrations.get(values[0], {}).pop(values[1], None)
+        elif code == _ADD_REQUEST:
+            self.requests.pop(values[0], None)
+            self.requests[values[0]] = values
+        elif code == _UPDATE_REQUEST:
+            request = self.requests.get(values[0])
+            if request is not None:
+                request[3] = values[1]
+
+    def records(self) -> Iterator[bytes]:
+        """The fewest records that rebuild this state, for a snapshot."""
+        for student_id, name in self.students.items():
+            yield _encode(_SAVE_STUDENT, student_id, name)
+        for values in self.events.values():
+            yield _encode(_ADD_EVENT, *values)
+        for event_id, student_id, status, warnings in self._registration_rows():
+            yield _encode(_ADD_REGISTRATION, event_id, student_id, status, warnings)
+        for values in self.requests.values():
+            yield _encode(_ADD_REQUEST, *values)
+
+    def stored_state(self) -> StoredState:
+        keys = (
+            "event_id",
+            "title",
+            "club",
+            "date",
+            "start_time",
+            "end_time",
+            "venue",
+            "max_seats",
+        )
+        return StoredState(
+            students=list(self.students.items()),
+            events=[dict(zip(keys, values)) for values in self.events.values()],
+            registrations=[
+                (
+                    event_id,
+                    student_id,
+                    _REGISTRATION_STATUSES[status].value,
+                    tuple(warnings.split("\n")) if warnings else (),
+                )
+                for event_id, student_id, status, warnings in (
+                    self._registration_rows()
+                )
+            ],
+            service_requests=[
+                (
+                    request_id,
+                    student_id,
+                    category,
+                    _REQUEST_STATUSES[status].value,
+                    _EPOCH + created_at * _MICROSECOND,
+                )
+                for request_id, student_id, category, status, created_at in (
+                    self.requests.values()
+                )
+            ],
+        )
+
+    def write_columns(self, path: str) -> None:
+        """Write this state as a columnar snapshot file."""
+        # An event's registrations stay in the order they were made, because
+        # re-adding one moves it to the end of its event's dict
+        write_columns(
+            path,
+            list(self.students.items()),
+            [
+                (
+                    values,
+                    [
+                        (student_id, status, warnings)
+                        for student_id, (_, status, warnings) in (
+                            self.registrations.get(event_id, {}).items()
+                        )
+                    ],
+                )
+                for event_id, values in self.events.items()
+            ],
+            list(self.requests.values()),
+        )
+
+    def _registration_rows(self) -> List[Tuple[str, str, int, str]]:
+        rows = [
+            (row[0], event_id, student_id, row[1], row[2])
+            for event_id, registrations in self.registrations.items()
+            for student_id, row in registrations.items()
+        ]
+        rows.sort(key=lambda row: row[0])
+        return [row[1:] for row in rows]
+
+
+@dataclass
+class RecoveryReport:
+    """
+    How the last start-up rebuilt the stored state.
+
+    Attributes:
+        seconds (float): Time to read the snapshot and replay the journal
+        snapshot_records (int): Records read from the snapshot
+        journal_records (int): Records replayed from the journal tail
+        journal_bytes (int): Size of the journal tail that was replayed
+    """
+
+    seconds: float
+    snapshot_records: int
+    journal_records: int
+    journal_bytes: int
+
+
+class JournalStorage(StorageBackend):
+    """
+    Journal backend for a CampusEventManagementSystem.
+
+    Every change is appended to a journal segment as a compact binary record
+    (opcode, length-prefixed fields, CRC-32). Writers share fsyncs through
+    group commit: the first writer to need a sync writes and fsyncs everything
+    queued so far, and writers that queued while it waited find their records
+    already durable. Writes inside a ``batch()`` block wait for one sync when
+    the block ends.
+
+    A background thread compacts the journal every ``snapshot_interval``
+    seconds once it has grown by ``snapshot_bytes``: it seals the current
+    segment, folds the sealed segments into the previous snapshot and
+    replaces the snapshot file, without holding up writers. A failed
+    compaction is logged and kept in ``last_snapshot_error``, and the thread
+    goes on compacting. Start-up loads the snapshot and replays only the
+    segments written after it.
+
+    Each compaction also writes the folded state as a columnar snapshot,
+    returned by ``columnar_snapshot()``. It is mapped rather than replayed,
+    so read-only consumers such as reports or another process can aggregate
+    over it as soon as the storage is opened. It only changes at compaction,
+    so it lags behind the live system, and ``load`` still rebuilds every
+    object from the binary snapshot and journal.
+
+    Example:
+        storage = JournalStorage("campus-data")
+        system = CampusEventManagementSystem(storage=storage)
+        print(storage.recovery.seconds)
+    """
+
+    persistent = True
+
+    def __init__(
+        self,
+        directory: str,
+        snapshot_interval: Optional[float] = 60.0,
+        snapshot_bytes: int = 16 * 1024 * 1024,
+    ):
+        """
+        Open or create a journal directory and start a new segment.
+
+        Args:
+            directory (str): Directory holding the snapshot and journal segments
+            snapshot_interval (Optional[float]): Seconds between compaction
+                checks, or None to compact only when ``snapshot()`` is called
+            snapshot_bytes (int): Journal growth that makes a check compact
+        """
+        self.directory = directory
+        self.snapshot_bytes = snapshot_bytes
+        self.recovery: Optional[RecoveryReport] = None
+        self.last_snapshot_error: Optional[BaseException] = None
+        os.makedirs(directory, exist_ok=True)
+
+        # Lock order: sync, then buffer
+        self._sync_lock = threading.Lock()
+        self._buffer_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._columnar_lock = threading.Lock()
+        self._columnar: Optional[ColumnarSnapshot] = None
+        self._columnar_identity: Optional[Tuple[int, int]] = None
+        self._buffer = bytearray()
+        self._appended = 0
+        self._durable = 0
+        self._snapshotted = 0
+        self._batch_depth = threading.local()
+
+        segments = self._segments()
+        self._segment = max(segments[-1] + 1 if segments else 0, self._snapshot_start())
+        self._file = self._open_segment(self._segment)
+
+        self._stopped = threading.Event()
+        self._snapshotter: Optional[threading.Thread] = None
+        if snapshot_interval is not None:
+            self._snapshotter = threading.Thread(
+                target=self._snapshot_loop,
+                args=(snapshot_interval,),
+                name="journal-snapshotter",
+                daemon=True,
+            )
+            self._snapshotter.start()
+
+    def load(self) -> StoredState:
+        started = time.perf_counter()
+        state = _State()
+        start, snapshot_records = self._read_snapshot(state)
+        journal_records = journal_bytes = 0
+        for segment in self._segments():
+            if start <= segment < self._segment:
+                data = self._read(self._segment_path(segment))
+                journal_bytes += len(data)
+                for code, values in _decode(data, len(_JOURNAL_MAGIC)):
+                    state.apply(code, values)
+                    journal_records += 1
+        stored = state.stored_state()
+        self.recovery = RecoveryReport(
+            seconds=time.perf_counter() - started,
+            snapshot_records=snapshot_records,
+            journal_records=journal_records,
+            journal_bytes=journal_bytes,
+        )
+        return stored
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        depth = getattr(self._batch_depth, "value", 0)
+        self._batch_depth.value = depth + 1
+        try:
+            yield
+        finally:
+            self._batch_depth.value = depth
+            if depth == 0:
+                self._sync(self._appended)
+
+    def save_students(self, students: Iterable[Student]) -> None:
+        self._write(
+            _encode(_SAVE_STUDENT, student.student_id, student.name)
+            for student in students
+        )
+
+    def add_events(self, events: Iterable[Event]) -> None:
+        self._write(
+            _encode(
+                _ADD_EVENT,
+                event.event_id,
+                event.title,
+                event.club,
+                event.date,
+                event.start_time,
+                event.end_time,
+                event.venue,
+                event.max_seats,
+                event.is_valid,
+            )
+            for event in events
+        )
+
+    def update_events(self, events: Iterable[Event]) -> None:
+        self._write(
+            _encode(
+                _UPDATE_EVENT,
+                event.event_id,
+                event.date,
+                event.start_time,
+                event.end_time,
+                event.is_valid,
+            )
+            for event in events
+        )
+
+    def delete_event(self, event_id: str) -> None:
+        self._write([_encode(_DELETE_EVENT, event_id)])
+
+    def add_registrations(self, registrations: Iterable[Registration]) -> None:
+        self._write_registrations(_ADD_REGISTRATION, registrations)
+
+    def update_registrations(self, registrations: Iterable[Registration]) -> None:
+        self._write_registrations(_UPDATE_REGISTRATION, registrations)
+
+    def _write_registrations(
+        self, code: int, registrations: Iterable[Registration]
+    ) -> None:
+        self._write(
+            _encode(
+                code,
+                registration.event.event_id,
+                registration.student.student_id,
+                _REGISTRATION_STATUS_CODES[registration.status],
+                "\n".join(registration.warnings),
+            )
+            for registration in registrations
+        )
+
+    def delete_registration(self, event_id: str, student_id: str) -> None:
+        self._write([_encode(_DELETE_REGISTRATION, event_id, student_id)])
+
+    def add_service_request(self, request: ServiceRequest) -> None:
+        self._write(
+            [
+                _encode(
+                    _ADD_REQUEST,
+                    request.request_id,
+                    request.student.student_id,
+                    request.category,
+                    _REQUEST_STATUS_CODES[request.status],
+                    (request.created_at - _EPOCH) // _MICROSECOND,
+                )
+            ]
+        )
+
+    def update_service_requests(self, requests: Iterable[ServiceRequest]) -> None:
+        self._write(
+            _encode(
+                _UPDATE_REQUEST,
+                request.request_id,
+                _REQUEST_STATUS_CODES[request.status],
+            )
+            for request in requests
+        )
+
+    def snapshot(self) -> None:
+        """
+        Compact the journal now.
+
+        Seals the current segment, so the snapshot covers every change made
+        before the call, then folds the sealed segments into a new snapshot,
+        and a new columnar snapshot, and deletes them.
+        """
+        with self._snapshot_lock:
+            with self._sync_lock:
+                with self._buffer_lock:
+                    data, self._buffer = self._buffer, bytearray()
+                    appended = self._appended
+                self._write_durably(data)
+                self._durable = appended
+                self._file.close()
+                self._segment += 1
+                self._file = self._open_segment(self._segment)
+                sealed = self._segment
+            self._snapshotted = appended
+
+            state = _State()
+            start, _ = self._read_snapshot(state)
+            folded = [segment for segment in self._segments() if segment < sealed]
+            for segment in folded:
+                if segment >= start:
+                    data = self._read(self._segment_path(segment))
+                    for code, values in _decode(data, len(_JOURNAL_MAGIC)):
+                        state.apply(code, values)
+
+            path = os.path.join(self.directory, _SNAPSHOT_NAME)
+            with open(path + ".tmp", "wb") as file:
+                file.write(_SNAPSHOT_MAGIC + _SNAPSHOT_HEADER.pack(sealed))
+                for record in state.records():
+                    file.write(record)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(path + ".tmp", path)
+            self._sync_directory()
+            for segment in folded:
+                os.remove(self._segment_path(segment))
+            state.write_columns(os.path.join(self.directory, _COLUMNAR_NAME))
+
+    def columnar_snapshot(self) -> Optional[ColumnarSnapshot]:
+        """
+        The columnar snapshot of the last compaction, even one made before
+        this storage was opened. A newer file is mapped when it replaces the
+        old one; snapshots returned earlier stay usable until they are dropped.
+        """
+        path = os.path.join(self.directory, _COLUMNAR_NAME)
+        with self._columnar_lock:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                return None
+            identity = (stat.st_ino, stat.st_mtime_ns)
+            if identity != self._columnar_identity:
+                self._columnar = ColumnarSnapshot(path)
+                self._columnar_identity = identity
+            return self._columnar
+
+    def close(self) -> None:
+        self._stopped.set()
+        if self._snapshotter is not None:
+            self._snapshotter.join()
+        self._sync(self._appended)
+        with self._sync_lock:
+            self._file.close()
+        with self._columnar_lock:
+            if self._columnar is not None:
+                self._columnar.close()
+                self._columnar = None
+
+    def _write(self, records: Iterable[bytes]) -> None:
+        """Queue records, waiting for them to be durable unless in a batch."""
+        with self._buffer_lock:
+            for record in records:
+                self._buffer += record
+                self._appended += len(record)
+            appended = self._appended
+        if not getattr(self._batch_depth, "value", 0):
+            self._sync(appended)
+
+    def _sync(self, upto: int) -> None:
+        """Make the first ``upto`` queued bytes durable, sharing the fsync."""
+        if self._durable >= upto:
+            return
+        with self._sync_lock:
+            # A writer that synced while this one waited may have covered it
+            if self._durable >= upto:
+                return
+            with self._buffer_lock:
+                data, self._buffer = self._buffer, bytearray()
+                appended = self._appended
+            self._write_durably(data)
+            self._durable = appended
+
+    def _write_durably(self, data: bytes) -> None:
+        """Append to the current segment and fsync it. Needs ``_sync_lock``."""
+        if data:
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _snapshot_loop(self, interval: float) -> None:
+        while not self._stopped.wait(interval):
+            if self._appended - self._snapshotted >= self.snapshot_bytes:
+                try:
+                    self.snapshot()
+                    self.last_snapshot_error = None
+                except Exception as e:
+                    # Keep compacting; sealed segments are folded by the next one
+                    self.last_snapshot_error = e
+                    _logger.exception("Compacting %s failed", self.directory)
+
+    def _segments(self) -> List[int]:
+        return sorted(
+            int(match.group(1))
+            for match in map(_SEGMENT_NAME.match, os.listdir(self.directory))
+            if match
+        )
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"journal-{segment:08d}.log")
+
+    def _open_segment(self, segment: int) -> BinaryIO:
+        file = open(self._segment_path(segment), "ab")
+        file.write(_JOURNAL_MAGIC)
+        file.flush()
+        os.fsync(file.fileno())
+        self._sync_directory()
+        return file
+
+    def _snapshot_start(self) -> int:
+        """First segment not folded into the snapshot."""
+        path = os.path.join(self.directory, _SNAPSHOT_NAME)
+        if not os.path.exists(path):
+            return 0
+        with open(path, "rb") as file:
+            header = file.read(len(_SNAPSHOT_MAGIC) + _SNAPSHOT_HEADER.size)
+        return _SNAPSHOT_HEADER.unpack_from(header, len(_SNAPSHOT_MAGIC))[0]
+
+    def _read_snapshot(self, state: _State) -> Tuple[int, int]:
+        """Apply the snapshot to ``state``; return its start segment and size."""
+        path = os.path.join(self.directory, _SNAPSHOT_NAME)
+        if not os.path.exists(path):
+            return 0, 0
+        data = self._read(path)
+        if data[: len(_SNAPSHOT_MAGIC)] != _SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a snapshot file")
+        (start,) = _SNAPSHOT_HEADER.unpack_from(data, len(_SNAPSHOT_MAGIC))
+        records = 0
+        offset = len(_SNAPSHOT_MAGIC) + _SNAPSHOT_HEADER.size
+        for code, values in _decode(data, offset):
+            state.apply(code, values)
+            records += 1
+        return start, records
+
+    @staticmethod
+    def _read(path: str) -> bytes:
+        with open(path, "rb") as file:
+            return file.read()
+
+    def _sync_directory(self) -> None:
+        """Make file creations and renames in the directory durable."""
+        if hasattr(os, "O_DIRECTORY"):
+            descriptor = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
@@ -1,13 +1,33 @@
-from typing import Dict, Optional
+import heapq
+import math
+import random
+import threading
+import time
+from datetime import timedelta
+from itertools import count
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 
+from history import TransitionLog
 from models import (
+    ACTIVE_REQUEST_STATUSES,
+    ClashPolicy,
     Event,
     Registration,
     RegistrationStatus,
     RequestStatus,
     ServiceRequest,
+    ServiceRequestIndex,
+    ServiceRequestPage,
     Student,
 )
+from scheduling import (
+    ConflictGraph,
+    ConflictReport,
+    EventIndex,
+    build_conflict_report,
+)
+from storage import StorageBackend, StoredState
+from triage import TriageQueue
 
 
 class CampusEventManagementSystem:
@@ -21,15 +41,115 @@ class CampusEventManagementSystem:
         events (Dict[str, Event]): Dictionary storing all events, keyed by event_id
         students (Dict[str, Student]): Dictionary storing all students, keyed by student_id
         service_requests (Dict[str, ServiceRequest]): Dictionary storing all service requests, keyed by request_id
+        clash_policy (ClashPolicy): How registrations that overlap a student's confirmed events are handled
+        triage (TriageQueue): Active service requests ordered by SLA deadline
+        history (TransitionLog): Every service request status transition since
+            the system was created, with time-to-resolve aggregates per
+            category. It is not stored, so it starts empty after a restart.
+        storage (StorageBackend): Where changes are written through to; the base
+            backend keeps nothing, so the system is in-memory only by default
+        recovery_seconds (Optional[float]): Time taken to load and rebuild the
+            stored state at start-up, None without a backend
+
+    Note:
+        One instance can be shared by many threads, for example every browser
+        session of a Streamlit server. Catalog changes (adding, removing and
+        rescheduling events) are serialised by one lock, registrations by a lock
+        on each event plus the student's timetable lock, and service requests by
+        a lock of their own. Summaries read counters without taking any lock.
+        Changes are written to storage while those locks are held, so they are
+        stored in the order they were made, but inside a ``storage.batch()``
+        entered before the locks: a durable backend waits for its sync only
+        once the locks are released.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        clash_policy: ClashPolicy = ClashPolicy.ALLOW,
+        request_slas: Optional[Mapping[str, timedelta]] = None,
+        storage: Optional[StorageBackend] = None,
+    ):
         """
         Initialize the CampusEventManagementSystem with empty storage for events, students, and service requests.
+
+        Args:
+            clash_policy (ClashPolicy, optional): How to handle a registration that
+                overlaps an event the student is already confirmed for. Defaults to
+                ALLOW, which confirms the seat and records a warning.
+            request_slas (Optional[Mapping[str, timedelta]], optional): Time allowed
+                to resolve a service request, per category. Categories without an
+                entry use ``triage.DEFAULT_SLA``.
+            storage (Optional[StorageBackend], optional): Backend to persist
+                changes to, e.g. ``storage.SQLiteStorage``. The system starts
+                from the state the backend holds; the in-memory objects act as
+                a write-through cache, so reads never touch the backend.
         """
+        self.clash_policy = clash_policy
         self.events: Dict[str, Event] = {}
         self.students: Dict[str, Student] = {}
         self.service_requests: Dict[str, ServiceRequest] = {}
+        self._event_index = EventIndex()
+        self._valid_event_index = EventIndex()
+        self._conflict_graph = ConflictGraph()
+        self._event_sequence = count()
+        # Lock order: catalog, then event, then student timetable
+        self._catalog_lock = threading.RLock()
+        self._service_lock = threading.Lock()
+        self.triage = TriageQueue(request_slas)
+        self.history = TransitionLog()
+        self._request_index = ServiceRequestIndex(self._on_request_status_change)
+        self.storage = StorageBackend()
+        self.recovery_seconds: Optional[float] = None
+        if storage is not None:
+            started = time.perf_counter()
+            self._restore(storage.load())
+            self.recovery_seconds = time.perf_counter() - started
+            self.storage = storage
+
+    def _restore(self, state: StoredState) -> None:
+        """
+        Rebuild the in-memory state from a backend's stored state.
+
+        Runs before the backend is attached, so nothing is written back. Event
+        validity is recomputed by replaying the events in arrival order, and
+        registrations are attached in the order they were made so waitlists
+        keep their FIFO order. Status transitions are not stored, so restored
+        requests are not logged in ``history``: its transitions and resolution
+        times cover only what happens after start-up.
+        """
+        for student_id, name in state.students:
+            self.students[student_id] = Student(student_id, name)
+        self.add_events(state.events)
+
+        by_event: Dict[Event, List[Registration]] = {}
+        for event_id, student_id, status, warnings in state.registrations:
+            event = self.events.get(event_id)
+            student = self.students.get(student_id)
+            if event is None or student is None:
+                continue
+            registration = Registration(student, event)
+            registration.status = RegistrationStatus(status)
+            registration.warnings = warnings
+            by_event.setdefault(event, []).append(registration)
+        for event, registrations in by_event.items():
+            event.add_registrations(registrations)
+            for registration in registrations:
+                registration.student.add_registration(registration)
+
+        for (
+            request_id,
+            student_id,
+            category,
+            status,
+            created_at,
+        ) in state.service_requests:
+            student = self.students.get(student_id)
+            if student is None:
+                continue
+            request = ServiceRequest(request_id, student, category)
+            request.created_at = created_at
+            request.status = RequestStatus(status)
+            self._add_service_request(request)
 
     def add_event(
         self,
@@ -65,40 +185,373 @@ class CampusEventManagementSystem:
             - If the new event conflicts with an existing valid event, it will be marked as invalid
             - Conflicts can be either time-based, venue-based, or both
             - The first registered event in a conflict always remains valid
+            - Only events overlapping the new schedule are compared, using the
+              date-partitioned interval index
         """
         new_event = Event(
             event_id, title, club, date, start_time, end_time, venue, max_seats
         )
 
-        ordered_events = sorted(self.events.values(), key=lambda x: x.created_at)
-
-        for existing_event in ordered_events:
-            conflict_details = existing_event.get_conflict_details(new_event)
-            if conflict_details["has_conflict"]:
-                if existing_event.is_valid:
-                    new_event.is_valid = False
-                    conflict_desc = []
-                    if conflict_details["time_conflict"]:
-                        period = conflict_details["conflict_period"]
-                        if conflict_details["venue_conflict"]:
-                            conflict_desc.append(
-                                f"Time and venue conflict: Event at same venue ({new_event.venue}) "
-                                f"on {period['date']} between {period['start']} and {period['end']}"
-                            )
-                        else:
-                            conflict_desc.append(
-                                f"Time conflict: Student cannot attend multiple events "
-                                f"on {period['date']} between {period['start']} and {period['end']}"
-                            )
-                    new_event.violations.append(
-                        f"Conflicts with {existing_event.title} ({existing_event.event_id}) which was registered first: "
-                        + " - ".join(conflict_desc)
-                    )
-                    break
-
-        self.events[event_id] = new_event
+        with self.storage.batch(), self._catalog_lock:
+            seq = self._admit_event(new_event)
+            self._event_index.insert(new_event, seq)
+            self._link_conflicts(new_event)
+            self.storage.add_events([new_event])
         return new_event
 
+    def add_events(self, events: Iterable[Mapping[str, Any]]) -> List[Event]:
+        """
+        Add a batch of events with a single validation pass.
+
+        Each item holds the keyword arguments of ``add_event``. Validity and
+        violations are exactly those that calling ``add_event`` for every item,
+        in the same order, would produce.
+
+        Args:
+            events (Iterable[Mapping[str, Any]]): Event definitions to add
+
+        Returns:
+            List[Event]: The created events, in input order
+
+        Raises:
+            ValueError: If any event has a malformed schedule. Nothing is added
+                in that case.
+
+        Note:
+            - Schedules are checked against the timeline of valid events only,
+              which never overlap each other, so each check is a binary search
+            - The full conflict index is updated once for the whole batch, and
+              the conflict graph with one sweep per affected day that only
+              visits overlaps involving the batch. An event replacing an existing
+              ID splits the batch there, so the events before it are indexed
+              and revalidated if the replaced event was blocking them
+        """
+        new_events = [Event(**data) for data in events]
+        pending: Dict[str, Event] = {}
+        sequence: Dict[Event, int] = {}
+        with self.storage.batch(), self._catalog_lock:
+            for new_event in new_events:
+                if pending and new_event.event_id in self.events:
+                    # Index the events so far, so the replaced event's
+                    # conflicts among them are revalidated like outside a batch
+                    self._index_batch(pending, sequence)
+                    pending.clear()
+                sequence[new_event] = self._admit_event(new_event)
+                pending[new_event.event_id] = new_event
+            self._index_batch(pending, sequence)
+        return new_events
+
+    def _index_batch(
+        self, pending: Dict[str, Event], sequence: Dict[Event, int]
+    ) -> None:
+        """Add admitted events to the conflict index and graph, and store them."""
+        self._event_index.insert_many(
+            (new_event, sequence[new_event]) for new_event in pending.values()
+        )
+        for new_event in pending.values():
+            self._conflict_graph.add(new_event, ())
+        batch = set(pending.values())
+        for day in {new_event.day for new_event in batch}:
+            self._conflict_graph.link(self._event_index.overlapping_pairs(day, batch))
+        self.storage.add_events(pending.values())
+
+    def _admit_event(self, new_event: Event) -> int:
+        """
+        Validate a new event and store it, replacing any event with the same ID.
+
+        A replaced event is removed first and the later events it was blocking
+        are revalidated, as ``remove_event`` does. The new event is then
+        invalid if it conflicts with an earlier valid event. The caller is
+        responsible for adding it to the full conflict index.
+
+        Returns:
+            int: Arrival sequence number assigned to the event
+        """
+        previous_event = self.events.get(new_event.event_id)
+        if previous_event is not None:
+            previous_seq = self._event_index.sequence_of(previous_event)
+            self._event_index.remove(previous_event)
+            self._valid_event_index.remove(previous_event)
+            neighbours = self._conflict_graph.remove(previous_event)
+            if previous_event.is_valid:
+                self._revalidate(
+                    neighbour
+                    for neighbour in neighbours
+                    if self._event_index.sequence_of(neighbour) > previous_seq
+                )
+
+        blocking_event = self._first_valid_conflict(new_event)
+        if blocking_event is not None:
+            new_event.is_valid = False
+            new_event.violations.append(
+                self._describe_conflict(blocking_event, new_event)
+            )
+
+        seq = next(self._event_sequence)
+        self.events[new_event.event_id] = new_event
+        if new_event.is_valid:
+            self._valid_event_index.insert(new_event, seq)
+        return seq
+
+    def remove_event(self, event_id: str) -> Optional[Event]:
+        """
+        Remove an event and revalidate the events it was blocking.
+
+        Args:
+            event_id (str): ID of the event to remove
+
+        Returns:
+            Optional[Event]: The removed event, None if not found
+
+        Note:
+            - Later events that conflicted only with the removed event become valid,
+              and the change cascades through chains of conflicts
+            - Only the conflict neighbourhood of the event is re-evaluated
+            - The registrations stay on the returned event but are dropped from
+              the students' registration lists
+        """
+        with self.storage.batch(), self._catalog_lock:
+            event = self.events.get(event_id)
+            if event is None:
+                return None
+
+            # Under the event lock, so a registration either lands before the
+            # removal and is detached here, or sees the event gone
+            with event.lock:
+                del self.events[event_id]
+                self.storage.delete_event(event_id)
+                for registration in event.registrations:
+                    with registration.student.timetable.lock:
+                        registration.student.remove_registration(registration)
+
+            seq = self._event_index.sequence_of(event)
+            self._event_index.remove(event)
+            self._valid_event_index.remove(event)
+            neighbours = self._conflict_graph.remove(event)
+            if event.is_valid:
+                self._revalidate(
+                    neighbour
+                    for neighbour in neighbours
+                    if self._event_index.sequence_of(neighbour) > seq
+                )
+        return event
+
+    def reschedule_event(
+        self, event_id: str, date: str, start_time: str, end_time: str
+    ) -> Optional[Event]:
+        """
+        Move an event to a new date and time and revalidate affected events.
+
+        Args:
+            event_id (str): ID of the event to move
+            date (str): New date in YYYY-MM-DD format
+            start_time (str): New start time in HH:MM AM/PM format
+            end_time (str): New end time in HH:MM AM/PM format
+
+        Returns:
+            Optional[Event]: The rescheduled event, None if not found
+
+        Raises:
+            ValueError: If the new schedule is malformed; nothing is changed
+
+        Note:
+            - The event keeps its place in the first-come-first-valid order and
+              all of its registrations
+            - Events around the old and the new slot are re-evaluated, cascading
+              through chains of conflicts
+        """
+        with self.storage.batch(), self._catalog_lock:
+            event = self.events.get(event_id)
+            if event is None:
+                return None
+
+            with event.lock:
+                event.reschedule(date, start_time, end_time)
+            seq = self._event_index.sequence_of(event)
+            self._event_index.remove(event)
+            self._valid_event_index.remove(event)
+            old_neighbours = self._conflict_graph.remove(event)
+
+            self._event_index.insert(event, seq)
+            self._link_conflicts(event)
+            affected = old_neighbours | self._conflict_graph.neighbours(event)
+            self.storage.update_events([event])
+            self._revalidate(
+                [event]
+                + [
+                    neighbour
+                    for neighbour in affected
+                    if self._event_index.sequence_of(neighbour) > seq
+                ]
+            )
+        return event
+
+    def _revalidate(self, events: Iterable[Event]) -> None:
+        """
+        Re-apply first-come-first-valid to events whose neighbourhood changed.
+
+        Events are processed in arrival order. An event's validity only depends
+        on earlier events, so whenever it flips, its later neighbours are queued
+        too; everything outside that cascade is left untouched.
+
+        Args:
+            events (Iterable[Event]): Indexed events to re-evaluate
+        """
+        sequence_of = self._event_index.sequence_of
+        queue = [(sequence_of(event), event) for event in set(events)]
+        queued = {event for _, event in queue}
+        heapq.heapify(queue)
+        flipped: List[Event] = []
+
+        while queue:
+            seq, event = heapq.heappop(queue)
+            was_valid = event.is_valid
+            blocking_event = self._first_valid_conflict(event, before=seq)
+            event.is_valid = blocking_event is None
+            event.violations[:] = (
+                []
+                if blocking_event is None
+                else [self._describe_conflict(blocking_event, event)]
+            )
+
+            if event.is_valid and event not in self._valid_event_index:
+                self._valid_event_index.insert(event, seq)
+            elif not event.is_valid:
+                self._valid_event_index.remove(event)
+
+            if event.is_valid != was_valid:
+                flipped.append(event)
+                for neighbour in self._conflict_graph.neighbours(event):
+                    neighbour_seq = sequence_of(neighbour)
+                    if neighbour_seq > seq and neighbour not in queued:
+                        queued.add(neighbour)
+                        heapq.heappush(queue, (neighbour_seq, neighbour))
+        self.storage.update_events(flipped)
+
+    def _link_conflicts(self, event: Event) -> None:
+        """Record the overlaps of an indexed event in the conflict graph."""
+        self._conflict_graph.add(
+            event,
+            (other for _, other in self._event_index.overlapping_event(event)),
+        )
+
+    def get_event_conflicts(self, event_id: str) -> List[Event]:
+        """
+        Get the events whose schedule overlaps an event.
+
+        Args:
+            event_id (str): ID of the event to look up
+
+        Returns:
+            List[Event]: Overlapping events in the order they were added, empty if
+                the event is not found
+
+        Note:
+            Conflicts are kept in an adjacency map updated as events change, so
+            the lookup costs O(degree) instead of a scan of all events
+        """
+        with self._catalog_lock:
+            event = self.events.get(event_id)
+            if event is None:
+                return []
+            return sorted(
+                self._conflict_graph.neighbours(event),
+                key=self._event_index.sequence_of,
+            )
+
+    def check_conflicts(self, candidate: Event) -> Dict[str, Any]:
+        """
+        Check a prospective event against the schedule without adding it.
+
+        This is a dry run of ``add_event``: it uses the same interval indexes and
+        the same first-come-first-valid rule, so it is cheap enough to call on
+        every form rerun.
+
+        Args:
+            candidate (Event): Event to check; it is not added to the system
+
+        Returns:
+            Dict[str, Any]: Dictionary containing:
+                - is_valid: Whether ``add_event`` would accept the schedule as valid
+                - blocking_event: The event that would make it invalid, or None
+                - violations: Violation messages ``add_event`` would record
+                - conflicts: One entry per overlapping event, in the order the
+                  events were added, holding the ``Event.get_conflict_details``
+                  fields plus the conflicting ``event``
+        """
+        with self._catalog_lock:
+            blocking_event = self._first_valid_conflict(candidate)
+            overlapping = sorted(
+                (
+                    (seq, other)
+                    for seq, other in self._event_index.overlapping_event(candidate)
+                    if other is not candidate
+                ),
+                key=lambda item: item[0],
+            )
+        return {
+            "is_valid": blocking_event is None,
+            "blocking_event": blocking_event,
+            "violations": (
+                []
+                if blocking_event is None
+                else [self._describe_conflict(blocking_event, candidate)]
+            ),
+            "conflicts": [
+                dict(candidate.get_conflict_details(other), event=other)
+                for _, other in overlapping
+            ],
+        }
+
+    def _first_valid_conflict(
+        self, event: Event, before: Optional[int] = None
+    ) -> Optional[Event]:
+        """
+        Find the earliest registered valid event that conflicts with ``event``.
+
+        Valid events never overlap each other, so the lookup only visits the
+        handful of valid events around the new schedule.
+
+        Args:
+            event (Event): Event whose schedule is checked against the index
+            before (Optional[int]): Only consider events added before this
+                sequence number
+
+        Returns:
+            Optional[Event]: The valid conflicting event that was added first,
+                None if the schedule is free
+        """
+        first_seq = None
+        first_event = None
+        for seq, existing_event in self._valid_event_index.overlapping_event(event):
+            if existing_event is event or (before is not None and seq >= before):
+                continue
+            if first_seq is None or seq < first_seq:
+                first_seq, first_event = seq, existing_event
+        return first_event
+
+    @staticmethod
+    def _describe_conflict(existing_event: Event, new_event: Event) -> str:
+        """Build the violation message recorded on an event that lost a conflict."""
+        conflict_details = existing_event.get_conflict_details(new_event)
+        conflict_desc = []
+        if conflict_details["time_conflict"]:
+            period = conflict_details["conflict_period"]
+            if conflict_details["venue_conflict"]:
+                conflict_desc.append(
+                    f"Time and venue conflict: Event at same venue ({new_event.venue}) "
+                    f"on {period['date']} between {period['start']} and {period['end']}"
+                )
+            else:
+                conflict_desc.append(
+                    f"Time conflict: Student cannot attend multiple events "
+                    f"on {period['date']} between {period['start']} and {period['end']}"
+                )
+        return (
+            f"Conflicts with {existing_event.title} ({existing_event.event_id}) which was registered first: "
+            + " - ".join(conflict_desc)
+        )
+
     def add_student(self, student_id: str, student_name: str = "") -> Student:
         """
         Add a new student to the system or retrieve existing student.
@@ -114,9 +567,14 @@ class CampusEventManagementSystem:
             If a student with the given ID already exists, returns the existing student object
             instead of creating a new one.
         """
-        if student_id not in self.students:
-            self.students[student_id] = Student(student_id, student_name)
-        return self.students[student_id]
+        student = self.students.get(student_id)
+        if student is None:
+            # setdefault is atomic, so concurrent callers share one Student
+            created = Student(student_id, student_name)
+            student = self.students.setdefault(student_id, created)
+            if student is created:
+                self.storage.save_students([student])
+        return student
 
     def register_for_event(
         self, student_id: str, event_id: str
@@ -133,39 +591,370 @@ class CampusEventManagementSystem:
             event_id (str): ID of the event to register for
 
         Returns:
-            Optional[Registration]: Registration object if successful, None if student or event not found
+            Optional[Registration]: Registration object if successful, None if student or
+                event not found (or the event was removed meanwhile), or if the
+                clash policy rejected the registration
 
         Note:
             - Returns existing registration if student is already registered
             - Automatically assigns CONFIRMED or WAITLISTED status based on event capacity
             - Updates both event and student registration lists
+            - Duplicate detection and seat counting are O(1) lookups on the event
+            - Overlaps with the student's confirmed events are found in their
+              timetable in O(log k) and handled according to ``clash_policy``:
+              REJECT returns None, WAITLIST keeps the student on the waitlist and
+              ALLOW confirms the seat with a warning on the registration
         """
         if event_id not in self.events or student_id not in self.students:
             return None
+        return self._register(self.students[student_id], self.events[event_id])
+
+    def _register(self, student: Student, event: Event) -> Optional[Registration]:
+        # The seat check and the clash check must each see the latest state
+        with self.storage.batch(), event.lock, student.timetable.lock:
+            if self.events.get(event.event_id) is not event:
+                # Removed or replaced since it was looked up
+                return None
+            existing_registration = event.get_registration(student.student_id)
+            if existing_registration is not None:
+                return existing_registration
+
+            clashes = student.timetable.clashes(event)
+            if clashes and self.clash_policy == ClashPolicy.REJECT:
+                return None
+
+            registration = Registration(student, event)
 
-        event = self.events[event_id]
-        student = self.students[student_id]
+            # Check if seats are available
+            if event.confirmed_count < event.max_seats:
+                self._confirm(registration, clashes)
 
-        for reg in event.registrations:
-            if reg.student.student_id == student_id:
-                return reg
+            event.add_registration(registration)
+            student.add_registration(registration)
+            # Written under the event lock so stored order matches the waitlist
+            self.storage.add_registrations([registration])
+            return registration
+
+    def _confirm(self, registration: Registration, clashes: List[Event]) -> bool:
+        """
+        Confirm a registration unless the clash policy holds it on the waitlist.
+
+        Returns:
+            bool: True if the registration was confirmed
+        """
+        if clashes and self.clash_policy != ClashPolicy.ALLOW:
+            return False
+        if clashes:
+            registration.warnings = tuple(
+                f"Overlaps '{other.title}' ({other.event_id}) on {other.date}, "
+                f"{other.start_time} - {other.end_time}"
+                for other in clashes
+            )
+        registration.status = RegistrationStatus.CONFIRMED
+        return True
+
+    def register_many(
+        self, pairs: Iterable[Tuple[str, str]]
+    ) -> List[Optional[Registration]]:
+        """
+        Register a batch of (student_id, event_id) pairs in arrival order.
+
+        Each distinct student and event is looked up once and the pairs are then
+        applied in a single pass, giving the same outcome as calling
+        ``register_for_event`` for every pair in order. The pass stays in arrival
+        order because a seat confirmed for one event can clash with a later
+        request for another.
+
+        Args:
+            pairs (Iterable[Tuple[str, str]]): (student_id, event_id) requests
+
+        Returns:
+            List[Optional[Registration]]: One outcome per pair, in input order:
+                the registration (new or existing), or None if the student or
+                event was not found or the clash policy rejected it
+        """
+        events = self.events
+        students = self.students
+        resolved_events: Dict[str, Optional[Event]] = {}
+        resolved_students: Dict[str, Optional[Student]] = {}
+        outcomes: List[Optional[Registration]] = []
+        with self.storage.batch():
+            for student_id, event_id in pairs:
+                if event_id not in resolved_events:
+                    resolved_events[event_id] = events.get(event_id)
+                if student_id not in resolved_students:
+                    resolved_students[student_id] = students.get(student_id)
+                event = resolved_events[event_id]
+                student = resolved_students[student_id]
+                if event is None or student is None:
+                    outcomes.append(None)
+                else:
+                    outcomes.append(self._register(student, event))
+        return outcomes
+
+    def allocate_seats(
+        self,
+        intents: Iterable[Tuple[str, str]],
+        seed: Optional[int] = None,
+        weights: Optional[Mapping[str, float]] = None,
+        per_student_cap: Optional[int] = None,
+    ) -> List[Optional[Registration]]:
+        """
+        Allocate seats for a window of registration intents by lottery.
+
+        Instead of first-come-first-served, every intent draws a random key and
+        seats are handed out in key order: an intent is confirmed if its event
+        still has a seat and the student is under ``per_student_cap``, otherwise
+        it is waitlisted. Each event's waitlist is therefore in draw order too.
+
+        Args:
+            intents (Iterable[Tuple[str, str]]): (student_id, event_id) intents
+                collected during the window; their order does not matter
+            seed (Optional[int]): Seed of the lottery, for a reproducible draw
+            weights (Optional[Mapping[str, float]]): Priority weight per student
+                ID, default 1. A student with weight 2 is twice as likely as one
+                with weight 1 to draw ahead of them
+            per_student_cap (Optional[int]): Most confirmed seats a student can
+                hold once the window is allocated, counting seats they already
+                hold; unlimited if None
+
+        Returns:
+            List[Optional[Registration]]: One outcome per intent, in input order:
+                the registration (new or existing), or None if the student or
+                event was not found or the clash policy rejected it
+
+        Raises:
+            ValueError: If a weight is not positive
+
+        Note:
+            - Keys are exponential draws scaled by the weight (``-ln(u) / w``),
+              so one sort yields a weighted random order without replacement
+            - Outcomes are decided first and then written per event in bulk.
+              Each event's seats are re-checked under its lock when they are
+              written: registrations made directly in the meantime are kept,
+              and drawn seats no longer free are waitlisted in draw order
+            - Existing registrations are kept and confirmed seats count towards
+              the cap
+            - The clash policy applies as in ``register_for_event``, including
+              clashes between seats confirmed in the same window
+        """
+        intents = list(intents)
+        rng = random.Random(seed)
+        if weights:
+            draw_keys = []
+            for student_id, _ in intents:
+                weight = weights.get(student_id, 1.0)
+                if weight <= 0:
+                    raise ValueError(f"Weight of student {student_id} must be positive")
+                draw_keys.append(-math.log(1.0 - rng.random()) / weight)
+        else:
+            # Equal weights: any uniform draw gives the same order distribution
+            draw_keys = [rng.random() for _ in intents]
+        draw_order = sorted(range(len(intents)), key=draw_keys.__getitem__)
+        cap = math.inf if per_student_cap is None else per_student_cap
+        return self._apply_draw(intents, draw_order, cap)
+
+    def _apply_draw(
+        self, intents: List[Tuple[str, str]], draw_order: List[int], cap: float
+    ) -> List[Optional[Registration]]:
+        """Decide every intent in draw order, then attach the new registrations."""
+        events = self.events
+        students = self.students
+        seats_left: Dict[Event, int] = {}
+        confirmed_seats: Dict[str, int] = {}
+        for student_id in {student_id for student_id, _ in intents}:
+            student = students.get(student_id)
+            if student is not None:
+                confirmed_seats[student_id] = len(student.timetable)
+        window_timetables: Dict[Student, List[Event]] = {}
+        decided: Dict[Tuple[str, str], Optional[Registration]] = {}
+        new_registrations: Dict[Event, List[Registration]] = {}
+        outcomes: List[Optional[Registration]] = [None] * len(intents)
+        for position in draw_order:
+            student_id, event_id = key = intents[position]
+            if key in decided:
+                outcomes[position] = decided[key]
+                continue
+            event = events.get(event_id)
+            student = students.get(student_id)
+            registration = None
+            if event is not None and student is not None:
+                registration = event.get_registration(student_id)
+                if registration is None:
+                    registration = self._draw_seat(
+                        student,
+                        event,
+                        seats_left,
+                        confirmed_seats,
+                        cap,
+                        window_timetables,
+                    )
+                    if registration is not None:
+                        new_registrations.setdefault(event, []).append(registration)
+            decided[key] = outcomes[position] = registration
+
+        superseded: Dict[Registration, Registration] = {}
+        with self.storage.batch():
+            for event, registrations in new_registrations.items():
+                with event.lock:
+                    registrations = self._recheck_draw(event, registrations, superseded)
+                    event.add_registrations(registrations)
+                    self.storage.add_registrations(registrations)
+                    for registration in registrations:
+                        registration.student.add_registration(registration)
+        if superseded:
+            outcomes = [
+                superseded.get(outcome, outcome) if outcome is not None else None
+                for outcome in outcomes
+            ]
+        return outcomes
+
+    def _recheck_draw(
+        self,
+        event: Event,
+        registrations: List[Registration],
+        superseded: Dict[Registration, Registration],
+    ) -> List[Registration]:
+        """
+        Fit drawn registrations to the current state of their event.
+
+        Called under the event lock. A student who registered directly since the
+        draw keeps that registration, recorded in ``superseded``, and confirmed
+        draws beyond the seats still free are waitlisted.
+
+        Returns:
+            List[Registration]: The registrations to attach, in draw order
+        """
+        seats_free = event.max_seats - event.confirmed_count
+        kept = []
+        for registration in registrations:
+            existing = event.get_registration(registration.student.student_id)
+            if existing is not None:
+                superseded[registration] = existing
+                continue
+            if registration.status == RegistrationStatus.CONFIRMED:
+                if seats_free > 0:
+                    seats_free -= 1
+                else:
+                    registration.status = RegistrationStatus.WAITLISTED
+                    registration.warnings = ()
+            kept.append(registration)
+        return kept
+
+    def _draw_seat(
+        self,
+        student: Student,
+        event: Event,
+        seats_left: Dict[Event, int],
+        confirmed_seats: Dict[str, int],
+        cap: float,
+        window_timetables: Dict[Student, List[Event]],
+    ) -> Optional[Registration]:
+        """Decide the outcome of one lottery intent without attaching it yet."""
+        held = confirmed_seats[student.student_id]
+        clashes: List[Event] = []
+        if held:
+            # Only a student who already holds a seat can have a clash
+            if student.timetable:
+                clashes = student.timetable.clashes(event)
+            window_events = window_timetables.get(student)
+            if window_events:
+                day = event.day
+                clashes += [
+                    other
+                    for other in window_events
+                    if other.day == day and other.has_conflict_with(event)
+                ]
+            if clashes and self.clash_policy == ClashPolicy.REJECT:
+                return None
 
         registration = Registration(student, event)
+        left = seats_left.get(event)
+        if left is None:
+            left = event.max_seats - event.confirmed_count
+        if left > 0 and held < cap and self._confirm(registration, clashes):
+            seats_left[event] = left - 1
+            confirmed_seats[student.student_id] = held + 1
+            window_timetables.setdefault(student, []).append(event)
+        return registration
 
-        # Check if seats are available
-        confirmed_seats = sum(
-            1
-            for reg in event.registrations
-            if reg.status == RegistrationStatus.CONFIRMED
-        )
+    def cancel_registration(
+        self, student_id: str, event_id: str
+    ) -> Optional[Registration]:
+        """
+        Cancel a student's registration and promote the waitlist if a seat frees up.
+
+        Args:
+            student_id (str): ID of the student cancelling
+            event_id (str): ID of the event to cancel
 
-        if confirmed_seats < event.max_seats:
-            registration.status = RegistrationStatus.CONFIRMED
+        Returns:
+            Optional[Registration]: The cancelled registration, None if the student
+                was not registered for the event
+
+        Note:
+            - Cancelling a confirmed seat promotes the head of the event's FIFO
+              waitlist to CONFIRMED
+            - Cancelling a waitlisted registration moves everyone behind it up
+            - Unless the clash policy is ALLOW, waitlisted students whose
+              timetable clashes with the event are skipped and keep their place
+        """
+        event = self.events.get(event_id)
+        if event is None:
+            return None
 
-        event.registrations.append(registration)
-        student.registrations.append(registration)
+        with self.storage.batch(), event.lock:
+            registration = event.remove_registration(student_id)
+            if registration is None:
+                return None
+            registration.student.remove_registration(registration)
+            self.storage.delete_registration(event_id, student_id)
+            self._fill_seats(event)
         return registration
 
+    def _fill_seats(self, event: Event) -> None:
+        """
+        Promote waitlisted registrations in FIFO order while the event has free seats.
+
+        The caller must hold ``event.lock``.
+        """
+        if event.confirmed_count >= event.max_seats:
+            return
+        promoted: List[Registration] = []
+        # Promotion only removes entries from the waitlist, so iterating it is safe
+        for registration in event.waitlist:
+            timetable = registration.student.timetable
+            with timetable.lock:
+                if self._confirm(registration, timetable.clashes(event)):
+                    promoted.append(registration)
+            if event.confirmed_count >= event.max_seats:
+                break
+        self.storage.update_registrations(promoted)
+
+    def waitlist_position(self, student_id: str, event_id: str) -> Optional[int]:
+        """
+        Get a student's position on an event's waitlist.
+
+        Args:
+            student_id (str): ID of the student
+            event_id (str): ID of the event
+
+        Returns:
+            Optional[int]: 1-based waitlist position, None if the student is not
+                waitlisted for the event
+
+        Note:
+            Positions are prefix sums over a Fenwick tree, so the lookup is
+            O(log n) even for very long waitlists
+        """
+        event = self.events.get(event_id)
+        if event is None:
+            return None
+        registration = event.get_registration(student_id)
+        if registration is None:
+            return None
+        return event.waitlist.position(registration)
+
     def raise_service_request(
         self, request_id: str, student_id: str, category: str
     ) -> Optional[ServiceRequest]:
@@ -184,16 +973,45 @@ class CampusEventManagementSystem:
             - Creates a new service request with initial status as OPEN
             - Links the request to both the system and the student's record
             - Automatically timestamps the request creation
+            - Indexes the request by status and category, queues it for triage
+              and logs its creation in ``history``; a request raised with an
+              existing ID replaces the old one
         """
         if student_id not in self.students:
             return None
 
-        student = self.students[student_id]
-        request = ServiceRequest(request_id, student, category)
-        self.service_requests[request_id] = request
-        student.service_requests.append(request)
+        request = ServiceRequest(request_id, self.students[student_id], category)
+        with self.storage.batch(), self._service_lock:
+            self._add_service_request(request)
+            self.history.record(
+                request.request_id,
+                request.category,
+                None,
+                request.status,
+                request.created_at,
+            )
+            self.storage.add_service_request(request)
         return request
 
+    def _add_service_request(self, request: ServiceRequest) -> None:
+        """Store, index and queue a new request. The caller must hold ``_service_lock``."""
+        previous = self.service_requests.get(request.request_id)
+        if previous is not None:
+            self._request_index.remove(previous)
+            self.triage.remove(previous)
+        self.service_requests[request.request_id] = request
+        self._request_index.add(request)
+        self.triage.update(request)
+        request.student.service_requests.append(request)
+
+    def _on_request_status_change(
+        self, request: ServiceRequest, old: RequestStatus, new: RequestStatus
+    ) -> None:
+        """Keep the triage queue, status history and storage in step with a status change."""
+        self.triage.update(request)
+        self.history.record(request.request_id, request.category, old, new)
+        self.storage.update_service_requests([request])
+
     # def get_event_status(self):
 
     def get_event_summary(self, event_id: str) -> Optional[Dict]:
@@ -216,11 +1034,14 @@ class CampusEventManagementSystem:
             Returns None if event not found
 
         Note:
-            This is a comprehensive summary suitable for display and reporting purposes
+            - This is a comprehensive summary suitable for display and reporting purposes
+            - Reads the event's seat counters without locking, so it never waits
+              for registrations in progress
         """
-        if event_id not in self.events:
+        event = self.events.get(event_id)
+        if event is None:
             return None
-        return self.events[event_id].get_summary()
+        return event.get_summary()
 
     def update_service_request_status(
         self, request_id: str, new_status: RequestStatus
@@ -236,12 +1057,61 @@ class CampusEventManagementSystem:
             bool: True if status was updated successfully, False if request not found
 
         Note:
-            Uses the RequestStatus enum to ensure valid status values
+            - Uses the RequestStatus enum to ensure valid status values
+            - The request moves between the status groups of the index in O(1)
+        """
+        with self.storage.batch(), self._service_lock:
+            if request_id in self.service_requests:
+                self.service_requests[request_id].status = new_status
+                return True
+            return False
+
+    def update_service_request_statuses(
+        self, request_ids: Iterable[str], new_status: RequestStatus
+    ) -> int:
+        """
+        Move many service requests to one status, all or nothing.
+
+        Args:
+            request_ids (Iterable[str]): IDs of the requests to update; repeats
+                are ignored
+            new_status (RequestStatus): Status to set on every request
+
+        Returns:
+            int: Number of requests whose status changed; requests already in
+                ``new_status`` are left as they are
+
+        Raises:
+            ValueError: If ``new_status`` is not a RequestStatus or an ID is not
+                found; no request is updated then
+
+        Note:
+            - Every request is validated before any is changed, and the whole
+              batch runs under the service request lock, so other threads see
+              either none or all of the updates
+            - Each change moves the request between index groups and the triage
+              queue in O(log n), as a single update would
         """
-        if request_id in self.service_requests:
-            self.service_requests[request_id].status = new_status
-            return True
-        return False
+        if not isinstance(new_status, RequestStatus):
+            raise ValueError(f"Unknown request status: {new_status!r}")
+        with self.storage.batch(), self._service_lock:
+            requests = self.service_requests
+            unique_ids = dict.fromkeys(request_ids)
+            missing = [
+                request_id for request_id in unique_ids if request_id not in requests
+            ]
+            if missing:
+                raise ValueError(
+                    f"Service requests not found: {', '.join(map(str, missing))}"
+                )
+            changed = [
+                requests[request_id]
+                for request_id in unique_ids
+                if requests[request_id].status != new_status
+            ]
+            for request in changed:
+                request.status = new_status
+        return len(changed)
 
     def get_service_request_summary(self) -> Dict[str, int]:
         """
@@ -256,20 +1126,155 @@ class CampusEventManagementSystem:
                 }
 
         Note:
-            Initializes counters for all possible status values, even if count is 0
+            - Initializes counters for all possible status values, even if count is 0
+            - Reads the status index, so the cost does not grow with the number
+              of requests
+        """
+        counts = self._request_index.status_counts()
+        return {status.value: count for status, count in counts.items()}
+
+    def get_service_request_category_summary(self) -> Dict[str, int]:
+        """
+        Count service requests per category.
+
+        Returns:
+            Dict[str, int]: Category names mapped to their number of requests, in
+                order of first use
+
+        Note:
+            O(c) for c categories, read from the category index
+        """
+        return self._request_index.category_counts()
+
+    def get_service_requests(
+        self,
+        statuses: Iterable[RequestStatus] = tuple(RequestStatus),
+        category: Optional[str] = None,
+    ) -> List[ServiceRequest]:
+        """
+        List the service requests with given statuses, optionally in one category.
+
+        Args:
+            statuses (Iterable[RequestStatus]): Statuses to include. Defaults to all.
+            category (Optional[str]): Only include requests of this category
+
+        Returns:
+            List[ServiceRequest]: Matching requests, grouped by status in the order
+                given. Within a status they are in the order they were raised
+                with it or moved to it, which for a status change is not
+                creation order; ``query_service_requests`` orders by creation.
+
+        Note:
+            O(k) for k matching requests, e.g. open requests in one category
+        """
+        with self._service_lock:
+            request_ids = self._request_index.ids(statuses, category)
+            return [self.service_requests[request_id] for request_id in request_ids]
+
+    def query_service_requests(
+        self,
+        statuses: Iterable[RequestStatus] = tuple(RequestStatus),
+        category: Optional[str] = None,
+        student_id: Optional[str] = None,
+        cursor: Optional[int] = None,
+        limit: int = 25,
+    ) -> ServiceRequestPage:
+        """
+        Fetch one page of service requests matching the filters, newest first.
+
+        Args:
+            statuses (Iterable[RequestStatus]): Statuses to include. Defaults to all.
+            category (Optional[str]): Only include requests of this category
+            student_id (Optional[str]): Only include requests raised by this student
+            cursor (Optional[int]): ``next_cursor`` of the previous page, None for
+                the first page
+            limit (int): Most requests on the page
+
+        Returns:
+            ServiceRequestPage: The page, the number of matching requests and the
+                cursor of the following page
+
+        Raises:
+            ValueError: If ``limit`` is not positive
+
+        Note:
+            - Candidates come from the status/category index (or the student's
+              own requests), and only the ``limit`` newest are selected, so a
+              page costs O(k log limit) for k matching requests and builds
+              nothing for the rest
+            - Pages are ordered by creation, so a status change never moves a
+              request to another page; a request whose status changes no longer
+              matches a status filter and drops out of it
+        """
+        if limit <= 0:
+            raise ValueError(f"Page limit must be positive, got {limit}")
+        statuses = tuple(statuses)
+        index = self._request_index
+        with self._service_lock:
+            if student_id is None:
+                request_ids = index.ids(statuses, category)
+            else:
+                student = self.students.get(student_id)
+                own_requests = student.service_requests if student else []
+                request_ids = [
+                    request.request_id
+                    for request in own_requests
+                    if self.service_requests.get(request.request_id) is request
+                    and request.status in statuses
+                    and (category is None or request.category == category)
+                ]
+            total = len(request_ids)
+            if cursor is not None:
+                request_ids = [
+                    request_id
+                    for request_id in request_ids
+                    if index.sequence(request_id) < cursor
+                ]
+            newest = heapq.nlargest(limit + 1, request_ids, key=index.sequence)
+            page = ServiceRequestPage(
+                [self.service_requests[request_id] for request_id in newest[:limit]],
+                total,
+            )
+            if len(newest) > limit:
+                page.next_cursor = index.sequence(newest[limit - 1])
+        return page
+
+    def count_active_service_requests(self, category: Optional[str] = None) -> int:
+        """
+        Count the service requests that are Open or In-Progress.
+
+        Args:
+            category (Optional[str]): Only count requests of this category
+
+        Returns:
+            int: Number of active requests, in O(1)
+        """
+        return self._request_index.count(ACTIVE_REQUEST_STATUSES, category)
+
+    def get_conflict_report(self) -> ConflictReport:
+        """
+        Analyse all events in the system for scheduling conflicts.
+
+        Returns:
+            ConflictReport: Conflict pairs, events with conflicts, validity counts
+                and events grouped by venue
+
+        Note:
+            The report is built with a single sweep over events sorted by date and
+            start time, so it is cheap enough to call on every page render
         """
-        summary = {status.value: 0 for status in RequestStatus}
-        for request in self.service_requests.values():
-            summary[request.status.value] += 1
-        return summary
+        return build_conflict_report(list(self.events.values()))
 
-    def display_events_summary(self, events):
+    def display_events_summary(self, events: Dict[str, Event]) -> ConflictReport:
         """
         Display a comprehensive summary of all events including conflicts and validity status.
 
         Args:
             events (Dict[str, Event]): Dictionary of events to analyze and display
 
+        Returns:
+            ConflictReport: The report that was printed, for further processing
+
         Displays:
             - Total number of events
             - Count of valid and invalid events
@@ -277,62 +1282,35 @@ class CampusEventManagementSystem:
             - Total number of conflict pairs
             - Detailed conflict information (venue and time conflicts)
             - Events grouped by venue
-
-        Note:
-            This function prints the information directly rather than returning it
         """
+        report = build_conflict_report(events.values())
+
         print("\nEVENTS SUMMARY")
         print("=" * 50)
+        print(f"\nTotal Events: {report.total_events}")
+        print(f"Valid Events: {report.valid_events}")
+        print(f"Invalid Events: {report.invalid_events}")
+        print(f"Events with Conflicts: {len(report.events_with_conflicts)}")
+        print(f"Total Conflict Pairs: {len(report.conflict_pairs)}")
+
+        if report.conflict_pairs:
+            print("\nConflict Details:")
+            for event1, event2 in report.conflict_pairs:
+                conflict_details = event1.get_conflict_details(event2)
+                print(f"\n{event1.title} <-> {event2.title}")
+                if conflict_details["venue_conflict"]:
+                    print(f"- Venue Conflict: {event1.venue}")
+                period = conflict_details["conflict_period"]
+                print(
+                    f"- Time Conflict: {period['date']} {period['start']} - {period['end']}"
+                )
+
+        print("\nEvents by Venue:")
+        for venue, venue_events in report.events_by_venue.items():
+            print(f"\n{venue}:")
+            for event in venue_events:
+                print(
+                    f"- {event.title} ({event.date} {event.start_time} - {event.end_time})"
+                )
 
-        total_events = len(events)
-        # valid_events = sum(1 for event in events[event] if event.is_valid)
-        valid_events = 0
-        # events=system.events
-        for event in events:
-
-            if events[event].is_valid:
-                valid_events = valid_events + 1
-
-        print(valid_events)
-        invalid_events = total_events - valid_events
-
-        events_with_conflicts = set()
-        conflict_pairs = []
-
-        for i, event1 in enumerate(events):
-            for event2 in events:
-                if events[event1].has_conflict_with(events[event2]):
-
-                    events_with_conflicts.add(events[event1])
-                    events_with_conflicts.add(events[event2])
-                    conflict_pairs.append((events[event1], events[event2]))
-
-        print(f"\nTotal Events: {total_events}")
-        print(f"Valid Events: {valid_events}")
-        print(f"Invalid Events: {invalid_events}")
-        print(f"Events with Conflicts: {len(events_with_conflicts)}")
-        print(f"Total Conflict Pairs: {len(conflict_pairs)}")
-
-        # if conflict_pairs:
-        #     print("\nConflict Details:")
-        #     for events[event1], events[event2] in conflict_pairs:
-        #         conflict_details = events[event1].get_conflict_details(events[event2])
-        #         print(f"\n{events[event1].title} <-> {events[event2].title}")
-        #         if conflict_details["venue_conflict"]:
-        #             print(f"- Venue Conflict: {events[event1].venue}")
-        #         if conflict_details["time_conflict"]:
-        #             period = conflict_details["conflict_period"]
-        #             print(f"- Time Conflict: {period['date']} {period['start']} - {period['end']}")
-
-        # # Show events by venue
-        # print("\nEvents by Venue:")
-        # venues = {}
-        # for event in events:
-        #     if events[event].venue not in venues:
-        #         venues[events[event].venue] = []
-        #     venues[events[event].venue].append(events[event])
-
-        # for venue, venue_events in venues.items():
-        #     print(f"\n{venue}:")
-        #     for event in venue_events:
-        #         print(f"- {event.title} ({event.date} {event.start_time} - {event.end_time})")
+        return report
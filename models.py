@@ -1,6 +1,36 @@
-from datetime import datetime
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, List
+from functools import lru_cache
+from itertools import count
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from waitlist import Waitlist
+
+DATE_FORMAT = "%Y-%m-%d"
+TIME_FORMAT = "%I:%M %p"
+
+
+@lru_cache(maxsize=4096)
+def parse_day(value: str) -> int:
+    """Parse a ``YYYY-MM-DD`` string into a day ordinal."""
+    return datetime.strptime(value, DATE_FORMAT).toordinal()
+
+
+@lru_cache(maxsize=4096)
+def parse_minute_of_day(value: str) -> int:
+    """Parse an ``HH:MM AM/PM`` string into minutes after midnight."""
+    parsed = datetime.strptime(value, TIME_FORMAT)
+    return parsed.hour * 60 + parsed.minute
+
+
+def format_minute_of_day(minute: int) -> str:
+    """Format minutes after midnight as an ``HH:MM AM/PM`` string."""
+    hour, minute = divmod(minute, 60)
+    return f"{(hour - 1) % 12 + 1:02d}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
 
 
 class RequestStatus(Enum):
@@ -14,7 +44,47 @@ class RegistrationStatus(Enum):
     WAITLISTED = "Waitlisted"
 
 
+# Statuses are stored on instances as small ints indexing these tuples
+_REQUEST_STATUSES = tuple(RequestStatus)
+_REQUEST_STATUS_CODES = {status: code for code, status in enumerate(_REQUEST_STATUSES)}
+_REGISTRATION_STATUSES = tuple(RegistrationStatus)
+_REGISTRATION_STATUS_CODES = {
+    status: code for code, status in enumerate(_REGISTRATION_STATUSES)
+}
+_WAITLISTED = _REGISTRATION_STATUS_CODES[RegistrationStatus.WAITLISTED]
+
+
+class ClashPolicy(Enum):
+    """What to do when a seat would overlap an event the student is confirmed for."""
+
+    ALLOW = "Allow"
+    WAITLIST = "Waitlist"
+    REJECT = "Reject"
+
+
 class Event:
+    __slots__ = (
+        "event_id",
+        "title",
+        "club",
+        "date",
+        "start_time",
+        "end_time",
+        "day",
+        "start_minute",
+        "end_minute",
+        "venue",
+        "max_seats",
+        "_registrations",
+        "confirmed_count",
+        "waitlisted_count",
+        "waitlist",
+        "is_valid",
+        "violations",
+        "created_at",
+        "lock",
+    )
+
     def __init__(
         self,
         event_id: str,
@@ -28,21 +98,63 @@ class Event:
     ):
         self.event_id = event_id
         self.title = title
-        self.club = club
-        self.date = date
-        self.start_time = start_time
-        self.end_time = end_time
-        self.venue = venue
+        # Clubs and venues repeat across many events, so share one string each
+        self.club = sys.intern(club)
+        self._set_schedule(date, start_time, end_time)
+        self.venue = sys.intern(venue)
         self.max_seats = max_seats
-        self.registrations: List[Registration] = []
+        self._registrations: Dict[str, Registration] = {}
+        self.confirmed_count = 0
+        self.waitlisted_count = 0
+        self.waitlist: Waitlist[Registration] = Waitlist()
         self.is_valid = True
         self.violations: List[str] = []
         self.created_at = datetime.now()
+        # Serialises registration changes; seat counters are read without it
+        self.lock = threading.Lock()
+
+    def _set_schedule(self, date: str, start_time: str, end_time: str) -> None:
+        """
+        Parse and validate the schedule once, caching it as integers.
+
+        Raises:
+            ValueError: If the date or a time is malformed, or the event ends
+                before it starts
+        """
+        day = parse_day(date)
+        start_minute = parse_minute_of_day(start_time)
+        end_minute = parse_minute_of_day(end_time)
+        if end_minute < start_minute:
+            raise ValueError(
+                f"Event end time {end_time} is before start time {start_time}"
+            )
+        self.date = sys.intern(date)
+        self.start_time = sys.intern(start_time)
+        self.end_time = sys.intern(end_time)
+        self.day = day
+        self.start_minute = start_minute
+        self.end_minute = end_minute
+
+    def reschedule(self, date: str, start_time: str, end_time: str) -> None:
+        """
+        Move the event to a new date and time.
+
+        The timetables of students holding a confirmed seat are updated to the
+        new slot.
+
+        Raises:
+            ValueError: If the new schedule is malformed; the event is unchanged
+        """
+        self._set_schedule(date, start_time, end_time)
+        for registration in self._registrations.values():
+            registration.student.timetable.move(self)
 
     def get_datetime_range(self) -> tuple[datetime, datetime]:
-        start = datetime.strptime(f"{self.date} {self.start_time}", "%Y-%m-%d %I:%M %p")
-        end = datetime.strptime(f"{self.date} {self.end_time}", "%Y-%m-%d %I:%M %p")
-        return start, end
+        day_start = datetime.fromordinal(self.day)
+        return (
+            day_start + timedelta(minutes=self.start_minute),
+            day_start + timedelta(minutes=self.end_minute),
+        )
 
     def get_conflict_details(self, other: "Event") -> dict:
         """Get detailed information about any conflicts with another event."""
@@ -54,16 +166,17 @@ class Event:
         }
 
         # Check time conflict first
-        self_start, self_end = self.get_datetime_range()
-        other_start, other_end = other.get_datetime_range()
-
-        if self_start <= other_end and self_end >= other_start:
+        if (
+            self.day == other.day
+            and self.start_minute <= other.end_minute
+            and self.end_minute >= other.start_minute
+        ):
             conflicts["time_conflict"] = True
-            overlap_start = max(self_start, other_start)
-            overlap_end = min(self_end, other_end)
             conflicts["conflict_period"] = {
-                "start": overlap_start.strftime("%I:%M %p"),
-                "end": overlap_end.strftime("%I:%M %p"),
+                "start": format_minute_of_day(
+                    max(self.start_minute, other.start_minute)
+                ),
+                "end": format_minute_of_day(min(self.end_minute, other.end_minute)),
                 "date": self.date,
             }
             conflicts["has_conflict"] = True
@@ -77,20 +190,68 @@ class Event:
         return conflicts
 
     def has_conflict_with(self, other: "Event") -> bool:
-        conflict_details = self.get_conflict_details(other)
-        return conflict_details["has_conflict"]
+        return (
+            self.day == other.day
+            and self.start_minute <= other.end_minute
+            and self.end_minute >= other.start_minute
+        )
+
+    @property
+    def registrations(self) -> List["Registration"]:
+        """Registrations in the order they were made (a read-only copy)."""
+        return list(self._registrations.values())
+
+    def get_registration(self, student_id: str) -> Optional["Registration"]:
+        """Return the registration of a student for this event, if any."""
+        return self._registrations.get(student_id)
+
+    def add_registration(self, registration: "Registration") -> None:
+        """Attach a registration, counting it and queueing it if waitlisted."""
+        self._registrations[registration.student.student_id] = registration
+        registration._counted = True
+        self._track(registration, registration.status, 1)
+
+    def add_registrations(self, registrations: List["Registration"]) -> None:
+        """
+        Attach many new registrations at once, keeping their order.
+
+        Counters are updated once and waitlisted registrations are queued with a
+        single waitlist rebuild, which is cheaper than attaching them one by one.
+        """
+        waitlisted = []
+        for registration in registrations:
+            self._registrations[registration.student.student_id] = registration
+            registration._counted = True
+            if registration.status == RegistrationStatus.WAITLISTED:
+                waitlisted.append(registration)
+        self.confirmed_count += len(registrations) - len(waitlisted)
+        self.waitlisted_count += len(waitlisted)
+        self.waitlist.extend(waitlisted)
+
+    def remove_registration(self, student_id: str) -> Optional["Registration"]:
+        """Detach the registration of a student, returning it if there was one."""
+        registration = self._registrations.pop(student_id, None)
+        if registration is not None:
+            registration._counted = False
+            self._track(registration, registration.status, -1)
+        return registration
+
+    def _track(
+        self, registration: "Registration", status: RegistrationStatus, delta: int
+    ) -> None:
+        """Apply a registration entering (+1) or leaving (-1) a status."""
+        if status == RegistrationStatus.CONFIRMED:
+            self.confirmed_count += delta
+        else:
+            self.waitlisted_count += delta
+            if delta > 0:
+                self.waitlist.push(registration)
+            else:
+                self.waitlist.remove(registration)
 
     def get_summary(self) -> Dict:
-        confirmed = sum(
-            1
-            for reg in self.registrations
-            if reg.status == RegistrationStatus.CONFIRMED
-        )
-        waitlisted = sum(
-            1
-            for reg in self.registrations
-            if reg.status == RegistrationStatus.WAITLISTED
-        )
+        confirmed = self.confirmed_count
+        waitlisted = self.waitlisted_count
 
         return {
             "event_id": self.event_id,
@@ -109,26 +270,334 @@ class Event:
         }
 
 
+class Timetable:
+    """
+    Events a student holds a confirmed seat for, sorted by start.
+
+    Starts are stored as absolute minutes. Events only span one day, so the
+    longest event stored bounds how far before a query window an overlapping
+    event can start, and a clash check only visits the slice of starts in
+    ``[start - max_span, end]`` found with a binary search: O(log k) for k
+    events plus the clashes found.
+
+    Updates take ``lock``, a re-entrant lock that callers also hold to make a
+    clash check and the registration that follows it atomic.
+    """
+
+    __slots__ = ("_starts", "_events", "_positions", "_max_span", "lock")
+
+    def __init__(self):
+        self._starts: List[int] = []
+        self._events: List[Event] = []
+        # Start each event was stored under, so it can be found after a reschedule
+        self._positions: Dict[Event, int] = {}
+        self._max_span = 0
+        self.lock = threading.RLock()
+
+    def add(self, event: Event) -> None:
+        """Add an event to the timetable. Events already present are ignored."""
+        with self.lock:
+            if event in self._positions:
+                return
+            start = event.day * 1440 + event.start_minute
+            position = bisect_right(self._starts, start)
+            self._starts.insert(position, start)
+            self._events.insert(position, event)
+            self._positions[event] = start
+            self._max_span = max(self._max_span, event.end_minute - event.start_minute)
+
+    def remove(self, event: Event) -> None:
+        """Remove an event from the timetable. Unknown events are ignored."""
+        with self.lock:
+            start = self._positions.pop(event, None)
+            if start is None:
+                return
+            # Events sharing a start are few, so scan them for this one
+            position = bisect_left(self._starts, start)
+            while self._events[position] is not event:
+                position += 1
+            del self._starts[position]
+            del self._events[position]
+
+    def move(self, event: Event) -> None:
+        """Re-sort an event after it was rescheduled, if it is in the timetable."""
+        with self.lock:
+            if event in self._positions:
+                self.remove(event)
+                self.add(event)
+
+    def clashes(self, event: Event) -> List[Event]:
+        """
+        Find the events in the timetable overlapping ``event``.
+
+        Args:
+            event (Event): Event to check; it is skipped if already present
+
+        Returns:
+            List[Event]: Overlapping events in start time order
+        """
+        start = event.day * 1440 + event.start_minute
+        end = event.day * 1440 + event.end_minute
+        with self.lock:
+            # Bounds are inclusive: events touching at a boundary minute overlap.
+            low = bisect_left(self._starts, start - self._max_span)
+            high = bisect_right(self._starts, end)
+            window = self._events[low:high]
+        return [
+            other
+            for other in window
+            if other is not event and other.has_conflict_with(event)
+        ]
+
+    def __contains__(self, event: object) -> bool:
+        return event in self._positions
+
+    def __iter__(self) -> Iterator[Event]:
+        with self.lock:
+            return iter(list(self._events))
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
 class Student:
+    __slots__ = (
+        "student_id",
+        "name",
+        "_registrations",
+        "timetable",
+        "service_requests",
+    )
+
     def __init__(self, student_id: str, name: str = " "):
         self.student_id = student_id
         self.name = name or f"Test Subject {self.student_id}"
-        self.registrations: List[Registration] = []
+        self._registrations: Dict[Event, Registration] = {}
+        self.timetable = Timetable()
         self.service_requests: List[ServiceRequest] = []
 
+    @property
+    def registrations(self) -> List["Registration"]:
+        """Registrations in the order they were made (a read-only copy)."""
+        return list(self._registrations.values())
+
+    def add_registration(self, registration: "Registration") -> None:
+        self._registrations[registration.event] = registration
+        if registration.status == RegistrationStatus.CONFIRMED:
+            self.timetable.add(registration.event)
+
+    def remove_registration(self, registration: "Registration") -> None:
+        if self._registrations.pop(registration.event, None) is not None:
+            self.timetable.remove(registration.event)
+
+    def holds(self, registration: "Registration") -> bool:
+        """Return True if the registration is in this student's registrations."""
+        return self._registrations.get(registration.event) is registration
+
+    def _sync_timetable(self, registration: "Registration") -> None:
+        """Keep the timetable in step with the status of a held registration."""
+        if registration.status == RegistrationStatus.CONFIRMED:
+            self.timetable.add(registration.event)
+        else:
+            self.timetable.remove(registration.event)
+
 
 class Registration:
+    __slots__ = ("student", "event", "_status", "_counted", "warnings")
+
     def __init__(self, student: Student, event: Event):
         self.student = student
 
         self.event = event
-        self.status = RegistrationStatus.WAITLISTED
+        self._status = _WAITLISTED
+        self._counted = False
+        self.warnings: Tuple[str, ...] = ()
+
+    @property
+    def status(self) -> RegistrationStatus:
+        return _REGISTRATION_STATUSES[self._status]
+
+    @status.setter
+    def status(self, value: RegistrationStatus) -> None:
+        code = _REGISTRATION_STATUS_CODES[value]
+        # Keep the event's counters and waitlist in step once it is attached
+        if self._counted and code != self._status:
+            self.event._track(self, _REGISTRATION_STATUSES[self._status], -1)
+            self.event._track(self, value, 1)
+        self._status = code
+        if self.student.holds(self):
+            self.student._sync_timetable(self)
 
 
 class ServiceRequest:
+    __slots__ = (
+        "request_id",
+        "student",
+        "category",
+        "_status",
+        "_index",
+        "created_at",
+    )
+
     def __init__(self, request_id: str, student: Student, category: str):
         self.request_id = request_id
         self.student = student
-        self.category = category
-        self.status = RequestStatus.OPEN
+        self.category = sys.intern(category)
+        self._status = _REQUEST_STATUS_CODES[RequestStatus.OPEN]
+        self._index: Optional["ServiceRequestIndex"] = None
         self.created_at = datetime.now()
+
+    @property
+    def status(self) -> RequestStatus:
+        return _REQUEST_STATUSES[self._status]
+
+    @status.setter
+    def status(self, value: RequestStatus) -> None:
+        previous = _REQUEST_STATUSES[self._status]
+        self._status = _REQUEST_STATUS_CODES[value]
+        # Keep the index in step once the request is indexed
+        if self._index is not None and value != previous:
+            self._index._move(self, previous, value)
+
+
+ACTIVE_REQUEST_STATUSES = (RequestStatus.OPEN, RequestStatus.IN_PROGRESS)
+
+
+class ServiceRequestIndex:
+    """
+    Service request IDs grouped by status and by category and status.
+
+    The groups are insertion-ordered ID sets updated whenever a request is
+    added, removed or changes status, so counts are O(1) and listing the ``k``
+    requests of a group is O(k) rather than a scan of every request. A request
+    that changes status joins the end of its new group, so a group is in the
+    order its requests entered that status, not in creation order.
+
+    Every indexed request also gets an increasing sequence number, which gives
+    a creation order that survives status changes and is used as a page cursor.
+
+    Counts can be read while another thread updates the index; listing IDs
+    needs the caller to serialise with updates.
+    """
+
+    __slots__ = (
+        "_by_status",
+        "_by_category",
+        "_on_status_change",
+        "_sequence",
+        "_next_sequence",
+    )
+
+    def __init__(
+        self,
+        on_status_change: Optional[
+            Callable[[ServiceRequest, RequestStatus, RequestStatus], None]
+        ] = None,
+    ):
+        """
+        Create an empty index.
+
+        Args:
+            on_status_change (Optional[Callable]): Called with the request and
+                its old and new status after an indexed request changes status
+        """
+        self._on_status_change = on_status_change
+        self._by_status: Dict[RequestStatus, Dict[str, None]] = {
+            status: {} for status in RequestStatus
+        }
+        self._by_category: Dict[str, Dict[RequestStatus, Dict[str, None]]] = {}
+        self._sequence: Dict[str, int] = {}
+        self._next_sequence = count(1)
+
+    def add(self, request: ServiceRequest) -> None:
+        """Index a request; it is moved between groups when its status changes."""
+        for group in self._groups(request.category, request.status):
+            group[request.request_id] = None
+        self._sequence[request.request_id] = next(self._next_sequence)
+        request._index = self
+
+    def remove(self, request: ServiceRequest) -> None:
+        """Stop indexing a request. Requests that are not indexed are ignored."""
+        if request._index is not self:
+            return
+        for group in self._groups(request.category, request.status):
+            group.pop(request.request_id, None)
+        self._sequence.pop(request.request_id, None)
+        request._index = None
+
+    def _move(
+        self, request: ServiceRequest, old: RequestStatus, new: RequestStatus
+    ) -> None:
+        for group in self._groups(request.category, old):
+            group.pop(request.request_id, None)
+        for group in self._groups(request.category, new):
+            group[request.request_id] = None
+        if self._on_status_change is not None:
+            self._on_status_change(request, old, new)
+
+    def _groups(
+        self, category: str, status: RequestStatus
+    ) -> Tuple[Dict[str, None], Dict[str, None]]:
+        by_status = self._by_category.get(category)
+        if by_status is None:
+            by_status = self._by_category[category] = {
+                request_status: {} for request_status in RequestStatus
+            }
+        return self._by_status[status], by_status[status]
+
+    def count(
+        self,
+        statuses: Iterable[RequestStatus] = tuple(RequestStatus),
+        category: Optional[str] = None,
+    ) -> int:
+        """Count the requests with one of ``statuses``, optionally in one category."""
+        groups = (
+            self._by_status if category is None else self._by_category.get(category, {})
+        )
+        return sum(len(groups.get(status, ())) for status in statuses)
+
+    def ids(
+        self,
+        statuses: Iterable[RequestStatus] = tuple(RequestStatus),
+        category: Optional[str] = None,
+    ) -> List[str]:
+        """IDs of requests with one of ``statuses``, in the order they entered each."""
+        groups = (
+            self._by_status if category is None else self._by_category.get(category, {})
+        )
+        return [
+            request_id for status in statuses for request_id in groups.get(status, ())
+        ]
+
+    def sequence(self, request_id: str) -> int:
+        """Return the sequence number of an indexed request; later requests have higher ones."""
+        return self._sequence[request_id]
+
+    def status_counts(self) -> Dict[RequestStatus, int]:
+        """Number of requests per status, every status included."""
+        return {status: len(group) for status, group in self._by_status.items()}
+
+    def category_counts(self) -> Dict[str, int]:
+        """Number of requests per category, in order of first use."""
+        # Copying the items is atomic, so concurrent additions cannot break the loop
+        return {
+            category: sum(len(group) for group in by_status.values())
+            for category, by_status in list(self._by_category.items())
+        }
+
+
+@dataclass
+class ServiceRequestPage:
+    """
+    One page of a service request listing.
+
+    Attributes:
+        requests (List[ServiceRequest]): Requests on the page, newest first
+        total (int): Number of requests matching the filters across all pages
+        next_cursor (Optional[int]): Cursor of the following page, None on the
+            last page
+    """
+
+    requests: List[ServiceRequest] = field(default_factory=list)
+    total: int = 0
+    next_cursor: Optional[int] = None
@@ -0,0 +1,369 @@
+"""
+Scheduling indexes used for event conflict detection.
+"""
+
+import heapq
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from models import Event
+
+# (start_minute, sequence) sort key of an indexed interval
+_Key = Tuple[int, int]
+
+
+class _IntervalList:
+    """
+    Intervals of a single partition, kept sorted by start minute.
+
+    Events only span one day, so the longest interval stored bounds how far
+    before a query window an overlapping interval can start. A query therefore
+    only visits the slice of starts in ``[start - max_span, end]``.
+    """
+
+    def __init__(self):
+        self.keys: List[_Key] = []
+        self.entries: List[Tuple[int, int, int, Event]] = []
+        self.max_span = 0
+
+    def insert(self, start: int, end: int, seq: int, event: Event) -> None:
+        key = (start, seq)
+        position = bisect_left(self.keys, key)
+        self.keys.insert(position, key)
+        self.entries.insert(position, (start, end, seq, event))
+        self.max_span = max(self.max_span, end - start)
+
+    def extend(self, items: List[Tuple[int, int, int, Event]]) -> None:
+        """Add many (start, end, seq, event) entries with a single sort."""
+        entries = self.entries + items
+        entries.sort(key=lambda entry: (entry[0], entry[2]))
+        self.entries = entries
+        self.keys = [(entry[0], entry[2]) for entry in entries]
+        self.max_span = max(self.max_span, max(entry[1] - entry[0] for entry in items))
+
+    def remove(self, start: int, seq: int) -> None:
+        position = bisect_left(self.keys, (start, seq))
+        del self.keys[position]
+        del self.entries[position]
+
+    def overlapping(self, start: int, end: int) -> Iterator[Tuple[int, Event]]:
+        # Bounds are inclusive: events touching at a boundary minute overlap.
+        low = bisect_left(self.keys, (start - self.max_span, -1))
+        high = bisect_left(self.keys, (end + 1, -1))
+        for entry_start, entry_end, seq, event in self.entries[low:high]:
+            if entry_end >= start and entry_start <= end:
+                yield seq, event
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class _DayPartition:
+    """All intervals of one day, plus the same intervals split by venue."""
+
+    def __init__(self):
+        self.events = _IntervalList()
+        self.venues: Dict[str, _IntervalList] = {}
+
+
+class EventIndex:
+    """
+    Date-partitioned interval index over events.
+
+    Events are grouped by day and, within a day, by venue. Overlap queries
+    locate the candidate slice with a binary search, so looking up the ``k``
+    events that overlap a time window costs O(log n + k) instead of a scan of
+    the whole catalog.
+
+    Every indexed event carries a sequence number recording the order in which
+    it was added; conflict resolution uses it to apply first-come-first-valid.
+    """
+
+    def __init__(self):
+        self._days: Dict[int, _DayPartition] = {}
+        self._positions: Dict[Event, Tuple[int, int, int, int]] = {}
+
+    def insert(self, event: Event, seq: int) -> None:
+        """
+        Add an event to the index.
+
+        Args:
+            event (Event): Event to index
+            seq (int): Arrival order of the event, lower is earlier
+        """
+        day, start, end = event.day, event.start_minute, event.end_minute
+        partition = self._days.setdefault(day, _DayPartition())
+        partition.events.insert(start, end, seq, event)
+        partition.venues.setdefault(event.venue, _IntervalList()).insert(
+            start, end, seq, event
+        )
+        self._positions[event] = (day, start, end, seq)
+
+    def insert_many(self, items: Iterable[Tuple[Event, int]]) -> None:
+        """
+        Add a batch of events to the index.
+
+        The batch is grouped by day and venue and every affected partition is
+        sorted once, instead of paying a list insertion per event.
+
+        Args:
+            items (Iterable[Tuple[Event, int]]): (event, sequence number) pairs
+        """
+        by_day: Dict[int, List[Tuple[int, int, int, Event]]] = {}
+        for event, seq in items:
+            entry = (event.start_minute, event.end_minute, seq, event)
+            by_day.setdefault(event.day, []).append(entry)
+            self._positions[event] = (
+                event.day,
+                event.start_minute,
+                event.end_minute,
+                seq,
+            )
+
+        for day, entries in by_day.items():
+            partition = self._days.setdefault(day, _DayPartition())
+            partition.events.extend(entries)
+            by_venue: Dict[str, List[Tuple[int, int, int, Event]]] = {}
+            for entry in entries:
+                by_venue.setdefault(entry[3].venue, []).append(entry)
+            for venue, venue_entries in by_venue.items():
+                partition.venues.setdefault(venue, _IntervalList()).extend(
+                    venue_entries
+                )
+
+    def remove(self, event: Event) -> None:
+        """
+        Remove an event from the index. Unknown events are ignored.
+
+        Args:
+            event (Event): Event to remove
+        """
+        position = self._positions.pop(event, None)
+        if position is None:
+            return
+        day, start, _, seq = position
+        partition = self._days[day]
+        partition.events.remove(start, seq)
+        venue_list = partition.venues[event.venue]
+        venue_list.remove(start, seq)
+        if not venue_list:
+            del partition.venues[event.venue]
+        if not partition.events:
+            del self._days[day]
+
+    def overlapping_pairs(
+        self, day: int, involving: Optional[Set[Event]] = None
+    ) -> Iterator[Tuple[Event, Event]]:
+        """
+        Yield every pair of overlapping events on one day exactly once.
+
+        The day's intervals are already sorted by start, so a single sweep that
+        keeps running events in a heap keyed on end minute finds all pairs.
+
+        With ``involving``, only pairs with at least one event from that set are
+        yielded. Those events also get a heap of their own, so the sweep costs
+        O(n log n) plus the pairs it yields, however many other overlaps the
+        day already holds.
+
+        Args:
+            day (int): Day ordinal to sweep
+            involving (Optional[Set[Event]]): Events every pair must touch
+
+        Yields:
+            Tuple[Event, Event]: (earlier start, later start) overlapping pairs
+        """
+        partition = self._days.get(day)
+        if partition is None:
+            return
+        running: List[Tuple[int, int, Event]] = []
+        running_involved: List[Tuple[int, int, Event]] = []
+        for start, end, seq, event in partition.events.entries:
+            while running and running[0][0] < start:
+                heapq.heappop(running)
+            item = (end, seq, event)
+            if involving is None or event in involving:
+                for _, _, other in running:
+                    yield other, event
+                if involving is not None:
+                    heapq.heappush(running_involved, item)
+            else:
+                while running_involved and running_involved[0][0] < start:
+                    heapq.heappop(running_involved)
+                for _, _, other in running_involved:
+                    yield other, event
+            heapq.heappush(running, item)
+
+    def sequence_of(self, event: Event) -> Optional[int]:
+        """Return the arrival sequence number of an indexed event."""
+        position = self._positions.get(event)
+        return position[3] if position is not None else None
+
+    def overlapping(
+        self, day: int, start: int, end: int, venue: Optional[str] = None
+    ) -> Iterator[Tuple[int, Event]]:
+        """
+        Iterate over indexed events overlapping a time window.
+
+        Args:
+            day (int): Day ordinal of the window
+            start (int): First minute of the window
+            end (int): Last minute of the window (inclusive)
+            venue (Optional[str]): Restrict the search to a single venue
+
+        Yields:
+            Tuple[int, Event]: (sequence number, event) in start time order
+        """
+        partition = self._days.get(day)
+        if partition is None:
+            return
+        if venue is None:
+            intervals = partition.events
+        else:
+            intervals = partition.venues.get(venue)
+            if intervals is None:
+                return
+        yield from intervals.overlapping(start, end)
+
+    def overlapping_event(
+        self, event: Event, venue: Optional[str] = None
+    ) -> Iterator[Tuple[int, Event]]:
+        """Iterate over indexed events overlapping the schedule of ``event``."""
+        return self.overlapping(event.day, event.start_minute, event.end_minute, venue)
+
+    def __contains__(self, event: object) -> bool:
+        return event in self._positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+
+class ConflictGraph:
+    """
+    Adjacency map of events whose schedules overlap.
+
+    The graph is updated as events are added and removed, so reading the
+    conflicts of one event costs O(degree) rather than a scan of the catalog.
+    """
+
+    def __init__(self):
+        self._adjacency: Dict[Event, Set[Event]] = {}
+
+    def add(self, event: Event, neighbours: Iterable[Event]) -> None:
+        """
+        Add an event and link it to the events it overlaps.
+
+        Args:
+            event (Event): Event to add
+            neighbours (Iterable[Event]): Events overlapping ``event``; the event
+                itself is ignored if present
+        """
+        links = self._adjacency.setdefault(event, set())
+        for neighbour in neighbours:
+            if neighbour is not event:
+                links.add(neighbour)
+                self._adjacency.setdefault(neighbour, set()).add(event)
+
+    def link(self, pairs: Iterable[Tuple[Event, Event]]) -> None:
+        """
+        Link pairs of events already present in the graph.
+
+        Args:
+            pairs (Iterable[Tuple[Event, Event]]): Overlapping event pairs
+        """
+        adjacency = self._adjacency
+        for first, second in pairs:
+            adjacency[first].add(second)
+            adjacency[second].add(first)
+
+    def remove(self, event: Event) -> Set[Event]:
+        """
+        Remove an event and all of its links.
+
+        Returns:
+            Set[Event]: The events that were linked to the removed event
+        """
+        links = self._adjacency.pop(event, set())
+        for neighbour in links:
+            self._adjacency[neighbour].discard(event)
+        return links
+
+    def neighbours(self, event: Event) -> Set[Event]:
+        """Return the events overlapping ``event``."""
+        return self._adjacency.get(event, set())
+
+    def __contains__(self, event: object) -> bool:
+        return event in self._adjacency
+
+
+@dataclass
+class ConflictReport:
+    """
+    Result of a conflict sweep over a collection of events.
+
+    Attributes:
+        total_events (int): Number of events analysed
+        valid_events (int): Number of events with a valid schedule
+        conflict_pairs (List[Tuple[Event, Event]]): Each overlapping pair once,
+            earlier start first
+        events_with_conflicts (List[Event]): Events involved in at least one pair
+        events_by_venue (Dict[str, List[Event]]): Events grouped by venue, in
+            date and start time order
+    """
+
+    total_events: int = 0
+    valid_events: int = 0
+    conflict_pairs: List[Tuple[Event, Event]] = field(default_factory=list)
+    events_with_conflicts: List[Event] = field(default_factory=list)
+    events_by_venue: Dict[str, List[Event]] = field(default_factory=dict)
+
+    @property
+    def invalid_events(self) -> int:
+        return self.total_events - self.valid_events
+
+
+def build_conflict_report(events: Iterable[Event]) -> ConflictReport:
+    """
+    Find every pair of overlapping events with a single sweep.
+
+    Events are sorted once by (day, start). While sweeping, the events still
+    running are kept in a heap ordered by end minute, so each event is only
+    compared with the events it actually overlaps. The cost is O(N log N + K)
+    for N events and K conflict pairs.
+
+    Args:
+        events (Iterable[Event]): Events to analyse
+
+    Returns:
+        ConflictReport: Conflict pairs, conflicting events and venue groupings
+    """
+    report = ConflictReport()
+    timeline = []
+    for position, event in enumerate(events):
+        timeline.append(
+            (event.day, event.start_minute, position, event.end_minute, event)
+        )
+        report.total_events += 1
+        if event.is_valid:
+            report.valid_events += 1
+    timeline.sort(key=lambda item: item[:3])
+
+    conflicting: Dict[Event, None] = {}
+    running: List[Tuple[int, int, int, Event]] = []
+    current_day = None
+    for day, start, position, end, event in timeline:
+        report.events_by_venue.setdefault(event.venue, []).append(event)
+        if day != current_day:
+            current_day = day
+            running.clear()
+        while running and running[0][0] < start:
+            heapq.heappop(running)
+        for _, other_start, _, other in running:
+            if end >= other_start:
+                report.conflict_pairs.append((other, event))
+                conflicting[other] = None
+                conflicting[event] = None
+        heapq.heappush(running, (end, start, position, event))
+
+    report.events_with_conflicts = list(conflicting)
+    return report
@@ -0,0 +1,439 @@
+"""
+Storage backends that persist the state of a CampusEventManagementSystem.
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from columnar import ColumnarSnapshot
+from models import Event, Registration, ServiceRequest, Student
+
+# (event_id, student_id, status value, warnings)
+RegistrationRow = Tuple[str, str, str, Tuple[str, ...]]
+# (request_id, student_id, category, status value, created_at)
+ServiceRequestRow = Tuple[str, str, str, str, datetime]
+
+
+@dataclass
+class StoredState:
+    """
+    Everything a backend holds, in the order it was written.
+
+    Attributes:
+        students (List[Tuple[str, str]]): (student_id, name) rows
+        events (List[Dict[str, Any]]): ``add_event`` keyword arguments, in
+            arrival order
+        registrations (List[RegistrationRow]): Registrations in the order they
+            were made, so waitlists are rebuilt in FIFO order
+        service_requests (List[ServiceRequestRow]): Requests in creation order
+    """
+
+    students: List[Tuple[str, str]] = field(default_factory=list)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    registrations: List[RegistrationRow] = field(default_factory=list)
+    service_requests: List[ServiceRequestRow] = field(default_factory=list)
+
+
+class StorageBackend:
+    """
+    Persistence interface used by CampusEventManagementSystem.
+
+    The system keeps all state in memory and calls these methods after every
+    change, so the backend is a write-through copy and is only read when the
+    system starts. This base class stores nothing, which is the default for a
+    purely in-memory system.
+
+    Attributes:
+        persistent (bool): Whether stored state outlives the process, so a
+            restarted system gets it back from ``load``
+    """
+
+    persistent = False
+
+    def load(self) -> StoredState:
+        """Return the stored state to rebuild a system from."""
+        return StoredState()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group the writes made inside the block into one transaction."""
+        yield
+
+    def save_students(self, students: Iterable[Student]) -> None:
+        """Insert or update students."""
+
+    def add_events(self, events: Iterable[Event]) -> None:
+        """Store new events, replacing events with the same ID and their registrations."""
+
+    def update_events(self, events: Iterable[Event]) -> None:
+        """Store the schedule and validity of existing events."""
+
+    def delete_event(self, event_id: str) -> None:
+        """Delete an event and its registrations."""
+
+    def add_registrations(self, registrations: Iterable[Registration]) -> None:
+        """Store new registrations after any stored before."""
+
+    def update_registrations(self, registrations: Iterable[Registration]) -> None:
+        """Store the status and warnings of existing registrations."""
+
+    def delete_registration(self, event_id: str, student_id: str) -> None:
+        """Delete one registration."""
+
+    def add_service_request(self, request: ServiceRequest) -> None:
+        """Store a new service request, replacing one with the same ID."""
+
+    def update_service_requests(self, requests: Iterable[ServiceRequest]) -> None:
+        """Store the status of existing service requests."""
+
+    def columnar_snapshot(self) -> Optional[ColumnarSnapshot]:
+        """
+        The latest columnar snapshot the backend wrote, or None if it has none.
+
+        The snapshot may lag behind the system, which never reads it; it is
+        meant for offline or read-only consumers whose aggregates can be stale
+        but must be cheap over large states.
+        """
+        return None
+
+    def close(self) -> None:
+        """Write anything pending and release the backend's resources."""
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    student_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    club TEXT NOT NULL,
+    date TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    venue TEXT NOT NULL,
+    max_seats INTEGER NOT NULL,
+    is_valid INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_date_venue ON events (date, venue);
+CREATE TABLE IF NOT EXISTS registrations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT NOT NULL,
+    student_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    warnings TEXT NOT NULL,
+    UNIQUE (event_id, student_id)
+);
+CREATE INDEX IF NOT EXISTS registrations_event_status
+    ON registrations (event_id, status);
+CREATE TABLE IF NOT EXISTS service_requests (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    request_id TEXT NOT NULL UNIQUE,
+    student_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS service_requests_status_category
+    ON service_requests (status, category);
+"""
+
+_UPSERT_STUDENT = (
+    "INSERT INTO students (student_id, name) VALUES (?, ?) "
+    "ON CONFLICT (student_id) DO UPDATE SET name = excluded.name"
+)
+_DELETE_EVENT = "DELETE FROM events WHERE event_id = ?"
+_DELETE_EVENT_REGISTRATIONS = "DELETE FROM registrations WHERE event_id = ?"
+_INSERT_EVENT = (
+    "INSERT INTO events (event_id, title, club, date, start_time, end_time, "
+    "venue, max_seats, is_valid) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_UPDATE_EVENT = (
+    "UPDATE events SET date = ?, start_time = ?, end_time = ?, is_valid = ? "
+    "WHERE event_id = ?"
+)
+_DELETE_REGISTRATION = "DELETE FROM registrations WHERE event_id = ? AND student_id = ?"
+_INSERT_REGISTRATION = (
+    "INSERT INTO registrations (event_id, student_id, status, warnings) "
+    "VALUES (?, ?, ?, ?)"
+)
+_UPDATE_REGISTRATION = (
+    "UPDATE registrations SET status = ?, warnings = ? "
+    "WHERE event_id = ? AND student_id = ?"
+)
+_DELETE_REQUEST = "DELETE FROM service_requests WHERE request_id = ?"
+_INSERT_REQUEST = (
+    "INSERT INTO service_requests (request_id, student_id, category, status, "
+    "created_at) VALUES (?, ?, ?, ?, ?)"
+)
+_UPDATE_REQUEST = "UPDATE service_requests SET status = ? WHERE request_id = ?"
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    SQLite backend for a CampusEventManagementSystem.
+
+    The database runs in WAL mode, so readers (such as another process
+    inspecting the file) never block the writer. Every statement is a fixed
+    SQL string with parameters, which SQLite prepares once and reuses from the
+    connection's statement cache.
+
+    Writes are queued and committed in one transaction: immediately for a
+    single change, or when a thread's outermost ``batch()`` block ends, so
+    bulk operations pay for one commit. All threads share the queue, so writes
+    are stored in the order they were made. A commit takes everything queued,
+    so another thread's write commits the part of an open batch queued before
+    it; in exchange every write is durable once its call or batch returns, and
+    the queue never holds more than the batches in progress. The queue lock is
+    never held while calling back into the system, so writes can be made while
+    the system holds its own locks.
+
+    Example:
+        storage = SQLiteStorage("campus.db")
+        system = CampusEventManagementSystem(storage=storage)
+    """
+
+    def __init__(self, path: str = "campus.db"):
+        """
+        Open or create a database.
+
+        Args:
+            path (str): Database file, or ":memory:" for a private in-memory one
+        """
+        self.path = path
+        self.persistent = path != ":memory:"
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, cached_statements=64
+        )
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._pending: List[Tuple[str, List[Tuple[Any, ...]]]] = []
+        self._lock = threading.Lock()
+        self._batch_depth = threading.local()
+
+    def load(self) -> StoredState:
+        with self._lock:
+            self._flush()
+            query = self._connection.execute
+            return StoredState(
+                students=query("SELECT student_id, name FROM students").fetchall(),
+                events=[
+                    {
+                        "event_id": row[0],
+                        "title": row[1],
+                        "club": row[2],
+                        "date": row[3],
+                        "start_time": row[4],
+                        "end_time": row[5],
+                        "venue": row[6],
+                        "max_seats": row[7],
+                    }
+                    for row in query(
+                        "SELECT event_id, title, club, date, start_time, end_time, "
+                        "venue, max_seats FROM events ORDER BY seq"
+                    )
+                ],
+                registrations=[
+                    (event_id, student_id, status, _split_warnings(warnings))
+                    for event_id, student_id, status, warnings in query(
+                        "SELECT event_id, student_id, status, warnings "
+                        "FROM registrations ORDER BY seq"
+                    )
+                ],
+                service_requests=[
+                    (
+                        request_id,
+                        student_id,
+                        category,
+                        status,
+                        datetime.fromisoformat(created_at),
+                    )
+                    for request_id, student_id, category, status, created_at in query(
+                        "SELECT request_id, student_id, category, status, created_at "
+                        "FROM service_requests ORDER BY seq"
+                    )
+                ],
+            )
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        depth = getattr(self._batch_depth, "value", 0)
+        self._batch_depth.value = depth + 1
+        try:
+            yield
+        finally:
+            self._batch_depth.value = depth
+            if depth == 0:
+                with self._lock:
+                    self._flush()
+
+    def save_students(self, students: Iterable[Student]) -> None:
+        self._write([(_UPSERT_STUDENT, [(s.student_id, s.name) for s in students])])
+
+    def add_events(self, events: Iterable[Event]) -> None:
+        events = list(events)
+        event_ids = [(event.event_id,) for event in events]
+        self._write(
+            [
+                (_DELETE_EVENT_REGISTRATIONS, event_ids),
+                (_DELETE_EVENT, event_ids),
+                (
+                    _INSERT_EVENT,
+                    [
+                        (
+                            event.event_id,
+                            event.title,
+                            event.club,
+                            event.date,
+                            event.start_time,
+                            event.end_time,
+                            event.venue,
+                            event.max_seats,
+                            event.is_valid,
+                        )
+                        for event in events
+                    ],
+                ),
+            ]
+        )
+
+    def update_events(self, events: Iterable[Event]) -> None:
+        self._write(
+            [
+                (
+                    _UPDATE_EVENT,
+                    [
+                        (
+                            event.date,
+                            event.start_time,
+                            event.end_time,
+                            event.is_valid,
+                            event.event_id,
+                        )
+                        for event in events
+                    ],
+                )
+            ]
+        )
+
+    def delete_event(self, event_id: str) -> None:
+        self._write(
+            [
+                (_DELETE_EVENT_REGISTRATIONS, [(event_id,)]),
+                (_DELETE_EVENT, [(event_id,)]),
+            ]
+        )
+
+    def add_registrations(self, registrations: Iterable[Registration]) -> None:
+        rows = [
+            (
+                registration.event.event_id,
+                registration.student.student_id,
+                registration.status.value,
+                "\n".join(registration.warnings),
+            )
+            for registration in registrations
+        ]
+        self._write(
+            [
+                (_DELETE_REGISTRATION, [row[:2] for row in rows]),
+                (_INSERT_REGISTRATION, rows),
+            ]
+        )
+
+    def update_registrations(self, registrations: Iterable[Registration]) -> None:
+        self._write(
+            [
+                (
+                    _UPDATE_REGISTRATION,
+                    [
+                        (
+                            registration.status.value,
+                            "\n".join(registration.warnings),
+                            registration.event.event_id,
+                            registration.student.student_id,
+                        )
+                        for registration in registrations
+                    ],
+                )
+            ]
+        )
+
+    def delete_registration(self, event_id: str, student_id: str) -> None:
+        self._write([(_DELETE_REGISTRATION, [(event_id, student_id)])])
+
+    def add_service_request(self, request: ServiceRequest) -> None:
+        self._write(
+            [
+                (_DELETE_REQUEST, [(request.request_id,)]),
+                (
+                    _INSERT_REQUEST,
+                    [
+                        (
+                            request.request_id,
+                            request.student.student_id,
+                            request.category,
+                            request.status.value,
+                            request.created_at.isoformat(),
+                        )
+                    ],
+                ),
+            ]
+        )
+
+    def update_service_requests(self, requests: Iterable[ServiceRequest]) -> None:
+        self._write(
+            [
+                (
+                    _UPDATE_REQUEST,
+                    [
+                        (request.status.value, request.request_id)
+                        for request in requests
+                    ],
+                )
+            ]
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._connection.close()
+
+    def _write(self, statements: List[Tuple[str, List[Tuple[Any, ...]]]]) -> None:
+        """Queue statements, committing them now unless this thread is in a batch."""
+        with self._lock:
+            for sql, rows in statements:
+                if not rows:
+                    continue
+                if self._pending and self._pending[-1][0] == sql:
+                    self._pending[-1][1].extend(rows)
+                else:
+                    self._pending.append((sql, list(rows)))
+            if not getattr(self._batch_depth, "value", 0):
+                self._flush()
+
+    def _flush(self) -> None:
+        """Commit the queued statements in one transaction. Needs ``_lock``."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        connection = self._connection
+        connection.execute("BEGIN")
+        try:
+            for sql, rows in pending:
+                connection.executemany(sql, rows)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+
+def _split_warnings(text: str) -> Tuple[str, ...]:
+    return tuple(text.split("\n")) if text else ()
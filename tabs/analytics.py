@@ -27,6 +27,7 @@ def reports_analytics():
 
         2. Venue Usage Analysis
            - Pie chart showing event distribution across venues
+           - Schedule conflict metrics and conflicting event pairs
 
         3. Service Request Status
            - Pie chart showing request status distribution
@@ -34,6 +35,10 @@ def reports_analytics():
         4. Category Distribution
            - Pie chart showing service request categories
 
+        5. Time to Resolve
+           - Mean, median and P90 resolution time per category, read from
+             the aggregates of the status history
+
     Dependencies:
         - st.session_state.system: Instance of CampusEventManagementSystem
         - plotly.express: For interactive charts
@@ -78,6 +83,31 @@ def reports_analytics():
         )
         st.plotly_chart(fig_venue)
 
+        conflict_report = st.session_state.system.get_conflict_report()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Invalid Events", conflict_report.invalid_events)
+        with col2:
+            st.metric(
+                "Events with Conflicts", len(conflict_report.events_with_conflicts)
+            )
+        with col3:
+            st.metric("Conflict Pairs", len(conflict_report.conflict_pairs))
+        if conflict_report.conflict_pairs:
+            st.dataframe(
+                pd.DataFrame(
+                    [
+                        {
+                            "Event": first.title,
+                            "Conflicts With": second.title,
+                            "Date": first.date,
+                            "Same Venue": first.venue == second.venue,
+                        }
+                        for first, second in conflict_report.conflict_pairs
+                    ]
+                )
+            )
+
     st.subheader("Service Request Analytics")
     if st.session_state.system.service_requests:
 
@@ -89,12 +119,41 @@ def reports_analytics():
         )
         st.plotly_chart(fig_status)
 
-        category_dist = {}
-        for request in st.session_state.system.service_requests.values():
-            category_dist[request.category] = category_dist.get(request.category, 0) + 1
+        category_dist = st.session_state.system.get_service_request_category_summary()
         fig_category = px.pie(
             values=list(category_dist.values()),
             names=list(category_dist.keys()),
             title="Service Requests by Category",
         )
         st.plotly_chart(fig_category)
+
+        resolution = st.session_state.system.history.resolution_summary()
+        if resolution:
+            overall = st.session_state.system.history.resolution_stats()
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Resolved Requests", overall["count"])
+            with col2:
+                st.metric("Mean Time to Resolve", f"{overall['mean_hours']:.1f} h")
+            with col3:
+                st.metric("P90 Time to Resolve", f"{overall['p90_hours']:.1f} h")
+
+            resolution_data = pd.DataFrame(
+                [
+                    {
+                        "Category": category,
+                        "Mean": stats["mean_hours"],
+                        "Median": stats["p50_hours"],
+                        "P90": stats["p90_hours"],
+                    }
+                    for category, stats in resolution.items()
+                ]
+            )
+            fig_resolution = px.bar(
+                resolution_data,
+                x="Category",
+                y=["Mean", "Median", "P90"],
+                barmode="group",
+                title="Time to Resolve by Category (hours)",
+            )
+            st.plotly_chart(fig_resolution)
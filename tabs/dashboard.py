@@ -2,8 +2,6 @@ import pandas as pd
 import plotly.express as px
 import streamlit as st
 
-from models import RegistrationStatus
-
 
 def dashboard():
     """
@@ -32,22 +30,15 @@ def dashboard():
         st.metric("Total Events", len(st.session_state.system.events))
     with col3:
         st.metric(
-            "Active Service Requests", len(st.session_state.system.service_requests)
+            "Active Service Requests",
+            st.session_state.system.count_active_service_requests(),
         )
 
     st.subheader("Event Status Overview")
     event_data = []
     for event in st.session_state.system.events.values():
-        confirmed = sum(
-            1
-            for reg in event.registrations
-            if reg.status == RegistrationStatus.CONFIRMED
-        )
-        waitlisted = sum(
-            1
-            for reg in event.registrations
-            if reg.status == RegistrationStatus.WAITLISTED
-        )
+        confirmed = event.confirmed_count
+        waitlisted = event.waitlisted_count
         event_data.append(
             {
                 "Event": event.title,
@@ -1,9 +1,10 @@
-from datetime import datetime
+from datetime import date as Date
+from datetime import time as Time
 
 import pandas as pd
 import streamlit as st
 
-from models import RegistrationStatus
+from models import Event
 
 # Constants
 TIME_FORMAT = "%I:%M %p"
@@ -24,6 +25,23 @@ def _format_conflict_message(other_event_title, conflict_details, venue):
     return f"Conflicts with {other_event_title}: " + " AND ".join(conflict_desc)
 
 
+def _build_candidate_event(event_id, title, club, date, start_time, end_time, venue):
+    """Build an unsaved event from form values, None if the schedule is invalid."""
+    try:
+        return Event(
+            event_id,
+            title,
+            club,
+            date.strftime(DATE_FORMAT),
+            start_time.strftime(TIME_FORMAT),
+            end_time.strftime(TIME_FORMAT),
+            venue,
+            1,  # seat count does not affect conflicts
+        )
+    except ValueError:
+        return None
+
+
 def _check_event_conflicts(event_id, title, club, date, start_time, end_time, venue):
     """
     Check for scheduling conflicts with existing events.
@@ -40,83 +58,38 @@ def _check_event_conflicts(event_id, title, club, date, start_time, end_time, ve
     Returns:
         List of conflict descriptions
     """
+    candidate = _build_candidate_event(
+        event_id, title, club, date, start_time, end_time, venue
+    )
+    if candidate is None:
+        return []
 
-    class TempEvent:
-        def __init__(self, event_id, title, club, date, start_time, end_time, venue):
-            self.event_id = event_id
-            self.title = title
-            self.club = club
-            self.date = date.strftime(DATE_FORMAT)
-            self.start_time = start_time.strftime(TIME_FORMAT)
-            self.end_time = end_time.strftime(TIME_FORMAT)
-            self.venue = venue
-
-        def get_conflict_details(self, other_event):
-            if hasattr(st.session_state.system, "get_event_conflict"):
-                return st.session_state.system.get_event_conflict(self, other_event)
-
-            # Minimal time and venue conflict check
-            conflict = {
-                "has_conflict": False,
-                "venue_conflict": False,
-                "time_conflict": False,
-                "conflict_period": {},
-            }
-
-            if self.venue != other_event.venue or self.date != other_event.date:
-                return conflict
-
-            conflict["venue_conflict"] = True
-            start1 = datetime.strptime(self.start_time, TIME_FORMAT)
-            end1 = datetime.strptime(self.end_time, TIME_FORMAT)
-            start2 = datetime.strptime(other_event.start_time, TIME_FORMAT)
-            end2 = datetime.strptime(other_event.end_time, TIME_FORMAT)
-            overlap = max(start1, start2) < min(end1, end2)
-
-            if overlap:
-                conflict["time_conflict"] = True
-                conflict["has_conflict"] = True
-                conflict["conflict_period"] = {
-                    "date": self.date,
-                    "start": max(start1, start2).strftime(TIME_FORMAT),
-                    "end": min(end1, end2).strftime(TIME_FORMAT),
-                }
-
-            conflict["has_conflict"] = (
-                conflict["venue_conflict"] or conflict["time_conflict"]
-            )
-            return conflict
-
-    temp_event = TempEvent(event_id, title, club, date, start_time, end_time, venue)
-    conflicts_list = []
-
-    for other_event in st.session_state.system.events.values():
-        if other_event.event_id == event_id:
-            continue
-
-        conflict_details = temp_event.get_conflict_details(other_event)
-        if conflict_details["has_conflict"]:
-            conflicts_list.append(
-                _format_conflict_message(other_event.title, conflict_details, venue)
-            )
-
-    return conflicts_list
+    result = st.session_state.system.check_conflicts(candidate)
+    return [
+        _format_conflict_message(conflict["event"].title, conflict, venue)
+        for conflict in result["conflicts"]
+    ]
 
 
 def _add_event_to_system(
     event_id, title, club, date, start_time, end_time, venue, max_seats
 ):
-    """Add an event to the system."""
-    st.session_state.system.add_event(
-        event_id=event_id,
-        title=title,
-        club=club,
-        date=date.strftime(DATE_FORMAT),
-        start_time=start_time.strftime(TIME_FORMAT),
-        end_time=end_time.strftime(TIME_FORMAT),
-        venue=venue,
-        max_seats=max_seats,
-    )
+    """Add an event to the system, reporting schedules that fail validation."""
+    try:
+        st.session_state.system.add_event(
+            event_id=event_id,
+            title=title,
+            club=club,
+            date=date.strftime(DATE_FORMAT),
+            start_time=start_time.strftime(TIME_FORMAT),
+            end_time=end_time.strftime(TIME_FORMAT),
+            venue=venue,
+            max_seats=max_seats,
+        )
+    except ValueError as error:
+        st.error(f"Invalid event schedule: {error}")
+        return
+    st.success(EVENT_ADDED_MSG)
 
 
 def _render_add_event_form():
@@ -134,6 +107,10 @@ def _render_add_event_form():
             end_time = st.time_input("End Time")
             max_seats = st.number_input("Maximum Seats", min_value=1, value=50)
 
+        _render_schedule_preview(
+            event_id, title, club, date, start_time, end_time, event_venue
+        )
+
         # Initialize session state flags
         if "conflict_warning" not in st.session_state:
             st.session_state.conflict_warning = False
@@ -148,6 +125,32 @@ def _render_add_event_form():
         )
 
 
+def _render_schedule_preview(event_id, title, club, date, start_time, end_time, venue):
+    """Show a live conflict check for the values currently in the form."""
+    if not venue:
+        return
+    candidate = _build_candidate_event(
+        event_id, title, club, date, start_time, end_time, venue
+    )
+    if candidate is None:
+        st.caption("⚠️ End time is before start time.")
+        return
+
+    result = st.session_state.system.check_conflicts(candidate)
+    if not result["conflicts"]:
+        st.caption("✅ No scheduling conflicts for this slot.")
+    elif result["is_valid"]:
+        st.caption(
+            f"⚠️ Overlaps {len(result['conflicts'])} event(s) that are already "
+            "invalid; this event would still be valid."
+        )
+    else:
+        st.caption(
+            f"⛔ Overlaps {len(result['conflicts'])} event(s); this event would be "
+            f"invalid: {result['violations'][0]}"
+        )
+
+
 def _handle_add_event_button(
     event_id, title, club, date, start_time, end_time, venue, max_seats
 ):
@@ -159,7 +162,6 @@ def _handle_add_event_button(
             _add_event_to_system(
                 event_id, title, club, date, start_time, end_time, venue, max_seats
             )
-            st.success(EVENT_ADDED_MSG)
         else:
             if all([event_id, title, club, venue]):
                 conflicts_found = _check_event_conflicts(
@@ -180,7 +182,6 @@ def _handle_add_event_button(
                         venue,
                         max_seats,
                     )
-                    st.success(EVENT_ADDED_MSG)
             else:
                 st.error(
                     "Please fill in all required fields (Event ID, Title, Club, Venue)."
@@ -206,29 +207,16 @@ def _handle_conflict_warning(
                 _add_event_to_system(
                     event_id, title, club, date, start_time, end_time, venue, max_seats
                 )
-                st.success(EVENT_ADDED_MSG)
 
 
 def _get_event_conflicts(event):
-    """Get all conflicts for a specific event."""
-    conflicts = []
-    for other_event in st.session_state.system.events.values():
-        if other_event.event_id != event.event_id:
-            conflict_details = event.get_conflict_details(other_event)
-            if conflict_details["has_conflict"]:
-                conflict_desc = []
-                if conflict_details["venue_conflict"]:
-                    conflict_desc.append(f"Venue conflict at {event.venue}")
-                if conflict_details["time_conflict"]:
-                    period = conflict_details["conflict_period"]
-                    conflict_desc.append(
-                        f"Time overlap on {period['date']} between {period['start']} and {period['end']}"
-                    )
-                conflicts.append(
-                    f"Conflicts with {other_event.title}: "
-                    + " AND ".join(conflict_desc)
-                )
-    return conflicts
+    """Get all conflicts for a specific event from the system's conflict graph."""
+    return [
+        _format_conflict_message(
+            other_event.title, event.get_conflict_details(other_event), event.venue
+        )
+        for other_event in st.session_state.system.get_event_conflicts(event.event_id)
+    ]
 
 
 def _render_events_list():
@@ -241,7 +229,6 @@ def _render_events_list():
     event_data = []
     for event in st.session_state.system.events.values():
         summary = event.get_summary()
-        conflicts = _get_event_conflicts(event)
 
         event_data.append(
             {
@@ -253,7 +240,7 @@ def _render_events_list():
                 "Available Seats": event.max_seats - summary["seats"]["confirmed"],
                 "Status": summary["status"],
                 "Conflicts": (
-                    "\\n".join(conflicts)
+                    "\\n".join(_get_event_conflicts(event))
                     if summary["status"] == "Invalid Schedule"
                     else "No conflicts"
                 ),
@@ -282,18 +269,10 @@ def _render_event_details():
     with col1:
         st.metric("Total Seats", event.max_seats)
     with col2:
-        confirmed = sum(
-            1
-            for reg in event.registrations
-            if reg.status == RegistrationStatus.CONFIRMED
-        )
+        confirmed = event.confirmed_count
         st.metric("Confirmed Registrations", confirmed)
     with col3:
-        waitlisted = sum(
-            1
-            for reg in event.registrations
-            if reg.status == RegistrationStatus.WAITLISTED
-        )
+        waitlisted = event.waitlisted_count
         st.metric("Waitlisted", waitlisted)
 
     st.markdown("##### 👥 Registered Students")
@@ -303,6 +282,7 @@ def _render_event_details():
                 "Student ID": reg.student.student_id,
                 "Student Name": reg.student.name,
                 "Registration Status": reg.status.value,
+                "Waitlist Position": event.waitlist.position(reg),
                 "Other Registrations": len(reg.student.registrations) - 1,
                 "Service Requests": len(reg.student.service_requests),
             }
@@ -312,6 +292,51 @@ def _render_event_details():
     else:
         st.info("No students registered for this event")
 
+    _render_event_schedule_actions(event)
+
+
+def _render_event_schedule_actions(event):
+    """Render controls to move or remove the selected event."""
+    with st.expander("Reschedule or Remove Event"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            new_date = st.date_input(
+                "New Date",
+                value=Date.fromordinal(event.day),
+                key=f"reschedule_date_{event.event_id}",
+            )
+        with col2:
+            new_start = st.time_input(
+                "New Start Time",
+                value=Time(*divmod(event.start_minute, 60)),
+                key=f"reschedule_start_{event.event_id}",
+            )
+        with col3:
+            new_end = st.time_input(
+                "New End Time",
+                value=Time(*divmod(event.end_minute, 60)),
+                key=f"reschedule_end_{event.event_id}",
+            )
+
+        col_a, col_b = st.columns(2)
+        with col_a:
+            if st.button("Reschedule Event"):
+                try:
+                    st.session_state.system.reschedule_event(
+                        event.event_id,
+                        new_date.strftime(DATE_FORMAT),
+                        new_start.strftime(TIME_FORMAT),
+                        new_end.strftime(TIME_FORMAT),
+                    )
+                except ValueError as error:
+                    st.error(f"Invalid event schedule: {error}")
+                else:
+                    st.success(f"Event {event.event_id} rescheduled.")
+        with col_b:
+            if st.button("Remove Event"):
+                st.session_state.system.remove_event(event.event_id)
+                st.success(f"Event {event.event_id} removed.")
+
 
 def _render_registration_form():
     """Render the student registration form."""
@@ -331,14 +356,31 @@ def _render_registration_form():
             key="registration_event",
         )
 
-    if st.button("Register"):
-        registration = st.session_state.system.register_for_event(
-            selected_student, selected_event_reg
-        )
-        if registration:
-            st.success(f"Registration successful! Status: {registration.status.value}")
-        else:
-            st.error("Registration failed!")
+    col_a, col_b = st.columns(2)
+    with col_a:
+        if st.button("Register"):
+            registration = st.session_state.system.register_for_event(
+                selected_student, selected_event_reg
+            )
+            if registration:
+                st.success(
+                    f"Registration successful! Status: {registration.status.value}"
+                )
+                for warning in registration.warnings:
+                    st.warning(f"Timetable clash: {warning}")
+            else:
+                st.error(
+                    "Registration failed! The event may clash with the student's timetable."
+                )
+    with col_b:
+        if st.button("Cancel Registration"):
+            cancelled = st.session_state.system.cancel_registration(
+                selected_student, selected_event_reg
+            )
+            if cancelled:
+                st.success("Registration cancelled.")
+            else:
+                st.error("Student is not registered for this event.")
 
 
 def manage_events():
@@ -349,7 +391,8 @@ def manage_events():
     - Create new events with conflict detection
     - List and display all current events
     - Show event details including registration status and capacity
-    - Register students for events
+    - Register students for events and cancel registrations
+    - Reschedule or remove events, revalidating the events they affect
 
     Features:
         - Automatic conflict detection for time and venue
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 import streamlit as st
 
 from models import RequestStatus
@@ -11,7 +13,10 @@ def manage_service_requests():
     - Submit new service requests
     - Track and update request status
     - Manage request lifecycle
-    - View request history
+    - Work through active requests in SLA deadline order
+    - Browse all requests page by page with filters
+    - Change the status of several requests at once
+    - Show requests arriving from a followed JSONL file as they are imported
 
     Features:
         - Service request submission form
@@ -61,38 +66,180 @@ def manage_service_requests():
                 if request:
                     st.success("Service request submitted successfully!")
 
-    st.subheader("Service Requests Management")
-    if st.session_state.system.service_requests:
-
-        for request in st.session_state.system.service_requests.values():
-            with st.container():
-                col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
-
-                with col1:
-                    st.text(
-                        f"ID: {request.request_id}\nStudent: {request.student.student_id}"
-                    )
-                with col2:
-                    st.text(
-                        f"Category: {request.category}\nCreated: {request.created_at.strftime('%Y-%m-%d %H:%M')}"
-                    )
-                with col3:
-                    current_status = request.status.value
-                    new_status = st.selectbox(
-                        "Status",
-                        options=[status.value for status in RequestStatus],
-                        key=f"status_{request.request_id}",
-                        index=[status.value for status in RequestStatus].index(
-                            current_status
-                        ),
-                    )
-                    if new_status != current_status:
-                        st.session_state.system.update_service_request_status(
-                            request.request_id, RequestStatus(new_status)
-                        )
-                with col4:
-                    status_color = {"Open": "🔴", "In-Progress": "🟡", "Resolved": "🟢"}
-                    st.markdown(f"### {status_color.get(new_status, '⚪')}")
-                st.divider()
+    follower = st.session_state.get("request_follower")
+    if follower is not None:
+        _render_follower_status(follower)
+
+    st.subheader("Work Queue")
+    system = st.session_state.system
+    if system.service_requests:
+        categories = ["All"] + list(system.get_service_request_category_summary())
+        selected_category = st.selectbox(
+            "Queue Category", categories, key="queue_category"
+        )
+        category = None if selected_category == "All" else selected_category
+
+        now = datetime.now()
+        next_request = system.triage.next_request(category)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Active Requests", system.count_active_service_requests(category))
+        with col2:
+            st.metric("Breaching SLA", len(system.triage.breaching_sla(now, category)))
+        with col3:
+            st.metric("Next Up", next_request.request_id if next_request else "-")
+
+        queue = system.triage.work_queue(limit=20, category=category)
+        if not queue:
+            st.info("No active service requests.")
+        for request in queue:
+            _render_request_row(request, "queue", system.triage.deadline(request))
+
+        st.subheader("All Requests")
+        _render_request_pages(system, categories)
     else:
         st.info("No service requests.")
+
+
+def _render_request_pages(system, categories):
+    """
+    Show the requests matching the filters one page at a time.
+
+    The filters are applied by ``query_service_requests``, and the cursors of
+    the pages visited so far are kept in the session state so "Previous" can
+    go back without re-reading earlier pages.
+    """
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        statuses = st.multiselect(
+            "Status",
+            [status.value for status in RequestStatus],
+            default=[status.value for status in RequestStatus],
+            key="page_statuses",
+        )
+    with col2:
+        selected_category = st.selectbox("Category", categories, key="page_category")
+    with col3:
+        selected_student = st.selectbox(
+            "Student", ["All"] + list(system.students), key="page_student"
+        )
+    with col4:
+        page_size = st.selectbox("Per Page", [10, 25, 50, 100], index=1)
+
+    filters = (tuple(statuses), selected_category, selected_student, page_size)
+    if st.session_state.get("request_page_filters") != filters:
+        # New filters start again from the first page
+        st.session_state.request_page_filters = filters
+        st.session_state.request_page_cursors = [None]
+    cursors = st.session_state.request_page_cursors
+
+    page = system.query_service_requests(
+        [RequestStatus(status) for status in statuses],
+        category=None if selected_category == "All" else selected_category,
+        student_id=None if selected_student == "All" else selected_student,
+        cursor=cursors[-1],
+        limit=page_size,
+    )
+    if not page.requests:
+        st.info("No service requests match the filters.")
+    else:
+        _render_bulk_update(system, page.requests)
+    for request in page.requests:
+        _render_request_row(request, "page", system.triage.deadline(request))
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("Previous", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        st.caption(f"Page {len(cursors)} · {page.total} matching requests")
+    with col3:
+        if st.button("Next", disabled=page.next_cursor is None):
+            cursors.append(page.next_cursor)
+            st.rerun()
+
+
+def _render_bulk_update(system, requests):
+    """Offer one status change for several requests of the current page."""
+    with st.form("bulk_status_update"):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            selected = st.multiselect(
+                "Requests", [request.request_id for request in requests]
+            )
+        with col2:
+            target = st.selectbox(
+                "New Status", [status.value for status in RequestStatus]
+            )
+        if st.form_submit_button("Apply to Selected"):
+            try:
+                changed = system.update_service_request_statuses(
+                    selected, RequestStatus(target)
+                )
+            except ValueError as exc:
+                st.error(str(exc))
+            else:
+                st.success(f"Updated {changed} service request(s) to {target}.")
+
+
+@st.fragment(run_every=0.5)
+def _render_follower_status(follower):
+    """
+    Show what the request file follower has imported.
+
+    Rerun every half second on its own; when new requests have arrived it
+    reruns the whole page so they appear in the queue and the list.
+    """
+    st.caption(f"Following {follower.path}: {follower.imported} requests imported")
+    if follower.last_error is not None:
+        st.warning(f"Request import failed: {follower.last_error}")
+    seen = st.session_state.get("follower_imported")
+    st.session_state.follower_imported = follower.imported
+    if seen is not None and seen != follower.imported:
+        st.rerun()
+
+
+@st.fragment
+def _render_request_row(request, key_prefix, deadline):
+    """
+    Show one request with its SLA deadline and a status selector.
+
+    Rendered as a fragment, so changing the status reruns only this row
+    instead of the whole page.
+    """
+    with st.container():
+        col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
+
+        with col1:
+            st.text(f"ID: {request.request_id}\nStudent: {request.student.student_id}")
+        with col2:
+            active = request.status != RequestStatus.RESOLVED
+            overdue = " (overdue)" if active and deadline <= datetime.now() else ""
+            st.text(
+                f"Category: {request.category}\n"
+                f"Created: {request.created_at.strftime('%Y-%m-%d %H:%M')}\n"
+                f"Due: {deadline.strftime('%Y-%m-%d %H:%M')}{overdue}"
+            )
+        with col3:
+            key = f"{key_prefix}_status_{request.request_id}"
+            # Show changes made elsewhere, e.g. by a bulk update or another row
+            st.session_state[key] = request.status.value
+            st.selectbox(
+                "Status",
+                options=[status.value for status in RequestStatus],
+                key=key,
+                on_change=_apply_status,
+                args=(request.request_id, key),
+            )
+        with col4:
+            status_color = {"Open": "🔴", "In-Progress": "🟡", "Resolved": "🟢"}
+            st.markdown(f"### {status_color.get(request.status.value, '⚪')}")
+        st.divider()
+
+
+def _apply_status(request_id, key):
+    """Save the status picked in a row's selector."""
+    st.session_state.system.update_service_request_status(
+        request_id, RequestStatus(st.session_state[key])
+    )
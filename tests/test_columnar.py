@@ -0,0 +1,130 @@
+"""
+Tests for memory-mapped columnar snapshots.
+"""
+
+import struct
+
+import pytest
+
+from columnar import ColumnarSnapshot, write_snapshot
+from main import CampusEventManagementSystem
+from models import RegistrationStatus, RequestStatus
+
+
+@pytest.fixture
+def populated():
+    system = CampusEventManagementSystem()
+    for i in range(6):
+        system.add_student(f"S{i}", f"Student {i}")
+    system.add_event(
+        "E1", "Hackathon", "Tech", "2025-12-01", "10:00 AM", "12:00 PM", "Hall A", 2
+    )
+    system.add_event(
+        "E2", "Talk", "Arts", "2025-12-01", "11:00 AM", "01:00 PM", "Hall A", 5
+    )
+    system.add_event(
+        "E0", "Quiz", "Tech", "2025-12-02", "09:00 AM", "10:00 AM", "Hall B", 3
+    )
+    system.register_many([(f"S{i}", "E1") for i in range(4)])
+    system.register_for_event("S0", "E0")
+    for i in range(3):
+        system.raise_service_request(f"R{i}", f"S{i}", "IT" if i else "Hostel")
+    system.update_service_request_status("R1", RequestStatus.RESOLVED)
+    return system
+
+
+@pytest.fixture
+def snapshot_path(populated, tmp_path):
+    path = str(tmp_path / "campus.snap")
+    write_snapshot(populated, path)
+    return path
+
+
+class TestColumnarSnapshot:
+    """Snapshots expose the system's state through mapped columns."""
+
+    def test_events_materialize_lazily(self, populated, snapshot_path):
+        """Events are built on first lookup and match the live system."""
+        with ColumnarSnapshot(snapshot_path) as snapshot:
+            assert snapshot.events.materialized == 0
+            assert list(snapshot.events) == ["E1", "E2", "E0"]
+            event = snapshot.events["E1"]
+            assert snapshot.events.materialized == 1
+            assert snapshot.events["E1"] is event
+            assert event.get_summary() == populated.events["E1"].get_summary()
+            assert [(r.student.student_id, r.status) for r in event.registrations] == [
+                (r.student.student_id, r.status)
+                for r in populated.events["E1"].registrations
+            ]
+            assert [r.student.student_id for r in event.waitlist] == ["S2", "S3"]
+            assert not snapshot.events["E2"].is_valid
+            assert "E9" not in snapshot.events
+            with pytest.raises(KeyError):
+                snapshot.events["E9"]
+
+    def test_students_and_requests(self, populated, snapshot_path):
+        """Students are looked up by ID and requests keep status and time."""
+        with ColumnarSnapshot(snapshot_path) as snapshot:
+            assert len(snapshot.students) == 6
+            assert snapshot.students["S4"].name == "Student 4"
+            request = snapshot.service_request(1)
+            assert request.request_id == "R1"
+            assert request.status == RequestStatus.RESOLVED
+            assert request.created_at == populated.service_requests["R1"].created_at
+            assert request.student is snapshot.students["S1"]
+
+    def test_students_hold_registrations_of_built_events(self, snapshot_path):
+        """Building an event attaches its registrations to their students."""
+        with ColumnarSnapshot(snapshot_path) as snapshot:
+            student = snapshot.students["S0"]
+            assert student.registrations == []
+            hackathon = snapshot.events["E1"]
+            assert [r.event for r in student.registrations] == [hackathon]
+            quiz = snapshot.events["E0"]
+            assert [r.event for r in student.registrations] == [hackathon, quiz]
+            talk = snapshot.events["E2"]
+            assert student.timetable.clashes(talk) == [hackathon]
+            # S3 is waitlisted, so the hackathon is not in its timetable
+            assert snapshot.students["S3"].timetable.clashes(talk) == []
+
+    def test_aggregates_read_columns(self, snapshot_path):
+        """Aggregates are computed without materializing any object."""
+        with ColumnarSnapshot(snapshot_path) as snapshot:
+            assert snapshot.seat_totals() == {
+                "max": 10,
+                "confirmed": 3,
+                "waitlisted": 2,
+            }
+            assert snapshot.events_per_venue() == {"Hall A": 2, "Hall B": 1}
+            assert snapshot.request_status_counts() == {
+                RequestStatus.OPEN: 2,
+                RequestStatus.IN_PROGRESS: 0,
+                RequestStatus.RESOLVED: 1,
+            }
+            assert snapshot.request_category_counts() == {"Hostel": 1, "IT": 2}
+            statuses = snapshot.registration_columns["status"]
+            assert (
+                statuses.tolist().count(
+                    list(RegistrationStatus).index(RegistrationStatus.CONFIRMED)
+                )
+                == 3
+            )
+            assert snapshot.events.materialized == 0
+            assert snapshot.students.materialized == 0
+
+    def test_rejects_other_files(self, tmp_path, snapshot_path):
+        """Files that are not snapshots of this version are refused."""
+        other = tmp_path / "other.bin"
+        other.write_bytes(b"not a snapshot at all, just some bytes")
+        with pytest.raises(ValueError):
+            ColumnarSnapshot(str(other))
+
+        data = bytearray(open(snapshot_path, "rb").read())
+        struct.pack_into("<H", data, 4, 99)
+        other.write_bytes(bytes(data))
+        with pytest.raises(ValueError, match="version"):
+            ColumnarSnapshot(str(other))
+
+        other.write_bytes(open(snapshot_path, "rb").read()[:100])
+        with pytest.raises(ValueError, match="truncated"):
+            ColumnarSnapshot(str(other))
@@ -0,0 +1,235 @@
+"""
+Tests for sharing one system between threads.
+"""
+
+import sys
+import threading
+
+import pytest
+
+from main import CampusEventManagementSystem
+from models import ClashPolicy, RegistrationStatus, RequestStatus
+from storage import SQLiteStorage
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    """Switch threads as often as possible so races show up quickly."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _run_threads(count, target):
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def worker(index):
+        barrier.wait()
+        try:
+            target(index)
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+class TestConcurrentRegistration:
+    """Registrations from many threads into shared events."""
+
+    def test_seats_are_never_oversold(self, system):
+        """Many threads registering into the same events never exceed max_seats."""
+        events = [
+            system.add_event(
+                f"E{i:02d}",
+                "Hackathon",
+                "Tech Club",
+                f"2025-12-{i + 1:02d}",
+                "10:00 AM",
+                "12:00 PM",
+                "Main Hall",
+                25,
+            )
+            for i in range(20)
+        ]
+        for i in range(400):
+            system.add_student(f"S{i:03d}")
+
+        def register(index):
+            for event in events:
+                for i in range(index, 400, 16):
+                    system.register_for_event(f"S{i:03d}", event.event_id)
+                    assert event.confirmed_count <= event.max_seats
+
+        _run_threads(16, register)
+
+        for event in events:
+            statuses = [registration.status for registration in event.registrations]
+            assert len(statuses) == 400
+            assert event.confirmed_count == 25
+            assert statuses.count(RegistrationStatus.CONFIRMED) == 25
+            assert event.waitlisted_count == 375
+            assert len(event.waitlist) == 375
+
+    def test_cancellations_keep_counters_consistent(self, system):
+        """Concurrent registrations and cancellations leave consistent counters."""
+        event = system.add_event(
+            "E001",
+            "Hackathon",
+            "Tech Club",
+            "2025-12-01",
+            "10:00 AM",
+            "12:00 PM",
+            "Main Hall",
+            10,
+        )
+        for i in range(200):
+            system.add_student(f"S{i:03d}")
+
+        def churn(index):
+            for i in range(index, 200, 8):
+                system.register_for_event(f"S{i:03d}", "E001")
+            for i in range(index, 200, 16):
+                system.cancel_registration(f"S{i:03d}", "E001")
+
+        _run_threads(8, churn)
+
+        statuses = [registration.status for registration in event.registrations]
+        assert event.confirmed_count == statuses.count(RegistrationStatus.CONFIRMED)
+        assert event.confirmed_count == min(event.max_seats, len(statuses))
+        assert event.waitlisted_count == len(event.waitlist)
+
+    def test_allocation_racing_direct_registrations(self, system):
+        """A lottery window and direct registrations never oversell together."""
+        events = [
+            system.add_event(
+                f"E{i:02d}",
+                "Hackathon",
+                "Tech Club",
+                f"2025-12-{i + 1:02d}",
+                "10:00 AM",
+                "12:00 PM",
+                "Main Hall",
+                10,
+            )
+            for i in range(10)
+        ]
+        for i in range(200):
+            system.add_student(f"S{i:03d}")
+        intents = [
+            (f"S{i:03d}", event.event_id) for event in events for i in range(100)
+        ]
+        outcomes = []
+
+        def race(index):
+            if index == 0:
+                outcomes.extend(system.allocate_seats(intents, seed=index))
+                return
+            for event in events:
+                for i in range(index - 1, 200, 7):
+                    system.register_for_event(f"S{i:03d}", event.event_id)
+
+        _run_threads(8, race)
+
+        for event in events:
+            statuses = [registration.status for registration in event.registrations]
+            assert event.confirmed_count == 10
+            assert statuses.count(RegistrationStatus.CONFIRMED) == 10
+            assert event.waitlisted_count == len(event.waitlist)
+        for (student_id, event_id), outcome in zip(intents, outcomes):
+            assert system.events[event_id].get_registration(student_id) is outcome
+
+    def test_registrations_racing_removals(self, tmp_path):
+        """A registration never outlives an event removed at the same time."""
+        db_path = str(tmp_path / "campus.db")
+        system = CampusEventManagementSystem(storage=SQLiteStorage(db_path))
+        events = [
+            system.add_event(
+                f"E{i:02d}",
+                "Hackathon",
+                "Tech Club",
+                f"2025-12-{i % 28 + 1:02d}",
+                "10:00 AM",
+                "12:00 PM",
+                f"Room {i}",
+                20,
+            )
+            for i in range(40)
+        ]
+        for i in range(60):
+            system.add_student(f"S{i:03d}")
+
+        def race(index):
+            if index == 0:
+                for event in reversed(events):
+                    system.remove_event(event.event_id)
+                return
+            for event in events:
+                for i in range(index - 1, 60, 7):
+                    system.register_for_event(f"S{i:03d}", event.event_id)
+
+        _run_threads(8, race)
+
+        assert system.events == {}
+        for student in system.students.values():
+            assert student.registrations == []
+            assert len(student.timetable) == 0
+        system.storage.close()
+        storage = SQLiteStorage(db_path)
+        assert storage.load().registrations == []
+        storage.close()
+
+    def test_one_student_cannot_double_book(self):
+        """Under REJECT, racing registrations of one student cannot both confirm."""
+        system = CampusEventManagementSystem(ClashPolicy.REJECT)
+        for i in range(8):
+            system.add_event(
+                f"E{i}",
+                "Talk",
+                "Club",
+                "2025-12-01",
+                "10:00 AM",
+                "11:00 AM",
+                f"Room {i}",
+                5,
+            )
+        student = system.add_student("S001")
+
+        _run_threads(8, lambda index: system.register_for_event("S001", f"E{index}"))
+
+        assert len(student.registrations) == 1
+        assert len(student.timetable) == 1
+
+    def test_concurrent_add_student_shares_object(self, system):
+        """Students added concurrently under one ID resolve to one object."""
+        seen = []
+        _run_threads(8, lambda index: seen.append(system.add_student("S001")))
+        assert all(student is system.students["S001"] for student in seen)
+
+
+class TestConcurrentServiceRequests:
+    """Service requests are guarded by their own lock."""
+
+    def test_requests_and_lock_free_summary(self, system):
+        """Summaries can be read while other threads raise and update requests."""
+        for i in range(8):
+            system.add_student(f"S{i}")
+
+        def work(index):
+            for i in range(100):
+                request_id = f"R{index}-{i}"
+                system.raise_service_request(request_id, f"S{index}", "IT")
+                system.update_service_request_status(request_id, RequestStatus.RESOLVED)
+                system.get_service_request_summary()
+
+        _run_threads(8, work)
+
+        summary = system.get_service_request_summary()
+        assert summary[RequestStatus.RESOLVED.value] == 800
+        assert sum(len(s.service_requests) for s in system.students.values()) == 800
@@ -0,0 +1,158 @@
+"""
+Tests for following an append-only JSONL file of service requests.
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from follower import JsonlFollower
+from main import CampusEventManagementSystem
+from storage import SQLiteStorage
+
+
+@pytest.fixture
+def system():
+    system = CampusEventManagementSystem()
+    for i in range(3):
+        system.add_student(f"S{i}")
+    return system
+
+
+@pytest.fixture
+def feed(tmp_path):
+    return tmp_path / "tickets.jsonl"
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    return str(tmp_path / "tickets.checkpoint")
+
+
+def _append(path, *request_ids, student_id="S0"):
+    with open(path, "a", encoding="utf-8") as file:
+        for request_id in request_ids:
+            record = {
+                "request_id": request_id,
+                "student_id": student_id,
+                "category": "IT",
+            }
+            file.write(json.dumps(record) + "\n")
+
+
+class TestJsonlFollower:
+    """New lines are imported once, across restarts and rotations."""
+
+    def test_imports_only_new_lines(self, system, feed, checkpoint):
+        """Each poll picks up the lines appended since the last one."""
+        _append(feed, "R1", "R2")
+        follower = JsonlFollower(system, str(feed), checkpoint)
+
+        assert follower.poll().imported == 2
+        assert follower.poll().records == 0
+        _append(feed, "R3")
+        assert follower.poll().imported == 1
+        assert sorted(system.service_requests) == ["R1", "R2", "R3"]
+        assert follower.offset == os.path.getsize(feed)
+        follower.stop()
+
+    def test_partial_line_waits(self, system, feed, checkpoint):
+        """A line without its newline yet is read once it is complete."""
+        _append(feed, "R1")
+        line = json.dumps({"request_id": "R2", "student_id": "S1", "category": "IT"})
+        with open(feed, "a", encoding="utf-8") as file:
+            file.write(line[:10])
+        follower = JsonlFollower(system, str(feed), checkpoint)
+        assert follower.poll().imported == 1
+
+        with open(feed, "a", encoding="utf-8") as file:
+            file.write(line[10:] + "\n")
+        assert follower.poll().imported == 1
+        assert "R2" in system.service_requests
+        follower.stop()
+
+    def test_resumes_from_checkpoint(self, tmp_path, feed, checkpoint):
+        """A restarted follower skips the lines it already imported."""
+        db_path = str(tmp_path / "campus.db")
+        first = CampusEventManagementSystem(storage=SQLiteStorage(db_path))
+        first.add_student("S0")
+        _append(feed, "R1", "R2")
+        follower = JsonlFollower(first, str(feed), checkpoint)
+        follower.poll()
+        follower.stop()
+        first.storage.close()
+
+        _append(feed, "R3")
+        second = CampusEventManagementSystem(storage=SQLiteStorage(db_path))
+        follower = JsonlFollower(second, str(feed), checkpoint)
+        report = follower.poll()
+        assert (report.records, report.imported) == (1, 1)
+        assert list(second.service_requests) == ["R1", "R2", "R3"]
+        follower.stop()
+        second.storage.close()
+
+    def test_in_memory_restart_reads_everything(self, feed, checkpoint):
+        """Without persistent storage a restart imports the whole file again."""
+        first = CampusEventManagementSystem()
+        first.add_student("S0")
+        _append(feed, "R1", "R2", "R3")
+        follower = JsonlFollower(first, str(feed), checkpoint)
+        assert follower.poll().imported == 3
+        follower.stop()
+
+        second = CampusEventManagementSystem()
+        second.add_student("S0")
+        follower = JsonlFollower(second, str(feed), checkpoint)
+        assert follower.poll().imported == 3
+        assert list(second.service_requests) == ["R1", "R2", "R3"]
+        follower.stop()
+
+    def test_rotation(self, system, feed, checkpoint):
+        """The rotated file is drained before the new one is read from the start."""
+        _append(feed, "R1")
+        follower = JsonlFollower(system, str(feed), checkpoint)
+        follower.poll()
+
+        _append(feed, "R2")
+        os.rename(feed, str(feed) + ".1")
+        _append(feed, "R3")
+        report = follower.poll()
+        assert report.imported == 2
+        assert sorted(system.service_requests) == ["R1", "R2", "R3"]
+        with open(checkpoint, encoding="utf-8") as file:
+            assert json.load(file)["inode"] == os.stat(feed).st_ino
+        follower.stop()
+
+    def test_truncation_and_errors(self, system, feed, checkpoint):
+        """A truncated file is reread; bad lines are numbered within the file."""
+        _append(feed, "R1", "R2")
+        follower = JsonlFollower(system, str(feed), checkpoint)
+        follower.poll()
+
+        feed.write_text("")
+        assert follower.poll().records == 0
+        assert follower.offset == 0
+        _append(feed, "R3")
+        with open(feed, "a", encoding="utf-8") as file:
+            file.write("{broken\n")
+        _append(feed, "R4", student_id="S9")
+        report = follower.poll()
+        assert report.imported == 1
+        assert [error.line for error in report.errors] == [2, 3]
+        assert report.errors[1].message == "Unknown student S9"
+        follower.stop()
+
+    def test_background_thread_latency(self, system, feed, checkpoint):
+        """A running follower makes an appended request visible within a second."""
+        follower = JsonlFollower(system, str(feed), checkpoint, poll_interval=0.05)
+        follower.start()
+        try:
+            _append(feed, "R1")
+            deadline = time.monotonic() + 1
+            while "R1" not in system.service_requests:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+        finally:
+            follower.stop()
@@ -0,0 +1,151 @@
+"""
+Tests for the service request status history.
+"""
+
+import math
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from history import TransitionLog
+from main import CampusEventManagementSystem
+from models import RequestStatus
+from storage import SQLiteStorage
+
+CATEGORIES = ["IT Support", "Hostel", "Transport"]
+
+
+def _nearest_rank(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(len(ordered) * fraction)) - 1]
+
+
+class TestTransitionLog:
+    """Transitions are logged compactly and aggregated as they arrive."""
+
+    def test_resolution_stats_match_brute_force(self):
+        """Mean and percentiles agree with a recomputation from the timeline."""
+        rng = random.Random(3)
+        log = TransitionLog(chunk_size=16)
+        start = datetime(2025, 1, 1)
+        expected = {category: [] for category in CATEGORIES}
+        for i in range(200):
+            category = rng.choice(CATEGORIES)
+            created = start + timedelta(minutes=rng.randrange(5000))
+            log.record(f"R{i}", category, None, RequestStatus.OPEN, created)
+            resolved = created + timedelta(minutes=rng.randrange(1, 3000))
+            log.record(
+                f"R{i}",
+                category,
+                RequestStatus.OPEN,
+                RequestStatus.IN_PROGRESS,
+                created + (resolved - created) / 2,
+            )
+            log.record(
+                f"R{i}",
+                category,
+                RequestStatus.IN_PROGRESS,
+                RequestStatus.RESOLVED,
+                resolved,
+            )
+            expected[category].append((resolved - created).total_seconds() / 3600)
+
+        assert len(log) == 600
+        summary = log.resolution_summary()
+        for category, hours in expected.items():
+            stats = summary[category]
+            assert stats["count"] == len(hours)
+            assert stats["mean_hours"] == pytest.approx(sum(hours) / len(hours))
+            assert stats["p50_hours"] == pytest.approx(_nearest_rank(hours, 0.5))
+            assert stats["p90_hours"] == pytest.approx(_nearest_rank(hours, 0.9))
+        assert log.resolution_stats()["count"] == 200
+        assert log.resolution_stats("Unknown")["count"] == 0
+
+    def test_reopen_restarts_the_clock(self):
+        """A reopened request is timed from the reopening, not its creation."""
+        log = TransitionLog()
+        start = datetime(2025, 1, 1)
+        log.record("R1", "Hostel", None, RequestStatus.OPEN, start)
+        log.record(
+            "R1",
+            "Hostel",
+            RequestStatus.OPEN,
+            RequestStatus.RESOLVED,
+            start + timedelta(hours=2),
+        )
+        log.record(
+            "R1",
+            "Hostel",
+            RequestStatus.RESOLVED,
+            RequestStatus.OPEN,
+            start + timedelta(hours=10),
+        )
+        log.record(
+            "R1",
+            "Hostel",
+            RequestStatus.OPEN,
+            RequestStatus.RESOLVED,
+            start + timedelta(hours=14),
+        )
+
+        stats = log.resolution_stats("Hostel")
+        assert stats["count"] == 2
+        assert stats["mean_hours"] == pytest.approx(3.0)
+
+    def test_transitions_round_trip_across_chunks(self):
+        """Transitions read back in order across chunk boundaries."""
+        log = TransitionLog(chunk_size=4)
+        at = datetime(2025, 1, 1, 9, 30)
+        recorded = []
+        for i in range(10):
+            old = None if i % 2 == 0 else RequestStatus.OPEN
+            new = RequestStatus.OPEN if i % 2 == 0 else RequestStatus.IN_PROGRESS
+            log.record(f"R{i // 2}", "Other", old, new, at)
+            recorded.append((f"R{i // 2}", old, new, at))
+
+        assert len(log._chunks) == 3
+        assert list(log.transitions()) == recorded
+        assert list(log.transitions("R2")) == recorded[4:6]
+        assert list(log.transitions("missing")) == []
+
+    def test_system_logs_every_transition(self, system):
+        """Creation, single, bulk and direct status changes are all logged."""
+        system.add_student("S01")
+        for i in range(3):
+            system.raise_service_request(f"R{i}", "S01", "Hostel")
+        system.update_service_request_status("R0", RequestStatus.IN_PROGRESS)
+        system.update_service_request_statuses(["R0", "R1"], RequestStatus.RESOLVED)
+        system.service_requests["R2"].status = RequestStatus.RESOLVED
+
+        assert [(old, new) for _, old, new, _ in system.history.transitions("R0")] == [
+            (None, RequestStatus.OPEN),
+            (RequestStatus.OPEN, RequestStatus.IN_PROGRESS),
+            (RequestStatus.IN_PROGRESS, RequestStatus.RESOLVED),
+        ]
+        assert len(system.history) == 7
+        assert system.history.resolution_stats("Hostel")["count"] == 3
+
+    def test_history_starts_at_restart(self, tmp_path):
+        """Restored requests are not logged; changes after start-up are."""
+        db_path = str(tmp_path / "campus.db")
+        system = CampusEventManagementSystem(storage=SQLiteStorage(db_path))
+        system.add_student("S01")
+        for i in range(2):
+            system.raise_service_request(f"R{i}", "S01", "Hostel")
+        system.update_service_request_status("R0", RequestStatus.RESOLVED)
+        system.storage.close()
+
+        reopened = CampusEventManagementSystem(storage=SQLiteStorage(db_path))
+        assert len(reopened.history) == 0
+        assert reopened.history.resolution_stats()["count"] == 0
+        reopened.update_service_request_status("R1", RequestStatus.RESOLVED)
+        assert [(old, new) for _, old, new, _ in reopened.history.transitions()] == [
+            (RequestStatus.OPEN, RequestStatus.RESOLVED)
+        ]
+        # R1 was opened before start-up, so its resolution time is unknown
+        assert reopened.history.resolution_stats()["count"] == 0
+        reopened.raise_service_request("R2", "S01", "Hostel")
+        reopened.update_service_request_status("R2", RequestStatus.RESOLVED)
+        assert reopened.history.resolution_stats("Hostel")["count"] == 1
+        reopened.storage.close()
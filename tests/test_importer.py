@@ -0,0 +1,151 @@
+"""
+Tests for the streaming importer.
+"""
+
+import json
+
+import pytest
+
+from importer import ImportKind, ImportReport, import_file, import_lines, read_jsonl
+from main import CampusEventManagementSystem
+from models import RegistrationStatus
+
+EVENTS_CSV = """event_id,title,club,date,start_time,end_time,venue,max_seats
+E1,Hackathon,Tech,2025-12-01,10:00 AM,12:00 PM,Hall A,1
+E2,Talk,Arts,2025-12-01,01:00 PM,02:00 PM,Hall B,10
+E1,Hackathon again,Tech,2025-12-02,10:00 AM,12:00 PM,Hall A,5
+E3,Backwards,Tech,2025-12-01,02:00 PM,01:00 PM,Hall C,5
+E4,Bad date,Tech,2025-13-01,10:00 AM,11:00 AM,Hall C,5
+E5,No seats,Tech,2025-12-03,10:00 AM,11:00 AM,Hall C,none
+E6,Too many,Tech,2025-12-03,10:00 AM,11:00 AM,Hall C,5,extra
+E7,Huge,Tech,2025-12-04,10:00 AM,11:00 AM,Hall C,4294967296
+"""
+
+
+@pytest.fixture
+def system():
+    system = CampusEventManagementSystem()
+    for i in range(3):
+        system.add_student(f"S{i}", f"Student {i}")
+    return system
+
+
+def _jsonl(*records):
+    return [json.dumps(record) + "\n" for record in records]
+
+
+class TestImporter:
+    """Records are validated, deduplicated and applied in chunks."""
+
+    def test_events_csv(self, system, tmp_path):
+        """Valid events are added and each bad row is reported by line."""
+        path = tmp_path / "events.csv"
+        path.write_text(EVENTS_CSV)
+
+        report = import_file(system, str(path), ImportKind.EVENTS, chunk_size=2)
+
+        assert sorted(system.events) == ["E1", "E2"]
+        assert system.events["E1"].title == "Hackathon"
+        assert system.events["E1"].max_seats == 1
+        assert (report.records, report.imported, report.duplicates) == (8, 2, 1)
+        assert [error.line for error in report.errors] == [5, 6, 7, 8, 9]
+        assert "before start time" in report.errors[0].message
+        assert "max_seats" in report.errors[2].message
+        assert "at most" in report.errors[4].message
+
+    def test_students_jsonl_deduplicated(self, system):
+        """Students already known or repeated in the input are skipped."""
+        lines = _jsonl(
+            {"student_id": "S0", "name": "Existing"},
+            {"student_id": "S9", "name": "New"},
+            {"student_id": "S9", "name": "Repeat"},
+            {"name": "No ID"},
+        )
+        report = import_lines(system, lines, ImportKind.STUDENTS, "jsonl")
+
+        assert system.students["S0"].name == "Student 0"
+        assert system.students["S9"].name == "New"
+        assert (report.imported, report.duplicates, report.error_count) == (1, 2, 1)
+        assert report.errors[0].line == 4
+
+    def test_registrations(self, system):
+        """Registrations go through register_many and unknown IDs are errors."""
+        system.add_event(
+            "E1", "Hackathon", "Tech", "2025-12-01", "10:00 AM", "12:00 PM", "A", 1
+        )
+        lines = ["student_id,event_id\n"] + [
+            f"{student},{event}\n"
+            for student, event in [
+                ("S0", "E1"),
+                ("S1", "E1"),
+                ("S0", "E1"),
+                ("S7", "E1"),
+                ("S2", "E9"),
+            ]
+        ]
+        report = import_lines(system, lines, ImportKind.REGISTRATIONS, "csv")
+
+        registrations = system.events["E1"].registrations
+        assert [r.status for r in registrations] == [
+            RegistrationStatus.CONFIRMED,
+            RegistrationStatus.WAITLISTED,
+        ]
+        assert (report.imported, report.duplicates) == (2, 1)
+        assert [(e.line, e.message) for e in report.errors] == [
+            (5, "Unknown student S7"),
+            (6, "Unknown event E9"),
+        ]
+
+    def test_service_requests_and_bad_json(self, system):
+        """Malformed lines are reported without stopping the import."""
+        lines = (
+            _jsonl({"request_id": "R1", "student_id": "S0", "category": "IT"})
+            + ["{not json\n", "\n", "[1, 2]\n"]
+            + _jsonl(
+                {"request_id": "R2", "student_id": "S8", "category": "IT"},
+                {"request_id": "R1", "student_id": "S1", "category": "IT"},
+                {"request_id": "R3", "student_id": "S1", "category": "Hostel"},
+            )
+        )
+        report = import_lines(
+            system, lines, ImportKind.SERVICE_REQUESTS, "jsonl", chunk_size=3
+        )
+
+        assert sorted(system.service_requests) == ["R1", "R3"]
+        assert system.service_requests["R1"].student.student_id == "S0"
+        assert (report.records, report.imported, report.duplicates) == (6, 2, 1)
+        assert [error.line for error in report.errors] == [2, 4, 5]
+
+    def test_error_list_is_bounded(self, system):
+        """Only max_errors rejected records are kept, all are counted."""
+        lines = _jsonl(*({"name": "No ID"} for _ in range(50)))
+        report = import_lines(system, lines, ImportKind.STUDENTS, "jsonl", max_errors=5)
+        assert len(report.errors) == 5
+        assert report.error_count == 50
+
+    def test_jsonl_keeps_line_numbers(self):
+        """Every record is yielded with its own line number."""
+        lines = _jsonl(*({"n": i} for i in range(10)))
+        lines.insert(3, "\n")
+        report = ImportReport(ImportKind.STUDENTS)
+        records = list(read_jsonl(lines, report))
+        assert [record["n"] for _, record in records] == list(range(10))
+        assert [line for line, _ in records] == [1, 2, 3] + list(range(5, 12))
+
+    def test_jsonl_lines_hold_one_object(self):
+        """Lines that only form objects when joined together are rejected."""
+        lines = [
+            '{"student_id":"S1"},{"student_id":[1\n',
+            "2]}\n",
+            '{"student_id":"S2"} {"student_id":"S3"}\n',
+            '{"student_id":"S4"}\n',
+        ]
+        report = ImportReport(ImportKind.STUDENTS)
+        records = list(read_jsonl(lines, report))
+        assert records == [(4, {"student_id": "S4"})]
+        assert [error.line for error in report.errors] == [1, 2, 3]
+        assert all("Invalid JSON" in error.message for error in report.errors)
+
+    def test_unknown_format(self, system):
+        with pytest.raises(ValueError):
+            import_lines(system, [], ImportKind.STUDENTS, "xml")
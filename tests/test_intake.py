@@ -0,0 +1,95 @@
+"""
+Tests for the asyncio registration intake.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from intake import RegistrationIntake, simulate_burst
+from main import CampusEventManagementSystem
+from models import RegistrationStatus
+
+
+def _setup(system, events=5, students=500, max_seats=50):
+    for i in range(events):
+        system.add_event(
+            f"E{i}",
+            "Headline Talk",
+            "Tech Club",
+            f"2025-12-{i + 1:02d}",
+            "10:00 AM",
+            "12:00 PM",
+            "Main Hall",
+            max_seats,
+        )
+    for i in range(students):
+        system.add_student(f"S{i:03d}")
+
+
+class TestRegistrationIntake:
+    """Queued registrations resolve with the same outcomes as direct calls."""
+
+    def test_matches_sequential_order(self, system):
+        """Per-event arrival order decides who gets a seat."""
+        rng = random.Random(3)
+        pairs = [
+            (f"S{rng.randrange(500):03d}", f"E{rng.randrange(5)}") for _ in range(3000)
+        ]
+        reference = CampusEventManagementSystem()
+        _setup(system)
+        _setup(reference)
+        expected = [reference.register_for_event(s, e) for s, e in pairs]
+
+        async def run():
+            async with RegistrationIntake(system, max_queue_size=64) as intake:
+                return await asyncio.gather(*(intake.register(s, e) for s, e in pairs))
+
+        outcomes = asyncio.run(run())
+        for got, want in zip(outcomes, expected):
+            assert got.student.student_id == want.student.student_id
+            assert got.status == want.status
+        for event_id, event in system.events.items():
+            assert event.confirmed_count == reference.events[event_id].confirmed_count
+
+    def test_unknown_event_resolves_none(self, system):
+        """Commands for unknown events are answered without queueing."""
+        _setup(system, events=1, students=1)
+
+        async def run():
+            async with RegistrationIntake(system) as intake:
+                missing = await intake.register("S000", "E999")
+                return missing, intake.register_nowait("S000", "E999").result()
+
+        assert asyncio.run(run()) == (None, None)
+
+    def test_backpressure_when_queue_is_full(self, system):
+        """register_nowait refuses commands once an event's queue is full."""
+        _setup(system, events=1, students=10)
+
+        async def run():
+            intake = RegistrationIntake(system, max_queue_size=3)
+            futures = [intake.register_nowait(f"S{i:03d}", "E0") for i in range(3)]
+            with pytest.raises(asyncio.QueueFull):
+                intake.register_nowait("S003", "E0")
+            assert intake.pending("E0") == 3
+            await intake.close()
+            return [future.result().status for future in futures]
+
+        assert asyncio.run(run()) == [RegistrationStatus.CONFIRMED] * 3
+
+    def test_simulated_burst_reports_latency(self, system):
+        """A burst far larger than the queues completes and reports percentiles."""
+        _setup(system)
+        rng = random.Random(9)
+        pairs = [
+            (f"S{rng.randrange(500):03d}", f"E{rng.randrange(2)}") for _ in range(5000)
+        ]
+
+        stats = asyncio.run(simulate_burst(system, pairs, max_queue_size=100))
+
+        assert stats["count"] == len(pairs)
+        assert 0 < stats["p50_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+        assert stats["throughput"] > 0
+        assert system.events["E0"].confirmed_count == 50
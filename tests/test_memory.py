@@ -0,0 +1,119 @@
+"""
+Tests for the memory footprint of the model layer.
+"""
+
+import gc
+import random
+import tracemalloc
+
+import pytest
+
+from models import (
+    Event,
+    Registration,
+    RegistrationStatus,
+    RequestStatus,
+    ServiceRequest,
+    Student,
+)
+
+
+def _event(event_id="E001", venue="Main Hall", club="Tech Club"):
+    return Event(
+        event_id,
+        "Workshop",
+        club,
+        "2025-12-01",
+        "10:00 AM",
+        "12:00 PM",
+        venue,
+        10,
+    )
+
+
+class TestCompactModels:
+    """Slotted models keep the attribute API."""
+
+    def test_models_have_no_instance_dict(self):
+        """Model instances store attributes in slots only."""
+        student = Student("S001", "Alice")
+        event = _event()
+        instances = [
+            student,
+            event,
+            student.timetable,
+            event.waitlist,
+            Registration(student, event),
+            ServiceRequest("R001", student, "IT"),
+        ]
+        for instance in instances:
+            assert not hasattr(instance, "__dict__")
+        with pytest.raises(AttributeError):
+            event.unknown_attribute = 1
+
+    def test_repeated_strings_are_shared(self):
+        """Venue, club and category strings are interned."""
+        first = _event("E001", venue="Main " + "Hall", club="Tech " + "Club")
+        second = _event("E002", venue="".join(["Main", " Hall"]), club="Tech Club")
+        assert first.venue is second.venue
+        assert first.club is second.club
+
+        student = Student("S001")
+        requests = [
+            ServiceRequest(f"R{i}", student, "".join(["I", "T"])) for i in range(2)
+        ]
+        assert requests[0].category is requests[1].category
+
+    def test_statuses_round_trip(self):
+        """Statuses read back as enum members after being stored compactly."""
+        student = Student("S001")
+        registration = Registration(student, _event())
+        assert registration.status is RegistrationStatus.WAITLISTED
+        registration.status = RegistrationStatus.CONFIRMED
+        assert registration.status is RegistrationStatus.CONFIRMED
+
+        request = ServiceRequest("R001", student, "IT")
+        assert request.status is RequestStatus.OPEN
+        request.status = RequestStatus.RESOLVED
+        assert request.status is RequestStatus.RESOLVED
+
+
+class TestMemoryBenchmark:
+    """Traced allocation per registration stays small."""
+
+    @pytest.mark.slow
+    def test_bytes_per_registration(self, system):
+        """200k registrations cost well under 320 bytes each, all indexes included."""
+        system.add_events(
+            {
+                "event_id": f"E{i:04d}",
+                "title": "Workshop",
+                "club": f"Club {i % 20}",
+                "date": f"{2025 + i // 336}-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                "start_time": "10:00 AM",
+                "end_time": "11:00 AM",
+                "venue": f"Room {i % 50}",
+                "max_seats": 100,
+            }
+            for i in range(2000)
+        )
+        for i in range(50000):
+            system.add_student(f"S{i:05d}")
+        rng = random.Random(1)
+        pairs = [
+            (f"S{rng.randrange(50000):05d}", f"E{rng.randrange(2000):04d}")
+            for _ in range(200000)
+        ]
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            system.register_many(pairs)
+            gc.collect()
+            used = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+
+        count = sum(len(event.registrations) for event in system.events.values())
+        assert used / count < 320, f"{used / count:.0f} bytes per registration"
@@ -0,0 +1,507 @@
+"""
+Tests for registration bookkeeping.
+"""
+
+import random
+
+import pytest
+
+from main import CampusEventManagementSystem
+from models import (
+    ClashPolicy,
+    Event,
+    RegistrationStatus,
+    Timetable,
+    format_minute_of_day,
+)
+
+
+def _add_event(
+    system,
+    event_id="E001",
+    max_seats=3,
+    date="2025-12-01",
+    start_time="10:00 AM",
+    end_time="12:00 PM",
+):
+    return system.add_event(
+        event_id,
+        "Workshop",
+        "Tech Club",
+        date,
+        start_time,
+        end_time,
+        f"Room {event_id}",
+        max_seats,
+    )
+
+
+def _assert_counters_match(event):
+    statuses = [registration.status for registration in event.registrations]
+    assert event.confirmed_count == statuses.count(RegistrationStatus.CONFIRMED)
+    assert event.waitlisted_count == statuses.count(RegistrationStatus.WAITLISTED)
+    summary = event.get_summary()
+    assert summary["seats"]["confirmed"] == event.confirmed_count
+    assert summary["seats"]["waitlisted"] == event.waitlisted_count
+
+
+class TestRegistrationCounters:
+    """Seat counters and membership maps on events."""
+
+    def test_duplicate_registration_returns_existing(self, system):
+        """Registering twice returns the same registration object."""
+        _add_event(system)
+        system.add_student("S001")
+        first = system.register_for_event("S001", "E001")
+        second = system.register_for_event("S001", "E001")
+        assert first is second
+        assert len(system.events["E001"].registrations) == 1
+
+    def test_capacity_and_waitlist(self, system):
+        """Seats fill up in arrival order and the rest are waitlisted."""
+        event = _add_event(system, max_seats=2)
+        for i in range(4):
+            system.add_student(f"S{i}")
+            system.register_for_event(f"S{i}", "E001")
+
+        assert [r.status for r in event.registrations] == [
+            RegistrationStatus.CONFIRMED,
+            RegistrationStatus.CONFIRMED,
+            RegistrationStatus.WAITLISTED,
+            RegistrationStatus.WAITLISTED,
+        ]
+        assert event.get_registration("S3").student.student_id == "S3"
+        _assert_counters_match(event)
+
+    def test_counters_never_drift(self, system):
+        """Counters equal a recount of the registration list after random changes."""
+        rng = random.Random(8)
+        events = [_add_event(system, f"E{i}", rng.randint(1, 5)) for i in range(5)]
+        for i in range(60):
+            system.add_student(f"S{i:02d}")
+
+        for _ in range(400):
+            student_id = f"S{rng.randrange(60):02d}"
+            event = rng.choice(events)
+            if rng.random() < 0.7:
+                system.register_for_event(student_id, event.event_id)
+            elif event.registrations:
+                registration = rng.choice(event.registrations)
+                registration.status = rng.choice(list(RegistrationStatus))
+            for checked in events:
+                _assert_counters_match(checked)
+
+    @pytest.mark.slow
+    def test_popular_event_registration_is_constant_time(self, system):
+        """Registering thousands of students into one event stays fast."""
+        import time
+
+        _add_event(system, max_seats=5000)
+        for i in range(20000):
+            system.add_student(f"S{i:05d}")
+
+        start_time = time.time()
+        for i in range(20000):
+            system.register_for_event(f"S{i:05d}", "E001")
+        assert time.time() - start_time < 2.0
+        _assert_counters_match(system.events["E001"])
+
+
+class TestWaitlist:
+    """Cancellation and FIFO waitlist promotion."""
+
+    def _fill(self, system, count, max_seats=2):
+        event = _add_event(system, max_seats=max_seats)
+        for i in range(count):
+            system.add_student(f"S{i}")
+            system.register_for_event(f"S{i}", "E001")
+        return event
+
+    def test_cancel_confirmed_promotes_head(self, system):
+        """Cancelling a confirmed seat confirms the first waitlisted student."""
+        event = self._fill(system, 4)
+        cancelled = system.cancel_registration("S0", "E001")
+
+        assert cancelled.student.student_id == "S0"
+        assert event.get_registration("S0") is None
+        assert system.students["S0"].registrations == []
+        assert event.get_registration("S2").status == RegistrationStatus.CONFIRMED
+        assert system.waitlist_position("S3", "E001") == 1
+        _assert_counters_match(event)
+
+    def test_cancel_waitlisted_moves_queue_up(self, system):
+        """Leaving the waitlist shifts later students forward."""
+        event = self._fill(system, 6)
+        assert [system.waitlist_position(f"S{i}", "E001") for i in range(2, 6)] == [
+            1,
+            2,
+            3,
+            4,
+        ]
+        system.cancel_registration("S3", "E001")
+        assert system.waitlist_position("S3", "E001") is None
+        assert system.waitlist_position("S5", "E001") == 3
+        assert system.waitlist_position("S0", "E001") is None
+        _assert_counters_match(event)
+
+    def test_cancel_unknown(self, system):
+        """Cancelling something that does not exist returns None."""
+        self._fill(system, 1)
+        assert system.cancel_registration("S9", "E001") is None
+        assert system.cancel_registration("S0", "E999") is None
+
+    def test_reregistration_joins_back_of_queue(self, system):
+        """A student who cancels and registers again starts over."""
+        self._fill(system, 4)
+        system.cancel_registration("S2", "E001")
+        registration = system.register_for_event("S2", "E001")
+        assert registration.status == RegistrationStatus.WAITLISTED
+        assert system.waitlist_position("S2", "E001") == 2
+
+    @pytest.mark.slow
+    def test_long_waitlist(self, system):
+        """Cancellations and position queries stay fast with 10k+ waitlisted."""
+        import time
+
+        event = self._fill(system, 15000, max_seats=100)
+        start_time = time.time()
+        for i in range(0, 15000, 3):
+            system.cancel_registration(f"S{i}", "E001")
+            system.waitlist_position(f"S{14999 - i}", "E001")
+        assert time.time() - start_time < 2.0
+        assert event.confirmed_count == 100
+        _assert_counters_match(event)
+
+
+class TestClashPolicy:
+    """Per-student timetable checks at registration time."""
+
+    def _setup(self, policy):
+        system = CampusEventManagementSystem(policy)
+        _add_event(system, "E001")
+        _add_event(system, "E002", start_time="11:00 AM", end_time="01:00 PM")
+        _add_event(system, "E003", start_time="02:00 PM", end_time="03:00 PM")
+        system.add_student("S001")
+        system.register_for_event("S001", "E001")
+        return system
+
+    def test_allow_confirms_with_warning(self):
+        """The default policy confirms the clashing seat and records a warning."""
+        system = self._setup(ClashPolicy.ALLOW)
+        registration = system.register_for_event("S001", "E002")
+        assert registration.status == RegistrationStatus.CONFIRMED
+        assert len(registration.warnings) == 1
+        assert "E001" in registration.warnings[0]
+        assert len(system.students["S001"].timetable) == 2
+
+    def test_waitlist_holds_clashing_seat(self):
+        """A clash keeps the student on the waitlist even with free seats."""
+        system = self._setup(ClashPolicy.WAITLIST)
+        registration = system.register_for_event("S001", "E002")
+        assert registration.status == RegistrationStatus.WAITLISTED
+        assert system.waitlist_position("S001", "E002") == 1
+        assert "E002" not in [
+            event.event_id for event in system.students["S001"].timetable
+        ]
+
+    def test_reject_records_nothing(self):
+        """A rejected registration is not stored anywhere."""
+        system = self._setup(ClashPolicy.REJECT)
+        assert system.register_for_event("S001", "E002") is None
+        assert system.events["E002"].get_registration("S001") is None
+        assert len(system.students["S001"].registrations) == 1
+
+    def test_non_overlapping_and_touching(self):
+        """Disjoint events never clash; sharing a boundary minute does."""
+        system = self._setup(ClashPolicy.REJECT)
+        assert system.register_for_event("S001", "E003") is not None
+        _add_event(system, "E004", start_time="12:00 PM", end_time="12:30 PM")
+        _add_event(system, "E005", date="2025-12-02")
+        assert system.register_for_event("S001", "E004") is None
+        assert system.register_for_event("S001", "E005") is not None
+
+    def test_cancel_frees_timetable(self):
+        """Cancelling a confirmed seat removes it from the timetable."""
+        system = self._setup(ClashPolicy.REJECT)
+        system.cancel_registration("S001", "E001")
+        assert len(system.students["S001"].timetable) == 0
+        registration = system.register_for_event("S001", "E002")
+        assert registration.status == RegistrationStatus.CONFIRMED
+
+    def test_promotion_skips_clashing_entries(self):
+        """Waitlist promotion passes over students whose timetable clashes."""
+        system = self._setup(ClashPolicy.WAITLIST)
+        _add_event(system, "E010", max_seats=1, start_time="11:30 AM")
+        for student_id in ("S002", "S003"):
+            system.add_student(student_id)
+        system.register_for_event("S002", "E010")
+        system.register_for_event("S001", "E010")
+        system.register_for_event("S003", "E010")
+
+        system.cancel_registration("S002", "E010")
+        event = system.events["E010"]
+        assert event.get_registration("S003").status == RegistrationStatus.CONFIRMED
+        assert event.get_registration("S001").status == RegistrationStatus.WAITLISTED
+        assert system.waitlist_position("S001", "E010") == 1
+
+    def test_reschedule_and_remove_update_timetable(self):
+        """Timetables follow rescheduled events and drop removed ones."""
+        system = self._setup(ClashPolicy.REJECT)
+        system.reschedule_event("E001", "2025-12-03", "10:00 AM", "12:00 PM")
+        timetable = system.students["S001"].timetable
+        assert [event.day for event in timetable] == [system.events["E001"].day]
+        assert system.register_for_event("S001", "E002") is not None
+
+        system.remove_event("E002")
+        assert [event.event_id for event in timetable] == ["E001"]
+
+    def test_timetable_matches_brute_force(self):
+        """Clash queries agree with a pairwise scan of the timetable."""
+        rng = random.Random(8)
+        timetable = Timetable()
+        stored = []
+
+        def random_event(i):
+            start = rng.randrange(8 * 60, 20 * 60)
+            end = min(start + rng.choice([15, 30, 60, 180, 300]), 23 * 60)
+            return Event(
+                f"E{i}",
+                "Talk",
+                "Club",
+                f"2025-12-{rng.randint(1, 10):02d}",
+                format_minute_of_day(start),
+                format_minute_of_day(end),
+                "Hall",
+                10,
+            )
+
+        for i in range(300):
+            event = random_event(i)
+            timetable.add(event)
+            stored.append(event)
+        for event in stored[::3]:
+            timetable.remove(event)
+        stored = [event for event in stored if event in timetable]
+
+        for i in range(300, 500):
+            probe = random_event(i)
+            expected = {other for other in stored if other.has_conflict_with(probe)}
+            assert set(timetable.clashes(probe)) == expected
+
+
+class TestRegisterMany:
+    """Batch registration for registration-window openings."""
+
+    def _setup(self, system, students=300, events=20):
+        rng = random.Random(4)
+        for i in range(events):
+            _add_event(
+                system, f"E{i:02d}", rng.randint(1, 20), date=f"2025-12-{i % 5 + 1:02d}"
+            )
+        for i in range(students):
+            system.add_student(f"S{i:03d}")
+
+    @pytest.mark.parametrize("policy", list(ClashPolicy))
+    def test_matches_sequential(self, policy):
+        """Outcomes, statuses and registration order match the sequential path."""
+        rng = random.Random(12)
+        pairs = [
+            (f"S{rng.randrange(320):03d}", f"E{rng.randrange(22):02d}")
+            for _ in range(2000)
+        ]
+        sequential = CampusEventManagementSystem(policy)
+        batch = CampusEventManagementSystem(policy)
+        self._setup(sequential)
+        self._setup(batch)
+
+        expected = [sequential.register_for_event(s, e) for s, e in pairs]
+        outcomes = batch.register_many(pairs)
+
+        for got, want in zip(outcomes, expected):
+            assert (got is None) == (want is None)
+            if got is not None:
+                assert got.student.student_id == want.student.student_id
+                assert got.event.event_id == want.event.event_id
+                assert got.status == want.status
+                assert got.warnings == want.warnings
+        for student_id, student in batch.students.items():
+            assert [r.event.event_id for r in student.registrations] == [
+                r.event.event_id for r in sequential.students[student_id].registrations
+            ]
+        for event in batch.events.values():
+            _assert_counters_match(event)
+
+    def test_duplicate_pairs_share_registration(self, system):
+        """Repeated pairs in one batch resolve to the same registration."""
+        self._setup(system, students=2, events=1)
+        first, second, missing = system.register_many(
+            [("S000", "E00"), ("S000", "E00"), ("S999", "E00")]
+        )
+        assert first is second
+        assert missing is None
+
+    @pytest.mark.slow
+    def test_throughput(self, system):
+        """The batch path sustains well over a million registrations a minute."""
+        import time
+
+        for i in range(2000):
+            _add_event(system, f"E{i:04d}", 50, date=f"2025-{i % 12 + 1:02d}-01")
+        for i in range(50000):
+            system.add_student(f"S{i:05d}")
+        rng = random.Random(2)
+        pairs = [
+            (f"S{rng.randrange(50000):05d}", f"E{rng.randrange(2000):04d}")
+            for _ in range(200000)
+        ]
+
+        start_time = time.time()
+        system.register_many(pairs)
+        elapsed = time.time() - start_time
+        assert len(pairs) / elapsed * 60 > 1_000_000
+
+
+class TestAllocateSeats:
+    """Lottery allocation of a registration window."""
+
+    def _setup(self, system, students=200, events=10, max_seats=5):
+        for i in range(events):
+            _add_event(system, f"E{i:02d}", max_seats, date=f"2025-11-{i + 1:02d}")
+        for i in range(students):
+            system.add_student(f"S{i:03d}")
+
+    def _intents(self, seed=6, count=1000, students=200, events=10):
+        rng = random.Random(seed)
+        return [
+            (f"S{rng.randrange(students):03d}", f"E{rng.randrange(events):02d}")
+            for _ in range(count)
+        ]
+
+    def test_seeded_draw_is_reproducible(self):
+        """The same seed gives the same outcome; another seed usually differs."""
+        intents = self._intents()
+        statuses = []
+        for seed in (1, 1, 2):
+            system = CampusEventManagementSystem()
+            self._setup(system)
+            outcomes = system.allocate_seats(intents, seed=seed)
+            statuses.append([registration.status for registration in outcomes])
+        assert statuses[0] == statuses[1]
+        assert statuses[0] != statuses[2]
+
+    def test_seats_counters_and_waitlist(self, system):
+        """Every event fills exactly and the rest are queued."""
+        self._setup(system)
+        outcomes = system.allocate_seats(self._intents(), seed=3)
+        assert all(outcome is not None for outcome in outcomes)
+        for event in system.events.values():
+            _assert_counters_match(event)
+            assert event.confirmed_count == event.max_seats
+            assert len(event.waitlist) == event.waitlisted_count
+
+    def test_per_student_cap(self, system):
+        """No student confirms more seats than the cap within the window."""
+        self._setup(system, students=20)
+        intents = self._intents(students=20)
+        system.allocate_seats(intents, seed=4, per_student_cap=2)
+        for student in system.students.values():
+            confirmed = [
+                registration
+                for registration in student.registrations
+                if registration.status == RegistrationStatus.CONFIRMED
+            ]
+            assert len(confirmed) <= 2
+            assert len(student.timetable) == len(confirmed)
+
+    def test_weights_favour_priority_students(self, system):
+        """Heavily weighted students win most of the seats."""
+        self._setup(system, students=100, events=1, max_seats=10)
+        intents = [(f"S{i:03d}", "E00") for i in range(100)]
+        weights = {f"S{i:03d}": 1000.0 for i in range(10)}
+        outcomes = system.allocate_seats(intents, seed=5, weights=weights)
+        winners = [
+            registration.student.student_id
+            for registration in outcomes
+            if registration.status == RegistrationStatus.CONFIRMED
+        ]
+        assert len(winners) == 10
+        assert sum(student_id in weights for student_id in winners) >= 8
+
+    def test_rejects_bad_weight(self, system):
+        """Weights must be positive."""
+        self._setup(system)
+        with pytest.raises(ValueError):
+            system.allocate_seats([("S000", "E00")], weights={"S000": 0})
+
+    def test_clash_policy_within_window(self):
+        """Seats confirmed in the same window count as timetable clashes."""
+        system = CampusEventManagementSystem(ClashPolicy.REJECT)
+        _add_event(system, "E01")
+        _add_event(system, "E02", start_time="11:00 AM", end_time="01:00 PM")
+        system.add_student("S001")
+        outcomes = system.allocate_seats([("S001", "E01"), ("S001", "E02")], seed=1)
+        assert sum(outcome is None for outcome in outcomes) == 1
+        assert len(system.students["S001"].timetable) == 1
+
+    def test_existing_registrations_kept(self, system):
+        """Registrations made before the window are returned unchanged."""
+        self._setup(system, students=3, events=1, max_seats=1)
+        existing = system.register_for_event("S000", "E00")
+        outcomes = system.allocate_seats(
+            [("S000", "E00"), ("S001", "E00"), ("S002", "E00")], seed=2
+        )
+        assert outcomes[0] is existing
+        assert [outcome.status for outcome in outcomes[1:]] == [
+            RegistrationStatus.WAITLISTED
+        ] * 2
+
+    def test_cap_counts_seats_already_held(self):
+        """Seats confirmed before the window count towards the cap."""
+        for seed in range(10):
+            system = CampusEventManagementSystem()
+            self._setup(system, students=1, events=3)
+            system.register_for_event("S000", "E00")
+            system.allocate_seats(
+                [("S000", "E01"), ("S000", "E00"), ("S000", "E02")],
+                seed=seed,
+                per_student_cap=1,
+            )
+            student = system.students["S000"]
+            assert len(student.timetable) == 1
+            assert system.events["E00"].get_registration("S000").status == (
+                RegistrationStatus.CONFIRMED
+            )
+
+    @pytest.mark.slow
+    def test_large_window(self, system):
+        """500k intents across 5k events are allocated in seconds."""
+        import time
+
+        system.add_events(
+            {
+                "event_id": f"E{i:04d}",
+                "title": "Workshop",
+                "club": "Tech Club",
+                "date": f"{2025 + i // 336}-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                "start_time": "10:00 AM",
+                "end_time": "11:00 AM",
+                "venue": f"Room {i % 50}",
+                "max_seats": 50,
+            }
+            for i in range(5000)
+        )
+        for i in range(50000):
+            system.add_student(f"S{i:05d}")
+        rng = random.Random(7)
+        intents = [
+            (f"S{rng.randrange(50000):05d}", f"E{rng.randrange(5000):04d}")
+            for _ in range(500000)
+        ]
+
+        start_time = time.time()
+        system.allocate_seats(intents, seed=7, per_student_cap=5)
+        elapsed = time.time() - start_time
+        assert elapsed < 15
+        assert all(
+            event.confirmed_count <= event.max_seats for event in system.events.values()
+        )
@@ -0,0 +1,553 @@
+"""
+Tests for the scheduling indexes used by conflict detection.
+"""
+
+import random
+from datetime import date
+
+import pytest
+
+from main import CampusEventManagementSystem
+from models import Event
+from scheduling import EventIndex, build_conflict_report
+
+VENUES = ["Auditorium", "Seminar Hall", "Computer Lab"]
+DATES = ["2025-09-20", "2025-09-21"]
+
+
+def _format_minute(minute):
+    hour, minute = divmod(minute, 60)
+    suffix = "AM" if hour < 12 else "PM"
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {suffix}"
+
+
+def _random_events(count, seed=7, dates=DATES):
+    rng = random.Random(seed)
+    events = []
+    for i in range(count):
+        start = rng.randrange(8 * 60, 20 * 60, 15)
+        end = start + rng.randrange(15, 4 * 60, 15)
+        events.append(
+            {
+                "event_id": f"E{i:04d}",
+                "title": f"Event {i}",
+                "club": "Test Club",
+                "date": rng.choice(dates),
+                "start_time": _format_minute(start),
+                "end_time": _format_minute(min(end, 23 * 60 + 59)),
+                "venue": rng.choice(VENUES),
+                "max_seats": 10,
+            }
+        )
+    return events
+
+
+def _reuse_ids(events):
+    """Give some events the ID of their successor to exercise replacements."""
+    for i in range(0, len(events) - 1, 37):
+        events[i] = dict(events[i], event_id=events[i + 1]["event_id"])
+
+
+def _reference_add_events(events):
+    """Replay events through the original linear first-come-first-valid scan."""
+    system = CampusEventManagementSystem()
+    accepted = []
+    for data in events:
+        new_event = Event(**data)
+        for existing_event in accepted:
+            if existing_event.has_conflict_with(new_event) and existing_event.is_valid:
+                new_event.is_valid = False
+                new_event.violations.append(
+                    system._describe_conflict(existing_event, new_event)
+                )
+                break
+        accepted.append(new_event)
+    return {event.event_id: event for event in accepted}
+
+
+class TestEventIndex:
+    """Test suite for the date-partitioned interval index."""
+
+    def test_overlap_matches_pairwise_check(self):
+        """Index lookups return exactly the events a pairwise check reports."""
+        index = EventIndex()
+        events = [Event(**data) for data in _random_events(200)]
+        for seq, event in enumerate(events):
+            index.insert(event, seq)
+
+        for probe in events[:50]:
+            expected = {
+                other.event_id for other in events if probe.has_conflict_with(other)
+            }
+            found = {event.event_id for _, event in index.overlapping_event(probe)}
+            assert found == expected
+
+    def test_venue_partition(self):
+        """Venue-restricted lookups only return events at that venue."""
+        index = EventIndex()
+        events = [Event(**data) for data in _random_events(100)]
+        for seq, event in enumerate(events):
+            index.insert(event, seq)
+
+        probe = events[0]
+        found = [event for _, event in index.overlapping_event(probe, probe.venue)]
+        assert found
+        assert all(event.venue == probe.venue for event in found)
+
+    def test_remove(self):
+        """Removed events are no longer returned by lookups."""
+        index = EventIndex()
+        event = Event(**_random_events(1)[0])
+        index.insert(event, 0)
+        assert event in index
+
+        index.remove(event)
+        assert event not in index
+        assert len(index) == 0
+        assert list(index.overlapping_event(event)) == []
+
+    def test_touching_boundaries_overlap(self):
+        """Events sharing a boundary minute are reported as overlapping."""
+        index = EventIndex()
+        first = Event(
+            "E1", "First", "Club", "2025-09-20", "10:00 AM", "12:00 PM", "Hall", 5
+        )
+        second = Event(
+            "E2", "Second", "Club", "2025-09-20", "12:00 PM", "1:00 PM", "Lab", 5
+        )
+        index.insert(first, 0)
+        assert [event for _, event in index.overlapping_event(second)] == [first]
+
+
+class TestIndexedAddEvent:
+    """add_event must keep the results of the original linear scan."""
+
+    def test_matches_linear_scan(self):
+        """Validity and violation messages match the original algorithm."""
+        data = _random_events(300)
+        system = CampusEventManagementSystem()
+        for event in data:
+            system.add_event(**event)
+
+        expected = _reference_add_events(data)
+        for event_id, event in system.events.items():
+            assert event.is_valid == expected[event_id].is_valid
+            assert event.violations == expected[event_id].violations
+
+    def test_first_registered_event_wins(self, system):
+        """Only the earliest valid conflicting event is named in the violation."""
+        system.add_event(
+            "E1", "Talk", "Club", "2025-09-20", "10:00 AM", "12:00 PM", "Hall", 5
+        )
+        system.add_event(
+            "E2", "Jam", "Club", "2025-09-20", "9:00 AM", "11:00 AM", "Lab", 5
+        )
+        late = system.add_event(
+            "E3", "Expo", "Club", "2025-09-20", "9:30 AM", "10:30 AM", "Hall", 5
+        )
+
+        assert late.is_valid is False
+        assert late.violations == [
+            "Conflicts with Talk (E1) which was registered first: "
+            "Time and venue conflict: Event at same venue (Hall) "
+            "on 2025-09-20 between 10:00 AM and 10:30 AM"
+        ]
+
+    @pytest.mark.slow
+    def test_bulk_load_scales(self, system):
+        """Loading many events stays fast with the interval index."""
+        import time
+
+        start_time = time.time()
+        for i in range(20000):
+            system.add_event(
+                f"E{i:05d}",
+                f"Event {i}",
+                "Club",
+                f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                "10:00 AM",
+                "11:00 AM",
+                f"Room {i % 50}",
+                30,
+            )
+        assert time.time() - start_time < 10.0
+        assert len(system.events) == 20000
+
+
+class TestConflictReport:
+    """Test suite for the sweep-line conflict report."""
+
+    def test_pairs_match_pairwise_check(self):
+        """The sweep finds each overlapping pair exactly once."""
+        events = [Event(**data) for data in _random_events(250)]
+        expected = {
+            frozenset((first.event_id, second.event_id))
+            for i, first in enumerate(events)
+            for second in events[i + 1 :]
+            if first.has_conflict_with(second)
+        }
+
+        report = build_conflict_report(events)
+        found = [
+            frozenset((first.event_id, second.event_id))
+            for first, second in report.conflict_pairs
+        ]
+        assert len(found) == len(set(found))
+        assert set(found) == expected
+        assert {event.event_id for event in report.events_with_conflicts} == {
+            event_id for pair in expected for event_id in pair
+        }
+
+    def test_summary_counts(self, system):
+        """Counts and venue groupings are reported without self-pairs."""
+        for data in _random_events(40):
+            system.add_event(**data)
+
+        report = system.get_conflict_report()
+        assert report.total_events == 40
+        assert report.valid_events == sum(
+            1 for event in system.events.values() if event.is_valid
+        )
+        assert report.invalid_events == 40 - report.valid_events
+        assert all(first is not second for first, second in report.conflict_pairs)
+        assert sum(len(group) for group in report.events_by_venue.values()) == 40
+
+    def test_display_returns_report(self, system, capsys):
+        """display_events_summary prints and returns the structured report."""
+        system.add_event(
+            "E1", "Talk", "Club", "2025-09-20", "10:00 AM", "12:00 PM", "Hall", 5
+        )
+        system.add_event(
+            "E2", "Jam", "Club", "2025-09-20", "11:00 AM", "1:00 PM", "Hall", 5
+        )
+
+        report = system.display_events_summary(system.events)
+        output = capsys.readouterr().out
+        assert len(report.conflict_pairs) == 1
+        assert "Total Conflict Pairs: 1" in output
+        assert "Talk <-> Jam" in output
+
+
+class TestBulkAddEvents:
+    """Test suite for the batch event import API."""
+
+    def test_matches_sequential_add_event(self):
+        """A batch gives the same results as adding events one by one."""
+        data = _random_events(400, seed=11)
+        # Re-use some IDs so replacements inside the batch are covered
+        _reuse_ids(data)
+
+        sequential = CampusEventManagementSystem()
+        for event in data:
+            sequential.add_event(**event)
+        batch = CampusEventManagementSystem()
+        batch.add_events(data)
+
+        assert list(batch.events) == list(sequential.events)
+        for event_id, event in batch.events.items():
+            assert event.is_valid == sequential.events[event_id].is_valid
+            assert event.violations == sequential.events[event_id].violations
+
+    def test_batch_on_top_of_existing_events(self, system):
+        """Batch events are validated against events already in the system."""
+        system.add_event(
+            "E1", "Talk", "Club", "2025-09-20", "10:00 AM", "12:00 PM", "Hall", 5
+        )
+        added = system.add_events(
+            [
+                {
+                    "event_id": "E2",
+                    "title": "Jam",
+                    "club": "Club",
+                    "date": "2025-09-20",
+                    "start_time": "11:00 AM",
+                    "end_time": "1:00 PM",
+                    "venue": "Lab",
+                    "max_seats": 5,
+                }
+            ]
+        )
+        assert added[0].is_valid is False
+        assert "Conflicts with Talk (E1)" in added[0].violations[0]
+        report = system.get_conflict_report()
+        assert len(report.conflict_pairs) == 1
+
+    def test_malformed_batch_adds_nothing(self, system):
+        """A malformed schedule rejects the whole batch."""
+        data = _random_events(3)
+        data[2] = dict(data[2], end_time="not a time")
+        with pytest.raises(ValueError):
+            system.add_events(data)
+        assert system.events == {}
+
+    @pytest.mark.slow
+    def test_large_batch(self, system):
+        """A catalog of 100k events loads in seconds."""
+        import time
+
+        first_day = date(2025, 1, 1).toordinal()
+        catalog_dates = [
+            date.fromordinal(first_day + offset).isoformat() for offset in range(2000)
+        ]
+        data = _random_events(100000, seed=3, dates=catalog_dates)
+        start_time = time.time()
+        system.add_events(data)
+        assert time.time() - start_time < 10.0
+        assert len(system.events) == 100000
+
+    @pytest.mark.slow
+    def test_many_batches_on_a_dense_day(self, system):
+        """Small batches onto a crowded day only pay for their own overlaps."""
+        import time
+
+        data = _random_events(4000, seed=3, dates=DATES[:1])
+        start_time = time.time()
+        for i in range(0, len(data), 20):
+            system.add_events(data[i : i + 20])
+        assert time.time() - start_time < 10.0
+        assert len(system.events) == 4000
+
+
+class TestConflictGraph:
+    """Test suite for the incrementally maintained conflict graph."""
+
+    def test_matches_pairwise_check(self):
+        """Graph neighbours equal the pairwise overlaps of current events."""
+        data = _random_events(300, seed=5)
+        _reuse_ids(data)
+        single = CampusEventManagementSystem()
+        for event in data[:150]:
+            single.add_event(**event)
+        single.add_events(data[150:])
+
+        events = list(single.events.values())
+        for event in events:
+            expected = [
+                other
+                for other in events
+                if other is not event and event.has_conflict_with(other)
+            ]
+            assert set(single.get_event_conflicts(event.event_id)) == set(expected)
+
+    def test_conflicts_in_arrival_order(self, system):
+        """Conflicts are returned in the order the events were added."""
+        system.add_event(
+            "E1", "Talk", "Club", "2025-09-20", "10:00 AM", "12:00 PM", "Hall", 5
+        )
+        system.add_event(
+            "E2", "Jam", "Club", "2025-09-20", "9:00 AM", "11:00 AM", "Lab", 5
+        )
+        system.add_event(
+            "E3", "Expo", "Club", "2025-09-20", "9:30 AM", "10:30 AM", "Hall", 5
+        )
+        conflicts = system.get_event_conflicts("E3")
+        assert [event.event_id for event in conflicts] == ["E1", "E2"]
+        assert system.get_event_conflicts("missing") == []
+
+
+class TestCheckConflicts:
+    """Test suite for the pre-flight conflict check."""
+
+    def test_dry_run_matches_add_event(self):
+        """The dry run predicts the validity add_event then records."""
+        data = _random_events(200, seed=9)
+        system = CampusEventManagementSystem()
+        system.add_events(data[:150])
+
+        for event_data in data[150:]:
+            result = system.check_conflicts(Event(**event_data))
+            added = system.add_event(**event_data)
+            assert result["is_valid"] == added.is_valid
+            assert result["violations"] == added.violations
+
+    def test_reports_time_only_conflicts(self, system):
+        """Overlaps at other venues are reported, not only venue clashes."""
+        system.add_event(
+            "E1", "Talk", "Club", "2025-09-20", "10:00 AM", "12:00 PM", "Hall", 5
+        )
+        candidate = Event(
+            "E2", "Jam", "Club", "2025-09-20", "11:00 AM", "1:00 PM", "Lab", 5
+        )
+
+        result = system.check_conflicts(candidate)
+        assert result["is_valid"] is False
+        assert result["blocking_event"] is system.events["E1"]
+        assert len(result["conflicts"]) == 1
+        conflict = result["conflicts"][0]
+        assert conflict["event"] is system.events["E1"]
+        assert conflict["time_conflict"] is True
+        assert conflict["venue_conflict"] is False
+        assert "E2" not in system.events
+
+    @pytest.mark.slow
+    def test_fast_at_catalog_scale(self):
+        """A check against 50k events takes well under a millisecond."""
+        import time
+
+        first_day = date(2025, 1, 1).toordinal()
+        catalog_dates = [
+            date.fromordinal(first_day + offset).isoformat() for offset in range(1000)
+        ]
+        system = CampusEventManagementSystem()
+        system.add_events(_random_events(50000, seed=4, dates=catalog_dates))
+        candidate = Event(
+            "NEW", "Probe", "Club", "2025-06-01", "2:00 PM", "3:00 PM", "Hall", 5
+        )
+
+        start_time = time.perf_counter()
+        for _ in range(100):
+            system.check_conflicts(candidate)
+        assert (time.perf_counter() - start_time) / 100 < 0.001
+
+
+def _recompute_validity(system):
+    """Apply first-come-first-valid from scratch over the current events."""
+    ordered = sorted(system.events.values(), key=system._event_index.sequence_of)
+    expected = {}
+    valid = []
+    for event in ordered:
+        blocking = next(
+            (other for other in valid if other.has_conflict_with(event)), None
+        )
+        if blocking is None:
+            valid.append(event)
+            expected[event.event_id] = []
+        else:
+            expected[event.event_id] = [system._describe_conflict(blocking, event)]
+    return expected
+
+
+class TestRemoveAndReschedule:
+    """Test suite for event removal and rescheduling."""
+
+    def _chain(self, system):
+        # E1 blocks E2, which would otherwise block E3
+        system.add_event(
+            "E1", "Talk", "Club", "2025-09-20", "10:00 AM", "11:00 AM", "Hall", 5
+        )
+        system.add_event(
+            "E2", "Jam", "Club", "2025-09-20", "10:30 AM", "12:00 PM", "Lab", 5
+        )
+        system.add_event(
+            "E3", "Expo", "Club", "2025-09-20", "11:30 AM", "1:00 PM", "Hall", 5
+        )
+
+    def test_remove_cascades(self, system):
+        """Removing the first event promotes E2, which then blocks E3."""
+        self._chain(system)
+        assert [e.is_valid for e in system.events.values()] == [True, False, True]
+
+        removed = system.remove_event("E1")
+        assert removed.event_id == "E1"
+        assert "E1" not in system.events
+        assert system.events["E2"].is_valid is True
+        assert system.events["E2"].violations == []
+        assert system.events["E3"].is_valid is False
+        assert "Conflicts with Jam (E2)" in system.events["E3"].violations[0]
+        assert system.get_event_conflicts("E2") == [system.events["E3"]]
+        assert system.remove_event("E1") is None
+
+    def test_reschedule_keeps_registrations(self, system):
+        """Moving an event away frees its slot and keeps its registrations."""
+        self._chain(system)
+        system.add_student("S1")
+        registration = system.register_for_event("S1", "E1")
+
+        moved = system.reschedule_event("E1", "2025-09-21", "10:00 AM", "11:00 AM")
+        assert moved.registrations == [registration]
+        assert moved.date == "2025-09-21"
+        assert system.events["E2"].is_valid is True
+        assert system.events["E3"].is_valid is False
+
+        # Moving back restores the original outcome: E1 was registered first
+        system.reschedule_event("E1", "2025-09-20", "10:00 AM", "11:00 AM")
+        assert [e.is_valid for e in system.events.values()] == [True, False, True]
+
+    def test_invalid_reschedule_changes_nothing(self, system):
+        """A malformed new schedule is rejected before anything is touched."""
+        self._chain(system)
+        with pytest.raises(ValueError):
+            system.reschedule_event("E1", "2025-09-20", "11:00 AM", "10:00 AM")
+        assert system.events["E1"].start_time == "10:00 AM"
+        assert system.get_event_conflicts("E1") == [system.events["E2"]]
+
+    def test_random_operations_match_recomputation(self):
+        """Incremental revalidation always equals a from-scratch recomputation."""
+        rng = random.Random(21)
+        data = _random_events(150, seed=21)
+        system = CampusEventManagementSystem()
+        system.add_events(data[:100])
+        spare = data[100:]
+
+        for _ in range(120):
+            event_ids = list(system.events)
+            action = rng.random()
+            if action < 0.3 and event_ids:
+                system.remove_event(rng.choice(event_ids))
+            elif action < 0.8 and event_ids:
+                target = rng.choice(spare)
+                system.reschedule_event(
+                    rng.choice(event_ids),
+                    target["date"],
+                    target["start_time"],
+                    target["end_time"],
+                )
+            elif spare:
+                system.add_event(**spare.pop())
+
+            expected = _recompute_validity(system)
+            for event_id, event in system.events.items():
+                assert event.violations == expected[event_id]
+                assert event.is_valid == (not expected[event_id])
+
+    def test_replacing_an_event_revalidates(self, system):
+        """Re-adding an ID frees the old event's slot like removing it does."""
+        self._chain(system)
+        system.add_event(
+            "E1", "Talk", "Club", "2025-09-21", "10:00 AM", "11:00 AM", "Hall", 5
+        )
+        assert system.events["E2"].is_valid is True
+        assert system.events["E3"].is_valid is False
+        assert system.events["E1"].is_valid is True
+
+        # Back in its old slot, E1 now arrives last and is blocked by E2
+        system.add_events(
+            [
+                {
+                    "event_id": "E1",
+                    "title": "Talk",
+                    "club": "Club",
+                    "date": "2025-09-20",
+                    "start_time": "10:00 AM",
+                    "end_time": "11:00 AM",
+                    "venue": "Hall",
+                    "max_seats": 5,
+                }
+            ]
+        )
+        assert system.events["E1"].is_valid is False
+        assert system.events["E2"].is_valid is True
+
+    def test_random_replacements_match_recomputation(self):
+        """Replacing events by ID, one by one or in batches, stays exact."""
+        rng = random.Random(0)
+        data = _random_events(200, seed=0, dates=DATES[:1])
+        system = CampusEventManagementSystem()
+        system.add_events(data[:50])
+
+        for step in range(60):
+            event_ids = list(system.events)
+            picks = [
+                dict(rng.choice(data), event_id=rng.choice(event_ids))
+                for _ in range(rng.randrange(1, 4))
+            ]
+            if step % 2:
+                system.add_events(picks)
+            else:
+                for pick in picks:
+                    system.add_event(**pick)
+
+            expected = _recompute_validity(system)
+            for event_id, event in system.events.items():
+                assert event.violations == expected[event_id]
+                assert event.is_valid == (not expected[event_id])
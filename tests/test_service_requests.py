@@ -0,0 +1,315 @@
+"""
+Tests for service request bookkeeping.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import RequestStatus, ServiceRequest, Student
+from triage import TriageQueue
+
+CATEGORIES = ["IT Support", "Library Access", "Hostel", "Transport"]
+
+
+def _raise_requests(system, count=300, seed=5):
+    rng = random.Random(seed)
+    for i in range(20):
+        system.add_student(f"S{i:02d}")
+    for i in range(count):
+        system.raise_service_request(
+            f"R{i:04d}", f"S{rng.randrange(20):02d}", rng.choice(CATEGORIES)
+        )
+    for i in range(count):
+        if rng.random() < 0.6:
+            system.update_service_request_status(
+                f"R{i:04d}", rng.choice(list(RequestStatus))
+            )
+
+
+class TestServiceRequestIndex:
+    """Status and category indexes stay in step with the requests."""
+
+    def test_summaries_match_scan(self, system):
+        """Status, category and active counts agree with a full scan."""
+        _raise_requests(system)
+        requests = list(system.service_requests.values())
+
+        assert system.get_service_request_summary() == {
+            status.value: sum(r.status == status for r in requests)
+            for status in RequestStatus
+        }
+        assert system.get_service_request_category_summary() == {
+            category: sum(r.category == category for r in requests)
+            for category in CATEGORIES
+            if any(r.category == category for r in requests)
+        }
+        assert system.count_active_service_requests() == sum(
+            r.status != RequestStatus.RESOLVED for r in requests
+        )
+
+    def test_open_requests_in_category(self, system):
+        """Listing one category and status returns exactly the matching requests."""
+        _raise_requests(system)
+        listed = system.get_service_requests([RequestStatus.OPEN], "Hostel")
+        expected = [
+            r
+            for r in system.service_requests.values()
+            if r.status == RequestStatus.OPEN and r.category == "Hostel"
+        ]
+        assert listed == expected
+        assert system.count_active_service_requests("Hostel") == sum(
+            r.category == "Hostel" and r.status != RequestStatus.RESOLVED
+            for r in system.service_requests.values()
+        )
+        assert system.get_service_requests(category="Unknown") == []
+
+    def test_direct_status_change_is_indexed(self, system):
+        """Assigning a status on the request itself also updates the index."""
+        system.add_student("S001")
+        request = system.raise_service_request("R001", "S001", "IT Support")
+        request.status = RequestStatus.RESOLVED
+        assert system.count_active_service_requests() == 0
+        assert system.get_service_requests([RequestStatus.RESOLVED]) == [request]
+
+    def test_status_change_joins_end_of_group(self, system):
+        """A request moved to a status is listed after those already in it."""
+        system.add_student("S001")
+        for request_id in ("R001", "R002", "R003"):
+            system.raise_service_request(request_id, "S001", "IT Support")
+        system.update_service_request_status("R001", RequestStatus.RESOLVED)
+        system.update_service_request_status("R001", RequestStatus.OPEN)
+        listed = system.get_service_requests([RequestStatus.OPEN])
+        assert [r.request_id for r in listed] == ["R002", "R003", "R001"]
+
+    def test_duplicate_id_replaces_request(self, system):
+        """Raising a request with an existing ID replaces it in the index."""
+        system.add_student("S001")
+        system.raise_service_request("R001", "S001", "IT Support")
+        system.raise_service_request("R001", "S001", "Hostel")
+        assert system.get_service_request_summary()["Open"] == 1
+        assert system.get_service_request_category_summary() == {
+            "IT Support": 0,
+            "Hostel": 1,
+        }
+
+
+class TestBulkStatusUpdate:
+    """Many requests change status in one call."""
+
+    def test_bulk_update_keeps_indexes_consistent(self, system):
+        """A bulk transition updates the summaries, the index and the triage queue."""
+        _raise_requests(system)
+        hostel_open = system.get_service_requests([RequestStatus.OPEN], "Hostel")
+        ids = [request.request_id for request in hostel_open]
+
+        changed = system.update_service_request_statuses(
+            ids + ids[:3], RequestStatus.RESOLVED
+        )
+        assert changed == len(ids)
+        assert system.get_service_requests([RequestStatus.OPEN], "Hostel") == []
+        assert not any(request in system.triage for request in hostel_open)
+        requests = list(system.service_requests.values())
+        assert system.get_service_request_summary() == {
+            status.value: sum(r.status == status for r in requests)
+            for status in RequestStatus
+        }
+        assert system.update_service_request_statuses(ids, RequestStatus.RESOLVED) == 0
+
+    def test_bulk_update_is_all_or_nothing(self, system):
+        """An unknown ID or status rejects the whole batch."""
+        _raise_requests(system, count=20)
+        before = {r.request_id: r.status for r in system.service_requests.values()}
+        with pytest.raises(ValueError, match="missing"):
+            system.update_service_request_statuses(
+                ["R0000", "missing", "R0001"], RequestStatus.RESOLVED
+            )
+        with pytest.raises(ValueError):
+            system.update_service_request_statuses(["R0000"], "Resolved")
+        assert {
+            r.request_id: r.status for r in system.service_requests.values()
+        } == before
+
+
+def _all_pages(system, **filters):
+    pages = [system.query_service_requests(**filters)]
+    while pages[-1].next_cursor is not None:
+        pages.append(
+            system.query_service_requests(cursor=pages[-1].next_cursor, **filters)
+        )
+    return pages
+
+
+class TestQueryServiceRequests:
+    """Paged listing of service requests with server-side filters."""
+
+    def test_pages_cover_matches_newest_first(self, system):
+        """Following the cursors lists every match once, newest first."""
+        _raise_requests(system)
+        pages = _all_pages(system, statuses=[RequestStatus.OPEN], limit=7)
+        listed = [request for page in pages for request in page.requests]
+        expected = [
+            r
+            for r in system.service_requests.values()
+            if r.status == RequestStatus.OPEN
+        ]
+        assert listed == expected[::-1]
+        assert all(len(page.requests) == 7 for page in pages[:-1])
+        assert {page.total for page in pages} == {len(expected)}
+
+    @pytest.mark.parametrize("limit", [0, -1])
+    def test_non_positive_limit_rejected(self, system, limit):
+        """A page must be allowed to hold at least one request."""
+        _raise_requests(system, count=10)
+        with pytest.raises(ValueError):
+            system.query_service_requests(limit=limit)
+
+    def test_student_and_category_filters(self, system):
+        """Student and category filters combine with the status filter."""
+        _raise_requests(system)
+        page = system.query_service_requests(
+            statuses=[RequestStatus.OPEN, RequestStatus.IN_PROGRESS],
+            category="Hostel",
+            student_id="S03",
+            limit=1000,
+        )
+        expected = [
+            r
+            for r in system.service_requests.values()
+            if r.student.student_id == "S03"
+            and r.category == "Hostel"
+            and r.status != RequestStatus.RESOLVED
+        ]
+        assert page.requests == expected[::-1]
+        assert page.total == len(expected)
+        assert page.next_cursor is None
+        assert system.query_service_requests(student_id="missing").requests == []
+
+    def test_status_change_does_not_repeat_requests(self, system):
+        """Editing a status between pages neither repeats nor skips other requests."""
+        _raise_requests(system, count=40)
+        first = system.query_service_requests(limit=10)
+        for request in first.requests:
+            system.update_service_request_status(
+                request.request_id, RequestStatus.RESOLVED
+            )
+        listed = list(first.requests)
+        cursor = first.next_cursor
+        while cursor is not None:
+            page = system.query_service_requests(cursor=cursor, limit=10)
+            listed += page.requests
+            cursor = page.next_cursor
+        assert listed == list(system.service_requests.values())[::-1]
+
+
+def _aged_requests(count=200, seed=11):
+    """Requests with spread-out creation times, not yet in any queue."""
+    rng = random.Random(seed)
+    student = Student("S00")
+    start = datetime(2025, 1, 1)
+    requests = []
+    for i in range(count):
+        request = ServiceRequest(f"R{i:04d}", student, rng.choice(CATEGORIES))
+        request.created_at = start + timedelta(minutes=rng.randrange(10_000))
+        requests.append(request)
+    return requests
+
+
+class TestTriageQueue:
+    """The triage queue orders active requests by SLA deadline."""
+
+    SLAS = {"IT Support": timedelta(hours=4), "Hostel": timedelta(hours=24)}
+
+    def test_work_queue_in_deadline_order(self):
+        """The work queue lists active requests by created_at plus category SLA."""
+        queue = TriageQueue(self.SLAS)
+        requests = _aged_requests()
+        for request in requests:
+            queue.update(request)
+
+        expected = sorted(requests, key=queue.deadline)
+        assert queue.work_queue(limit=25) == expected[:25]
+        assert queue.next_request() is expected[0]
+        hostel = [r for r in expected if r.category == "Hostel"]
+        assert queue.work_queue(limit=10, category="Hostel") == hostel[:10]
+        assert queue.next_request("Hostel") is hostel[0]
+        assert queue.next_request("Unknown") is None
+
+    def test_breaching_sla_matches_scan(self):
+        """Every active request past its deadline is reported, most overdue first."""
+        queue = TriageQueue(self.SLAS)
+        requests = _aged_requests()
+        for request in requests:
+            queue.update(request)
+        for request in requests[::3]:
+            request.status = RequestStatus.RESOLVED
+            queue.update(request)
+
+        now = datetime(2025, 1, 5)
+        expected = sorted(
+            (
+                r
+                for r in requests
+                if r.status != RequestStatus.RESOLVED and queue.deadline(r) <= now
+            ),
+            key=queue.deadline,
+        )
+        assert expected
+        assert queue.breaching_sla(now) == expected
+
+    def test_in_progress_is_active_but_not_next(self):
+        """In-Progress requests stay in the work queue but are not handed out next."""
+        queue = TriageQueue()
+        first, second = _aged_requests(2)
+        for request in (first, second):
+            queue.update(request)
+        earlier, later = sorted((first, second), key=queue.deadline)
+
+        earlier.status = RequestStatus.IN_PROGRESS
+        queue.update(earlier)
+        assert queue.next_request() is later
+        assert queue.work_queue() == [earlier, later]
+
+    def test_set_sla_requeues_category(self):
+        """Tightening a category's SLA moves its requests ahead."""
+        queue = TriageQueue()
+        requests = _aged_requests()
+        for request in requests:
+            queue.update(request)
+
+        queue.set_sla("Transport", timedelta(0))
+        listed = queue.work_queue(limit=len(requests))
+        assert set(listed) == set(requests)
+        assert [queue.deadline(r) for r in listed] == sorted(
+            queue.deadline(r) for r in requests
+        )
+        assert len(queue) == len(requests)
+
+    def test_churn_keeps_heaps_compact(self):
+        """Repeated updates do not leave the heap growing with stale entries."""
+        queue = TriageQueue()
+        requests = _aged_requests(50)
+        for _ in range(20):
+            for request in requests:
+                queue.update(request)
+        heap = queue._active[None]
+        assert len(heap) == 50
+        assert len(heap._heap) <= 2 * 50 + 16
+
+    def test_system_keeps_queue_in_step(self, system):
+        """Status changes made through the system or directly reach the queue."""
+        _raise_requests(system)
+        active = [
+            r
+            for r in system.service_requests.values()
+            if r.status != RequestStatus.RESOLVED
+        ]
+        assert len(system.triage) == len(active)
+
+        request = active[0]
+        system.update_service_request_status(request.request_id, RequestStatus.RESOLVED)
+        assert request not in system.triage
+        request.status = RequestStatus.OPEN
+        assert request in system.triage
+        assert system.triage.next_request(request.category) is not None
@@ -0,0 +1,443 @@
+"""
+Tests for persisting a system through a storage backend.
+"""
+
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from journal import JournalStorage
+from main import CampusEventManagementSystem
+from models import ClashPolicy, RegistrationStatus, RequestStatus
+from storage import SQLiteStorage
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "campus.db")
+
+
+def _populate(system):
+    for i in range(6):
+        system.add_student(f"S{i}", f"Student {i}")
+    system.add_events(
+        [
+            {
+                "event_id": "E1",
+                "title": "Hackathon",
+                "club": "Tech",
+                "date": "2025-12-01",
+                "start_time": "10:00 AM",
+                "end_time": "12:00 PM",
+                "venue": "Hall A",
+                "max_seats": 2,
+            },
+            {
+                "event_id": "E2",
+                "title": "Overlapping Talk",
+                "club": "Arts",
+                "date": "2025-12-01",
+                "start_time": "11:00 AM",
+                "end_time": "01:00 PM",
+                "venue": "Hall B",
+                "max_seats": 5,
+            },
+        ]
+    )
+    system.add_event(
+        "E3", "Quiz", "Tech", "2025-12-02", "09:00 AM", "10:00 AM", "Hall A", 1
+    )
+    system.register_many([(f"S{i}", "E1") for i in range(5)])
+    system.register_for_event("S0", "E2")
+    system.cancel_registration("S1", "E1")
+    system.allocate_seats([("S4", "E3"), ("S5", "E3")], seed=1)
+
+    for i in range(4):
+        system.raise_service_request(f"R{i}", f"S{i}", "Hostel")
+    system.update_service_request_status("R0", RequestStatus.IN_PROGRESS)
+    system.update_service_request_statuses(["R1", "R2"], RequestStatus.RESOLVED)
+
+
+def _snapshot(system):
+    return {
+        "students": {s.student_id: s.name for s in system.students.values()},
+        "events": {
+            event_id: (event.get_summary(), event.is_valid)
+            for event_id, event in system.events.items()
+        },
+        "registrations": {
+            event_id: [
+                (r.student.student_id, r.status, r.warnings)
+                for r in event.registrations
+            ]
+            for event_id, event in system.events.items()
+        },
+        "waitlists": {
+            event_id: [r.student.student_id for r in event.waitlist]
+            for event_id, event in system.events.items()
+        },
+        "requests": [
+            (r.request_id, r.student.student_id, r.category, r.status, r.created_at)
+            for r in system.query_service_requests(limit=100).requests
+        ],
+        "timetables": {
+            s.student_id: sorted(e.event_id for e in s.timetable)
+            for s in system.students.values()
+        },
+    }
+
+
+class TestSQLiteStorage:
+    """A system reopened from SQLite matches the one that wrote it."""
+
+    def test_round_trip(self, db_path):
+        """Students, events, registrations and requests survive a restart."""
+        system = CampusEventManagementSystem(storage=SQLiteStorage(db_path))
+        _populate(system)
+        expected = _snapshot(system)
+        system.storage.close()
+
+        reopened = CampusEventManagementSystem(storage=SQLiteStorage(db_path))
+        assert _snapshot(reopened) == expected
+        assert not reopened.events["E2"].is_valid
+        assert reopened.get_service_request_summary() == {
+            "Open": 1,
+            "In-Progress": 1,
+            "Resolved": 2,
+        }
+
+    def test_changes_after_restart_are_written(self, db_path):
+        """A reopened system keeps writing through, including revalidation."""
+        system = CampusEventManagementSystem(storage=SQLiteStorage(db_path))
+        _populate(system)
+        system.storage.close()
+
+        reopened = CampusEventManagementSystem(storage=SQLiteStorage(db_path))
+        reopened.remove_event("E1")
+        reopened.reschedule_event("E3", "2025-12-03", "09:00 AM", "10:00 AM")
+        reopened.service_requests["R3"].status = RequestStatus.RESOLVED
+        expected = _snapshot(reopened)
+        assert reopened.events["E2"].is_valid
+        reopened.storage.close()
+
+        connection = sqlite3.connect(db_path)
+        assert connection.execute(
+            "SELECT is_valid FROM events WHERE event_id = 'E2'"
+        ).fetchone() == (1,)
+        connection.close()
+        restarted = CampusEventManagementSystem(storage=SQLiteStorage(db_path))
+        assert _snapshot(restarted) == expected
+
+    def test_waitlist_order_and_warnings_kept(self, db_path):
+        """The waitlist is rebuilt in FIFO order, with clash warnings intact."""
+        system = CampusEventManagementSystem(
+            ClashPolicy.ALLOW, storage=SQLiteStorage(db_path)
+        )
+        _populate(system)
+        waitlist = [r.student.student_id for r in system.events["E1"].waitlist]
+        # The head of the waitlist holds an overlapping seat when promoted
+        system.register_for_event(waitlist[0], "E2")
+        system.storage.close()
+
+        reopened = CampusEventManagementSystem(storage=SQLiteStorage(db_path))
+        assert [r.student.student_id for r in reopened.events["E1"].waitlist] == (
+            waitlist
+        )
+        assert reopened.cancel_registration("S0", "E1") is not None
+        promoted = reopened.events["E1"].get_registration(waitlist[0])
+        assert promoted.status == RegistrationStatus.CONFIRMED
+        assert promoted.warnings
+
+    def test_schema_uses_wal_and_indexes(self, db_path):
+        """The database is in WAL mode with the lookup indexes in place."""
+        SQLiteStorage(db_path).close()
+        connection = sqlite3.connect(db_path)
+        assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+        indexes = {
+            name: [
+                column
+                for _, _, column in connection.execute(f"PRAGMA index_info({name})")
+            ]
+            for (name,) in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' "
+                "AND name NOT LIKE 'sqlite_%'"
+            )
+        }
+        connection.close()
+        assert indexes == {
+            "events_date_venue": ["date", "venue"],
+            "registrations_event_status": ["event_id", "status"],
+            "service_requests_status_category": ["status", "category"],
+        }
+
+    def test_batch_commits_once(self, db_path):
+        """Writes inside a batch become visible together when it ends."""
+        storage = SQLiteStorage(db_path)
+        system = CampusEventManagementSystem(storage=storage)
+        reader = sqlite3.connect(db_path)
+
+        with storage.batch():
+            for i in range(50):
+                system.add_student(f"S{i}")
+            assert reader.execute("SELECT COUNT(*) FROM students").fetchone() == (0,)
+        assert reader.execute("SELECT COUNT(*) FROM students").fetchone() == (50,)
+        reader.close()
+        storage.close()
+
+    def test_overlapping_batches_do_not_delay_commits(self, db_path):
+        """Batches end and plain writes return committed while others are open."""
+        storage = SQLiteStorage(db_path)
+        system = CampusEventManagementSystem(storage=storage)
+        reader = sqlite3.connect(db_path)
+        opened = threading.Event()
+        release = threading.Event()
+
+        def long_batch():
+            with storage.batch():
+                system.add_student("S1")
+                opened.set()
+                release.wait()
+                system.add_student("S4")
+
+        thread = threading.Thread(target=long_batch)
+        thread.start()
+        opened.wait()
+        with storage.batch():
+            system.add_student("S2")
+        assert ("S2",) in reader.execute("SELECT student_id FROM students")
+        system.add_student("S3")
+        assert ("S3",) in reader.execute("SELECT student_id FROM students")
+        release.set()
+        thread.join()
+        assert reader.execute(
+            "SELECT student_id FROM students ORDER BY rowid"
+        ).fetchall() == [("S1",), ("S2",), ("S3",), ("S4",)]
+        reader.close()
+        storage.close()
+
+
+def _open_journal(directory):
+    return JournalStorage(str(directory), snapshot_interval=None)
+
+
+class TestJournalStorage:
+    """A system recovered from a snapshot and journal matches the one that wrote it."""
+
+    def test_round_trip_from_journal(self, tmp_path):
+        """With no snapshot, start-up replays the whole journal."""
+        system = CampusEventManagementSystem(storage=_open_journal(tmp_path))
+        _populate(system)
+        expected = _snapshot(system)
+        system.storage.close()
+
+        storage = _open_journal(tmp_path)
+        reopened = CampusEventManagementSystem(storage=storage)
+        assert _snapshot(reopened) == expected
+        assert storage.recovery.snapshot_records == 0
+        assert storage.recovery.journal_records > 0
+        assert reopened.recovery_seconds >= storage.recovery.seconds
+        storage.close()
+
+    def test_health_reports_recovery(self, tmp_path, monkeypatch):
+        """The health check reports how a journal-backed system recovered."""
+        pytest.importorskip("psutil")
+        health_check = pytest.importorskip("health_check")
+        system = CampusEventManagementSystem(storage=_open_journal(tmp_path))
+        _populate(system)
+        system.storage.close()
+
+        class SessionState(dict):
+            __getattr__ = dict.__getitem__
+
+        storage = _open_journal(tmp_path)
+        reopened = CampusEventManagementSystem(storage=storage)
+        monkeypatch.setattr(
+            health_check.st, "session_state", SessionState(system=reopened)
+        )
+        monkeypatch.setattr(health_check.psutil, "cpu_percent", lambda interval: 0.0)
+        health = health_check.get_system_health()
+        assert health["status"] == "healthy"
+        assert health["application"]["registrations_count"] == sum(
+            len(event.registrations) for event in reopened.events.values()
+        )
+        assert health["recovery"]["journal_records"] > 0
+        storage.close()
+
+    def test_snapshot_then_tail(self, tmp_path):
+        """After a snapshot only the changes made since are replayed."""
+        system = CampusEventManagementSystem(storage=_open_journal(tmp_path))
+        _populate(system)
+        system.storage.snapshot()
+        system.remove_event("E1")
+        system.service_requests["R3"].status = RequestStatus.RESOLVED
+        expected = _snapshot(system)
+        system.storage.close()
+
+        storage = _open_journal(tmp_path)
+        reopened = CampusEventManagementSystem(storage=storage)
+        assert _snapshot(reopened) == expected
+        assert reopened.events["E2"].is_valid
+        assert storage.recovery.snapshot_records > 0
+        # remove_event, E2's revalidation and the status change
+        assert storage.recovery.journal_records == 3
+        storage.close()
+
+    def test_repeated_snapshots_compact(self, tmp_path):
+        """Snapshots fold earlier snapshots and delete the sealed segments."""
+        storage = _open_journal(tmp_path)
+        system = CampusEventManagementSystem(storage=storage)
+        _populate(system)
+        storage.snapshot()
+        system.add_student("S9", "Late Student")
+        storage.snapshot()
+        expected = _snapshot(system)
+        storage.close()
+
+        assert len([name for name in os.listdir(tmp_path) if "journal" in name]) == 1
+        storage = _open_journal(tmp_path)
+        reopened = CampusEventManagementSystem(storage=storage)
+        assert _snapshot(reopened) == expected
+        assert storage.recovery.journal_records == 0
+        storage.close()
+
+    def test_compaction_writes_columnar_snapshot(self, tmp_path):
+        """Each compaction leaves a columnar snapshot, mapped before loading."""
+        storage = _open_journal(tmp_path)
+        system = CampusEventManagementSystem(storage=storage)
+        _populate(system)
+        assert storage.columnar_snapshot() is None
+        storage.snapshot()
+        snapshot = storage.columnar_snapshot()
+        assert storage.columnar_snapshot() is snapshot
+        events = system.events.values()
+        assert snapshot.seat_totals() == {
+            "max": sum(event.max_seats for event in events),
+            "confirmed": sum(event.confirmed_count for event in events),
+            "waitlisted": sum(event.waitlisted_count for event in events),
+        }
+        assert snapshot.events["E1"].get_summary() == (
+            system.events["E1"].get_summary()
+        )
+        assert not snapshot.events["E2"].is_valid
+        assert {
+            status.value: count
+            for status, count in snapshot.request_status_counts().items()
+        } == system.get_service_request_summary()
+        system.add_student("S9", "Late Student")
+        storage.snapshot()
+        assert len(storage.columnar_snapshot().students) == 7
+        storage.close()
+
+        storage = _open_journal(tmp_path)
+        assert storage.columnar_snapshot().events_per_venue() == {
+            "Hall A": 2,
+            "Hall B": 1,
+        }
+        storage.close()
+
+    def test_failed_compaction_keeps_the_snapshotter_running(self, tmp_path, caplog):
+        """A compaction that raises is reported and the next one still runs."""
+        storage = JournalStorage(
+            str(tmp_path), snapshot_interval=0.01, snapshot_bytes=1
+        )
+        system = CampusEventManagementSystem(storage=storage)
+        compact = storage.snapshot
+        calls = []
+        compacted = threading.Event()
+
+        def flaky_snapshot():
+            calls.append(None)
+            if len(calls) == 1:
+                raise OSError("disk full")
+            compact()
+            compacted.set()
+
+        storage.snapshot = flaky_snapshot
+        system.add_student("S1")
+        assert compacted.wait(10)
+        assert "disk full" in caplog.text
+        assert len(calls) >= 2
+        del storage.snapshot
+        system.add_event(
+            "E1", "Huge", "Tech", "2025-12-01", "10:00 AM", "11:00 AM", "Hall", 2**31
+        )
+        storage.snapshot()
+        assert storage.columnar_snapshot().seat_totals()["max"] == 2**31
+        storage.close()
+
+    def test_torn_tail_is_ignored(self, tmp_path):
+        """A record cut short by a crash is dropped, earlier records survive."""
+        storage = _open_journal(tmp_path)
+        system = CampusEventManagementSystem(storage=storage)
+        system.add_student("S1", "Kept")
+        system.add_student("S2", "Torn")
+        storage.close()
+
+        (segment,) = [name for name in os.listdir(tmp_path) if "journal" in name]
+        path = tmp_path / segment
+        path.write_bytes(path.read_bytes()[:-3])
+
+        storage = _open_journal(tmp_path)
+        reopened = CampusEventManagementSystem(storage=storage)
+        assert {s.student_id: s.name for s in reopened.students.values()} == {
+            "S1": "Kept"
+        }
+        storage.close()
+
+    def test_concurrent_writers(self, tmp_path):
+        """Records written by many threads through group commit all survive."""
+        storage = _open_journal(tmp_path)
+        system = CampusEventManagementSystem(storage=storage)
+
+        def add(start):
+            for i in range(start, start + 50):
+                system.add_student(f"S{i}")
+
+        threads = [threading.Thread(target=add, args=(n * 50,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        storage.close()
+
+        reopened = CampusEventManagementSystem(storage=_open_journal(tmp_path))
+        assert len(reopened.students) == 400
+        reopened.storage.close()
+
+    def test_batch_syncs_once(self, tmp_path, monkeypatch):
+        """Writes inside a batch share one fsync when the block ends."""
+        storage = _open_journal(tmp_path)
+        system = CampusEventManagementSystem(storage=storage)
+        syncs = []
+        fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: syncs.append(fd) or fsync(fd))
+
+        with storage.batch():
+            for i in range(50):
+                system.add_student(f"S{i}")
+            assert not syncs
+        assert len(syncs) == 1
+        storage.close()
+
+    def test_sync_waits_until_locks_are_released(self, tmp_path, monkeypatch):
+        """Registering and cancelling fsync only after the event lock is free."""
+        storage = _open_journal(tmp_path)
+        system = CampusEventManagementSystem(storage=storage)
+        event = system.add_event(
+            "E1", "Talk", "Club", "2025-09-20", "10:00 AM", "12:00 PM", "Hall", 1
+        )
+        system.add_student("S1")
+        system.add_student("S2")
+        held = []
+        fsync = os.fsync
+        monkeypatch.setattr(
+            os, "fsync", lambda fd: held.append(event.lock.locked()) or fsync(fd)
+        )
+
+        system.register_for_event("S1", "E1")
+        system.register_for_event("S2", "E1")
+        system.cancel_registration("S1", "E1")
+        assert held and not any(held)
+        storage.close()
@@ -201,6 +201,55 @@ class TestModels:
         assert event.max_seats == 50
         assert len(event.registrations) == 0
 
+    def test_event_schedule_is_cached(self):
+        """Event date and times are parsed once into integer minutes."""
+        event = Event(
+            "E001",
+            "AI Workshop",
+            "AI Club",
+            "2025-12-01",
+            "9:30 AM",
+            "12:15 PM",
+            "Room 101",
+            50,
+        )
+        assert event.start_minute == 9 * 60 + 30
+        assert event.end_minute == 12 * 60 + 15
+        start, end = event.get_datetime_range()
+        assert start.strftime("%Y-%m-%d %I:%M %p") == "2025-12-01 09:30 AM"
+        assert end.strftime("%Y-%m-%d %I:%M %p") == "2025-12-01 12:15 PM"
+
+    @pytest.mark.parametrize(
+        "date, start_time, end_time",
+        [
+            ("2025-13-01", "10:00 AM", "11:00 AM"),
+            ("2025-12-01", "25:00 AM", "11:00 AM"),
+            ("2025-12-01", "10:00", "11:00 AM"),
+            ("2025-12-01", "11:00 AM", "10:00 AM"),
+        ],
+    )
+    def test_malformed_schedule_rejected(self, date, start_time, end_time):
+        """Malformed dates/times are rejected when the event is created."""
+        with pytest.raises(ValueError):
+            Event("E001", "AI Workshop", "AI Club", date, start_time, end_time, "R", 5)
+
+    def test_conflict_period_formatting(self):
+        """Conflict periods keep the zero-padded 12-hour format."""
+        first = Event(
+            "E001", "A", "Club", "2025-12-01", "11:00 AM", "1:00 PM", "Room 101", 5
+        )
+        second = Event(
+            "E002", "B", "Club", "2025-12-01", "12:00 AM", "11:30 AM", "Room 102", 5
+        )
+        details = first.get_conflict_details(second)
+        assert details["has_conflict"] is True
+        assert details["venue_conflict"] is False
+        assert details["conflict_period"] == {
+            "start": "11:00 AM",
+            "end": "11:30 AM",
+            "date": "2025-12-01",
+        }
+
     def test_registration_creation(self):
         """Test Registration model creation."""
         student = Student("S001", "John Doe")
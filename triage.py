@@ -0,0 +1,244 @@
+"""
+SLA-aware triage queue for service requests.
+"""
+
+import heapq
+import threading
+from datetime import datetime, timedelta
+from itertools import count
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from models import ACTIVE_REQUEST_STATUSES, RequestStatus, ServiceRequest
+
+DEFAULT_SLA = timedelta(hours=48)
+
+# (deadline, push sequence, request)
+_Entry = Tuple[datetime, int, ServiceRequest]
+
+
+class _DeadlineHeap:
+    """
+    Min-heap of requests ordered by SLA deadline, with lazy removal.
+
+    Each request remembers the sequence number of its latest push. Entries
+    with an older number are stale and skipped when the heap is read, so
+    removing a request is O(1) and re-adding it never leaves a duplicate.
+    """
+
+    __slots__ = ("_heap", "_current")
+
+    def __init__(self):
+        self._heap: List[_Entry] = []
+        self._current: Dict[ServiceRequest, int] = {}
+
+    def push(self, deadline: datetime, seq: int, request: ServiceRequest) -> None:
+        self._current[request] = seq
+        heapq.heappush(self._heap, (deadline, seq, request))
+
+    def discard(self, request: ServiceRequest) -> None:
+        if self._current.pop(request, None) is not None:
+            # Rebuild once stale entries outnumber live ones
+            if len(self._heap) > 2 * len(self._current) + 16:
+                self._heap = [entry for entry in self._heap if self._is_current(entry)]
+                heapq.heapify(self._heap)
+
+    def peek(self) -> Optional[ServiceRequest]:
+        heap = self._heap
+        while heap and not self._is_current(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
+
+    def smallest(
+        self, limit: Optional[int] = None, until: Optional[datetime] = None
+    ) -> List[ServiceRequest]:
+        """
+        Return live requests in deadline order without popping them.
+
+        The heap is walked best-first from the root, only descending into
+        children that can still qualify, so the cost is O(k log k) for the
+        ``k`` entries visited instead of sorting the whole heap.
+
+        Args:
+            limit (Optional[int]): Stop after this many requests
+            until (Optional[datetime]): Only include deadlines up to this time
+        """
+        heap = self._heap
+        found: List[ServiceRequest] = []
+        frontier: List[Tuple[datetime, int, int]] = []
+        if heap and (until is None or heap[0][0] <= until):
+            frontier.append((heap[0][0], heap[0][1], 0))
+        while frontier and (limit is None or len(found) < limit):
+            _, _, position = heapq.heappop(frontier)
+            entry = heap[position]
+            if self._is_current(entry):
+                found.append(entry[2])
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap) and (until is None or heap[child][0] <= until):
+                    heapq.heappush(frontier, (heap[child][0], heap[child][1], child))
+        return found
+
+    def _is_current(self, entry: _Entry) -> bool:
+        return self._current.get(entry[2]) == entry[1]
+
+    def __contains__(self, request: object) -> bool:
+        return request in self._current
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+
+class TriageQueue:
+    """
+    Work queue of service requests ordered by SLA deadline.
+
+    A request's deadline is its ``created_at`` plus the SLA of its category.
+    Ordering by deadline ages requests naturally: a request from a category
+    with a generous SLA moves ahead of fresher urgent requests once it has
+    waited long enough.
+
+    Open requests and active (Open or In-Progress) requests are kept in
+    separate heaps, overall and per category, so the next request to work on
+    is found in O(log n) and the ``k`` requests past their SLA are listed in
+    O(k log k).
+    """
+
+    def __init__(
+        self,
+        slas: Optional[Mapping[str, timedelta]] = None,
+        default_sla: timedelta = DEFAULT_SLA,
+    ):
+        """
+        Create an empty triage queue.
+
+        Args:
+            slas (Optional[Mapping[str, timedelta]]): SLA per request category
+            default_sla (timedelta): SLA of categories without their own
+        """
+        self.default_sla = default_sla
+        self._slas: Dict[str, timedelta] = dict(slas or {})
+        self._requests: Dict[ServiceRequest, datetime] = {}
+        self._open: Dict[Optional[str], _DeadlineHeap] = {None: _DeadlineHeap()}
+        self._active: Dict[Optional[str], _DeadlineHeap] = {None: _DeadlineHeap()}
+        self._sequence = count()
+        self._lock = threading.Lock()
+
+    def sla_for(self, category: str) -> timedelta:
+        """Return the SLA that applies to a category."""
+        return self._slas.get(category, self.default_sla)
+
+    def set_sla(self, category: str, sla: timedelta) -> None:
+        """
+        Change the SLA of a category and re-queue its requests.
+
+        Note:
+            Re-queuing costs O(m log n) for the m tracked requests of the category
+        """
+        with self._lock:
+            self._slas[category] = sla
+            affected = [
+                request for request in self._requests if request.category == category
+            ]
+            for request in affected:
+                self._discard(request)
+            for request in affected:
+                self._track(request)
+
+    def deadline(self, request: ServiceRequest) -> datetime:
+        """Return the time by which a request should be resolved."""
+        return request.created_at + self.sla_for(request.category)
+
+    def update(self, request: ServiceRequest) -> None:
+        """
+        Add a request or bring it in line with its current status.
+
+        Resolved requests leave the queue; reopened requests rejoin it.
+        """
+        with self._lock:
+            self._discard(request)
+            if request.status in ACTIVE_REQUEST_STATUSES:
+                self._track(request)
+
+    def remove(self, request: ServiceRequest) -> None:
+        """Stop tracking a request. Unknown requests are ignored."""
+        with self._lock:
+            self._discard(request)
+
+    def next_request(self, category: Optional[str] = None) -> Optional[ServiceRequest]:
+        """
+        Return the open request with the earliest deadline.
+
+        Args:
+            category (Optional[str]): Only consider this category
+
+        Returns:
+            Optional[ServiceRequest]: The request to work on next, None if no
+                request is open
+        """
+        with self._lock:
+            heap = self._open.get(category)
+            return heap.peek() if heap is not None else None
+
+    def breaching_sla(
+        self, now: Optional[datetime] = None, category: Optional[str] = None
+    ) -> List[ServiceRequest]:
+        """
+        List the active requests whose deadline has passed.
+
+        Args:
+            now (Optional[datetime]): Time to check against. Defaults to now.
+            category (Optional[str]): Only consider this category
+
+        Returns:
+            List[ServiceRequest]: Open or In-Progress requests past their SLA,
+                most overdue first
+        """
+        now = now or datetime.now()
+        with self._lock:
+            heap = self._active.get(category)
+            return heap.smallest(until=now) if heap is not None else []
+
+    def work_queue(
+        self, limit: int = 20, category: Optional[str] = None
+    ) -> List[ServiceRequest]:
+        """
+        List the active requests with the earliest deadlines.
+
+        Args:
+            limit (int): Most requests to return
+            category (Optional[str]): Only consider this category
+
+        Returns:
+            List[ServiceRequest]: Up to ``limit`` Open or In-Progress requests in
+                deadline order
+        """
+        with self._lock:
+            heap = self._active.get(category)
+            return heap.smallest(limit=limit) if heap is not None else []
+
+    def _track(self, request: ServiceRequest) -> None:
+        deadline = self.deadline(request)
+        seq = next(self._sequence)
+        self._requests[request] = deadline
+        for heaps in (self._active,) + (
+            (self._open,) if request.status == RequestStatus.OPEN else ()
+        ):
+            for key in (None, request.category):
+                heap = heaps.get(key)
+                if heap is None:
+                    heap = heaps[key] = _DeadlineHeap()
+                heap.push(deadline, seq, request)
+
+    def _discard(self, request: ServiceRequest) -> None:
+        if self._requests.pop(request, None) is None:
+            return
+        for heaps in (self._open, self._active):
+            for key in (None, request.category):
+                heap = heaps.get(key)
+                if heap is not None:
+                    heap.discard(request)
+
+    def __contains__(self, request: object) -> bool:
+        return request in self._requests
+
+    def __len__(self) -> int:
+        return len(self._requests)
@@ -0,0 +1,137 @@
+"""
+First-in-first-out waitlist with fast position lookups.
+"""
+
+from collections import deque
+from typing import (
+    Deque,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T", bound=Hashable)
+
+
+class Waitlist(Generic[T]):
+    """
+    FIFO queue that supports removal from the middle and position queries.
+
+    Every entry receives an increasing ticket number. A Fenwick tree over the
+    tickets counts the entries still waiting, so an entry's position is a prefix
+    sum computed in O(log n). Removed entries are skipped lazily when the head
+    is read, which keeps reading the head O(1) amortized.
+    """
+
+    __slots__ = ("_tickets", "_order", "_tree", "_next_ticket")
+
+    def __init__(self):
+        self._tickets: Dict[T, int] = {}
+        self._order: Deque[Tuple[int, T]] = deque()
+        self._tree: List[int] = [0] * 17
+        self._next_ticket = 1
+
+    def push(self, item: T) -> None:
+        """Add an item to the back of the queue. Items already queued are ignored."""
+        if item in self._tickets:
+            return
+        if self._next_ticket >= len(self._tree):
+            self._rebuild()
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        self._tickets[item] = ticket
+        self._order.append((ticket, item))
+        self._update(ticket, 1)
+
+    def extend(self, items: Iterable[T]) -> None:
+        """Add many items to the back of the queue, rebuilding the tree once."""
+        queued = list(self) if self._tickets else []
+        tickets = self._tickets
+        for item in items:
+            if item not in tickets:
+                tickets[item] = 0
+                queued.append(item)
+        self._rebuild(queued)
+
+    def remove(self, item: T) -> bool:
+        """
+        Remove an item wherever it is in the queue.
+
+        Returns:
+            bool: True if the item was queued
+        """
+        ticket = self._tickets.pop(item, None)
+        if ticket is None:
+            return False
+        self._update(ticket, -1)
+        return True
+
+    def peek(self) -> Optional[T]:
+        """Return the item at the head of the queue without removing it."""
+        while self._order and not self._is_current(*self._order[0]):
+            self._order.popleft()
+        return self._order[0][1] if self._order else None
+
+    def pop(self) -> Optional[T]:
+        """Remove and return the item at the head of the queue."""
+        item = self.peek()
+        if item is not None:
+            self.remove(item)
+            self._order.popleft()
+        return item
+
+    def position(self, item: T) -> Optional[int]:
+        """
+        Return the 1-based queue position of an item.
+
+        Returns:
+            Optional[int]: Position of the item, None if it is not queued
+        """
+        ticket = self._tickets.get(item)
+        if ticket is None:
+            return None
+        total = 0
+        while ticket > 0:
+            total += self._tree[ticket]
+            ticket -= ticket & -ticket
+        return total
+
+    def _is_current(self, ticket: int, item: T) -> bool:
+        return self._tickets.get(item) == ticket
+
+    def _update(self, ticket: int, delta: int) -> None:
+        tree = self._tree
+        while ticket < len(tree):
+            tree[ticket] += delta
+            ticket += ticket & -ticket
+
+    def _rebuild(self, queued: Optional[List[T]] = None) -> None:
+        """Renumber the queued items from 1 and grow the tree when it is full."""
+        if queued is None:
+            queued = list(self)
+        size = max(16, 2 * len(queued)) + 1
+        self._order = deque(enumerate(queued, 1))
+        self._tickets = {item: ticket for ticket, item in self._order}
+        self._next_ticket = len(queued) + 1
+        # Tickets 1..n each hold one item, so a node covering the tickets
+        # (t - lowbit(t), t] counts the part of that range up to n
+        self._tree = [
+            max(0, min(ticket, len(queued)) - ticket + (ticket & -ticket))
+            for ticket in range(size)
+        ]
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._tickets
+
+    def __iter__(self) -> Iterator[T]:
+        self.peek()  # drop removed entries from the head before iterating
+        return (item for ticket, item in self._order if self._is_current(ticket, item))
+
+    def __len__(self) -> int:
+        return len(self._tickets)